@@ -6,8 +6,12 @@ matching passwords.
 """
 
 from django.contrib.auth.models import User
+from django.db import transaction
 from rest_framework import serializers
 from auth_app.models import Profile
+from core_app.images import ImageVariantsField, validate_image
+from core_app.tasks import delete_media_file
+from core_app.uploads import AttachUploadsMixin, ChunkedUploadField
 from django.utils import timezone
 
 
@@ -64,7 +68,7 @@ class RegistrationSerializer(serializers.ModelSerializer):
         return user
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(AttachUploadsMixin, serializers.ModelSerializer):
     """Serializer for the Profile model used in the API.
 
     Behavior notes:
@@ -72,6 +76,9 @@ class ProfileSerializer(serializers.ModelSerializer):
       handling (avoids null vs empty-string differences on the frontend).
     - update() handles file replacement and keeps the associated User email
       in sync while verifying uniqueness.
+    - Uploaded files must be images; `file_variants` lists the resized
+      copies rendered after upload (see core_app.images). `file_upload`
+      attaches a finished chunked upload instead (core_app.uploads).
     """
 
     user = serializers.PrimaryKeyRelatedField(read_only=True)
@@ -80,6 +87,9 @@ class ProfileSerializer(serializers.ModelSerializer):
     first_name = serializers.CharField(source='user.first_name', allow_blank=True, required=False)
     last_name = serializers.CharField(source='user.last_name', allow_blank=True, required=False)
     email = serializers.EmailField(source='user.email', required=False)
+    file_variants = ImageVariantsField('file')
+    # Id of a completed chunked upload, as an alternative to a multipart file
+    file_upload = ChunkedUploadField(source='file', required=False, validators=[validate_image])
 
     class Meta:
         model = Profile
@@ -89,6 +99,8 @@ class ProfileSerializer(serializers.ModelSerializer):
             'first_name',
             'last_name',
             'file',
+            'file_variants',
+            'file_upload',
             'location',
             'tel',
             'description',
@@ -98,6 +110,7 @@ class ProfileSerializer(serializers.ModelSerializer):
             'created_at'
         ]
         read_only_fields = ['type', 'created_at']
+        extra_kwargs = {'file': {'validators': [validate_image]}}
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -115,11 +128,11 @@ class ProfileSerializer(serializers.ModelSerializer):
 
     def update(self, instance, validated_data):
         # Handle file removal/replacement: delete previous file if replaced
+        removed_file = None
         if "file" in validated_data:
             file_val = validated_data["file"]
             if file_val in (None, ""):
-                if instance.file:
-                    instance.file.delete(save=False)
+                removed_file = instance.file.name or None
                 validated_data["file"] = None
                 validated_data["uploaded_at"] = None
             else:
@@ -131,12 +144,18 @@ class ProfileSerializer(serializers.ModelSerializer):
         if email is not None:
             user_data["email"] = email.strip().lower()
 
-        for attr in ("first_name", "last_name", "email"):
-            if attr in user_data:
-                setattr(instance.user, attr, user_data[attr])
-        instance.user.save()
+        # User, profile and the deletion task commit together; the file is
+        # only deleted once no saved profile refers to it anymore
+        with transaction.atomic():
+            for attr in ("first_name", "last_name", "email"):
+                if attr in user_data:
+                    setattr(instance.user, attr, user_data[attr])
+            instance.user.save()
 
-        return super().update(instance, validated_data)
+            instance = super().update(instance, validated_data)
+            if removed_file:
+                delete_media_file.enqueue(removed_file)
+        return instance
 
 
 class ProfileBusinessSerializer(ProfileSerializer):
@@ -149,6 +168,7 @@ class ProfileBusinessSerializer(ProfileSerializer):
             'first_name',
             'last_name',
             'file',
+            'file_variants',
             'location',
             'tel',
             'description',
@@ -168,6 +188,7 @@ class ProfileCustomerSerializer(ProfileSerializer):
             'first_name',
             'last_name',
             'file',
+            'file_variants',
             'uploaded_at',
             'type'
         ]
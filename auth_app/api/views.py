@@ -9,8 +9,10 @@ from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
-from rest_framework.throttling import ScopedRateThrottle
 from auth_app.models import Profile
+from core_app.conditional import ConditionalGetMixin
+from core_app.middleware import SerializerTimingMixin, timed_serializer
+from core_app.throttling import SlidingWindowScopedRateThrottle
 from .serializers import (
     RegistrationSerializer,
     ProfileSerializer,
@@ -28,11 +30,11 @@ class RegistrationView(APIView):
     """
 
     permission_classes = [AllowAny]
-    throttle_classes = [ScopedRateThrottle]
+    throttle_classes = [SlidingWindowScopedRateThrottle]
     throttle_scope = "auth_registration"
 
     def post(self, request):
-        serializer = RegistrationSerializer(data=request.data)
+        serializer = timed_serializer(RegistrationSerializer(data=request.data))
         serializer.is_valid(raise_exception=True)
 
         user = serializer.save()
@@ -50,19 +52,16 @@ class RegistrationView(APIView):
         )
 
 
-class LoginView(ObtainAuthToken):
+class LoginView(SerializerTimingMixin, ObtainAuthToken):
     """Token login view that returns token + basic user info on success."""
 
     permission_classes = [AllowAny]
-    throttle_classes = [ScopedRateThrottle]
+    throttle_classes = [SlidingWindowScopedRateThrottle]
     throttle_scope = "auth_login"
 
     def post(self, request):
         # Use the serializer from ObtainAuthToken to validate credentials
-        serializer = self.serializer_class(
-            data=request.data,
-            context={'request': request}
-        )
+        serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data['user']
         token, _ = Token.objects.get_or_create(user=user)
@@ -74,33 +73,40 @@ class LoginView(ObtainAuthToken):
         })
 
 
-class ProfileDetailView(generics.RetrieveUpdateAPIView):
+class ProfileDetailView(SerializerTimingMixin, ConditionalGetMixin, generics.RetrieveUpdateAPIView):
     """Retrieve or partially update a Profile.
 
     Permissions are enforced by IsOwnerProfile which allows safe methods for
-    everyone but restricts PATCH to the profile owner.
+    everyone but restricts PATCH to the profile owner. GET answers
+    conditional requests (see core_app.conditional).
     """
 
-    queryset = Profile.objects.all()
+    queryset = Profile.objects.select_related("user")
     serializer_class = ProfileSerializer
     permission_classes = [IsOwnerProfile]
     http_method_names = ["get", "patch", "head", "options"]
+    last_modified_fields = ("updated_at", "variants_updated_at")
+
+    def object_fingerprint(self, obj):
+        # User fields are shown too and User has no modification timestamp
+        user = obj.user
+        return [user.username, user.first_name, user.last_name, user.email]
 
 
-class ProfileBusinessView(generics.ListAPIView):
+class ProfileBusinessView(SerializerTimingMixin, generics.ListAPIView):
     """List profiles with type='business'."""
 
     serializer_class = ProfileBusinessSerializer
 
     def get_queryset(self):
         # Deliberately simple filter; pagination and filtering live elsewhere
-        return Profile.objects.filter(type="business")
+        return Profile.objects.filter(type="business").select_related("user")
 
 
-class ProfileCustomerView(generics.ListAPIView):
+class ProfileCustomerView(SerializerTimingMixin, generics.ListAPIView):
     """List profiles with type='customer'."""
 
     serializer_class = ProfileCustomerSerializer
 
     def get_queryset(self):
-        return Profile.objects.filter(type="customer")
\ No newline at end of file
+        return Profile.objects.filter(type="customer").select_related("user")
\ No newline at end of file
@@ -3,7 +3,7 @@
 Profile model for storing lightweight user profile data that extends the
 Django User model via a OneToOne relation. This module intentionally keeps
 the model small: it stores profile metadata (type), an optional uploaded
-file, contact fields and a creation timestamp.
+file, contact fields and creation/modification timestamps.
 
 No business logic lives in this model; it's primarily a data container used
 by the API serializers and views in `auth_app.api`.
@@ -20,8 +20,10 @@ class Profile(models.Model):
     - user: OneToOne link to Django's User model (accessible as user.profile)
     - type: 'customer' or 'business' (used for permission checks elsewhere)
     - file/uploaded_at: optional uploaded file and its timestamp
+    - file_variants/variants_updated_at: resized copies of the file and
+      when they were written (see core_app.images)
     - location, tel, description, working_hours: optional contact/meta fields
-    - created_at: automatic creation timestamp
+    - created_at/updated_at: automatic creation and modification timestamps
     """
 
     TYPE_CHOICES = [
@@ -43,6 +45,10 @@ class Profile(models.Model):
 
     # Optional uploaded profile file (stored under MEDIA_ROOT/profile/)
     file = models.FileField(upload_to='profile/', blank=True, null=True)
+    # Resized copies of `file`, written by core_app.images
+    file_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # When file_variants was last written; moves ETags, not updated_at
+    variants_updated_at = models.DateTimeField(blank=True, null=True, editable=False)
     uploaded_at = models.DateTimeField(blank=True, null=True)
 
     # Optional contact and descriptive fields
@@ -51,8 +57,15 @@ class Profile(models.Model):
     description = models.TextField(blank=True, null=True)
     working_hours = models.CharField(max_length=50, blank=True, null=True)
 
-    # Record creation time
+    # Record creation and last modification time
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Business/customer list endpoints and permission checks filter on type
+            models.Index(fields=["type"], name="profile_type_idx"),
+        ]
 
     def __str__(self):
         # Useful representation for admin and debugging
@@ -6,8 +6,9 @@ from auth_app.api.serializers import ProfileSerializer
 from auth_app.models import Profile
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.utils import timezone
+from core_app.tests.images import TemporaryMediaMixin, image_upload
 
-class ProfileHappyPathTests(APITestCase):
+class ProfileHappyPathTests(TemporaryMediaMixin, APITestCase):
 
     @classmethod
     def setUpTestData(cls):
@@ -142,7 +143,7 @@ class ProfileHappyPathTests(APITestCase):
 
     def test_upload_file_sets_uploaded_at(self):
         url = reverse('profile-detail', kwargs={'pk': self.user_profile.user_id})
-        upload = SimpleUploadedFile("avatar.jpg", b"file_content", content_type="image/jpeg")
+        upload = image_upload("avatar.jpg")
 
         response = self.client.patch(url, {'file': upload}, format='multipart')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -167,14 +168,14 @@ class ProfileHappyPathTests(APITestCase):
         self.assertEqual(self.user_profile.uploaded_at, before)
 
     def test_reupload_file_updates_uploaded_at(self):
-        first_upload = SimpleUploadedFile("first.jpg", b"aaa", content_type="image/jpeg")
+        first_upload = image_upload("first.jpg")
         url = reverse('profile-detail', kwargs={'pk': self.user_profile.user_id})
         self.client.patch(url, {'file': first_upload}, format='multipart')
         self.user_profile.refresh_from_db()
         first_time = self.user_profile.uploaded_at
         first_name = self.user_profile.file.name
 
-        second_upload = SimpleUploadedFile("second.jpg", b"bbb", content_type="image/jpeg")
+        second_upload = image_upload("second.jpg")
         response = self.client.patch(url, {'file': second_upload}, format='multipart')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
@@ -330,3 +331,48 @@ class ProfilePermissionTests(APITestCase):
         url = reverse('profile-customer-list')
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class ProfileConditionalGetTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuser', email='testuser@example.com', password='testpassword'
+        )
+        cls.profile = Profile.objects.create(user=cls.user, type='customer')
+        cls.url = reverse('profile-detail', kwargs={'pk': cls.user.pk})
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def test_304_until_profile_or_user_changes(self):
+        response = self.client.get(self.url)
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+        self.client.patch(self.url, {'first_name': 'Max'}, format='json')
+        response = self.client.get(self.url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+        # User fields changed outside the profile endpoint
+        etag = response['ETag']
+        User.objects.filter(pk=self.user.pk).update(last_name='Mustermann')
+        response = self.client.get(self.url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['last_name'], 'Mustermann')
+
+    def test_if_modified_since_is_not_trusted(self):
+        # User fields have no timestamp, so the date alone cannot prove freshness
+        last_modified = self.client.get(self.url)['Last-Modified']
+        User.objects.filter(pk=self.user.pk).update(last_name='Mustermann')
+        response = self.client.get(self.url, headers={'If-Modified-Since': last_modified})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['last_name'], 'Mustermann')
@@ -0,0 +1,211 @@
+"""Async (ASGI-native) variants of the read-heavy coderr_app endpoints.
+
+DRF has no async dispatch of its own, so `AsyncDispatchMixin` replaces
+`APIView.dispatch` with a coroutine. Request parsing, content
+negotiation, exception handling and response finalisation are DRF's
+own; authentication, permission and throttle checks run together in a
+single `sync_to_async` call (token lookup is a query). Views fetch their
+rows with the async ORM, so under an ASGI server a worker keeps serving
+other connections while a query or a slow client is pending.
+
+The views reuse the configuration of their sync counterparts (filters,
+ordering, pagination, serializers, permissions) and return identical
+responses. They only handle GET/HEAD; `urls.py` routes them in front of
+the sync views when `ASYNC_READ_VIEWS` is enabled.
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from rest_framework import generics
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from coderr_app import stats
+from core_app.conditional import ConditionalGetMixin
+from core_app.middleware import SerializerTimingMixin
+from .views import BaseInfoAPIView, OfferDetailsRetrieveAPIView, OfferViewSet, ReviewViewSet
+
+
+class AsyncDispatchMixin:
+    """Coroutine `dispatch` for read-only DRF views with async handlers."""
+
+    http_method_names = ['get', 'head', 'options']
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        """Async counterpart of `APIView.initial`."""
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        await sync_to_async(self.check_access)(request)
+
+    def check_access(self, request):
+        self.perform_authentication(request)
+        self.check_permissions(request)
+        self.check_throttles(request)
+
+    async def http_method_not_allowed(self, request, *args, **kwargs):
+        return super().http_method_not_allowed(request, *args, **kwargs)
+
+    async def options(self, request, *args, **kwargs):
+        return super().options(request, *args, **kwargs)
+
+
+class AsyncGenericAPIView(SerializerTimingMixin, AsyncDispatchMixin, generics.GenericAPIView):
+    """GenericAPIView with async filtering, pagination and object lookup."""
+
+    async def afilter_queryset(self, queryset):
+        # Filter backends only build the query; override when one needs the DB
+        return self.filter_queryset(queryset)
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+
+    async def aget_object(self):
+        """Async counterpart of `GenericAPIView.get_object`."""
+        queryset = await self.afilter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            obj = await queryset.aget(**filter_kwargs)
+        except (queryset.model.DoesNotExist, TypeError, ValueError):
+            raise Http404('No %s matches the given query.' % queryset.model._meta.object_name)
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def alist(self, request):
+        """Async counterpart of `ListModelMixin.list`."""
+        queryset = await self.afilter_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer([obj async for obj in queryset], many=True)
+        return Response(serializer.data)
+
+    async def aretrieve(self, request):
+        """Async counterpart of `RetrieveModelMixin.retrieve`."""
+        serializer = self.get_serializer(await self.aget_object())
+        return Response(serializer.data)
+
+
+class AsyncOfferViewMixin:
+    """Offer query, filters and ordering shared with OfferViewSet."""
+
+    queryset = OfferViewSet.queryset
+    filter_backends = OfferViewSet.filter_backends
+    filterset_class = OfferViewSet.filterset_class
+    search_fields = OfferViewSet.search_fields
+    ordering_fields = OfferViewSet.ordering_fields
+    ordering = OfferViewSet.ordering
+
+    get_queryset = OfferViewSet.get_queryset
+    last_modified_fields = OfferViewSet.last_modified_fields
+    object_fingerprint = OfferViewSet.object_fingerprint
+
+    async def afilter_queryset(self, queryset):
+        # The search backend may introspect the DB on first use
+        if self.request.query_params.get(api_settings.SEARCH_PARAM):
+            return await sync_to_async(self.filter_queryset)(queryset)
+        return self.filter_queryset(queryset)
+
+
+class AsyncOfferListView(AsyncOfferViewMixin, ConditionalGetMixin, AsyncGenericAPIView):
+    """GET /api/offers/ (OfferViewSet.list)."""
+
+    serializer_class = OfferViewSet.list_serializer_class
+    pagination_class = OfferViewSet.pagination_class
+    permission_classes = [AllowAny]
+
+    async def get(self, request, *args, **kwargs):
+        return await self.alist(request)
+
+
+class AsyncOfferRetrieveView(AsyncOfferViewMixin, ConditionalGetMixin, AsyncGenericAPIView):
+    """GET /api/offers/<pk>/ (OfferViewSet.retrieve)."""
+
+    serializer_class = OfferViewSet.detail_serializer_class
+    permission_classes = [IsAuthenticated]
+
+    async def get(self, request, *args, **kwargs):
+        return await self.aretrieve(request)
+
+
+class AsyncOfferDetailView(AsyncGenericAPIView):
+    """GET /api/offerdetails/<pk>/ (OfferDetailsRetrieveAPIView)."""
+
+    queryset = OfferDetailsRetrieveAPIView.queryset
+    serializer_class = OfferDetailsRetrieveAPIView.serializer_class
+
+    async def get(self, request, *args, **kwargs):
+        return await self.aretrieve(request)
+
+
+class AsyncReviewListView(ConditionalGetMixin, AsyncGenericAPIView):
+    """GET /api/reviews/ (ReviewViewSet.list)."""
+
+    queryset = ReviewViewSet.queryset
+    serializer_class = ReviewViewSet.serializer_class
+    filter_backends = ReviewViewSet.filter_backends
+    filterset_class = ReviewViewSet.filterset_class
+    ordering_fields = ReviewViewSet.ordering_fields
+    ordering = ReviewViewSet.ordering
+    permission_classes = [IsAuthenticated]
+
+    async def get(self, request, *args, **kwargs):
+        return await self.alist(request)
+
+
+class AsyncBaseInfoView(AsyncDispatchMixin, BaseInfoAPIView):
+    """GET /api/base-info/ (BaseInfoAPIView)."""
+
+    async def get(self, request, *args, **kwargs):
+        return self.base_info_response(request, *await stats.aget_base_info())
+
+
+def split_reads(async_view, sync_view):
+    """Return a view serving GET/HEAD with `async_view` and the rest with `sync_view`.
+
+    Writes keep their sync implementation; under ASGI they run in a
+    worker thread like any other sync view.
+    """
+    sync_view_async = sync_to_async(sync_view)
+
+    def select_view(request):
+        return async_view if request.method in ('GET', 'HEAD') else sync_view
+
+    async def view(request, *args, **kwargs):
+        if select_view(request) is async_view:
+            return await async_view(request, *args, **kwargs)
+        return await sync_view_async(request, *args, **kwargs)
+
+    # Read by core_app.middleware.view_name to label metrics per view
+    view.select_view = select_view
+    view.csrf_exempt = True
+    return view
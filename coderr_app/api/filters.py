@@ -8,9 +8,15 @@ match the API documentation and existing client/tests.
 
 Only documentation and comments are added here; the semantic mapping
 to model fields is unchanged.
+
+`OfferSearchFilter` is a drop-in replacement for DRF's SearchFilter that
+uses the full-text index from `coderr_app.search` when available.
 """
 
 import django_filters
+from rest_framework import filters
+from rest_framework.settings import api_settings
+from coderr_app import search
 from coderr_app.models import Offer, Review
 
 
@@ -19,20 +25,20 @@ class OfferFilter(django_filters.FilterSet):
 
     Public query params (kept for compatibility with docs/tests):
     - creator_id: filter by the user id who created the offer
-    - min_price: offers with a minimum price >= this value (annotated field)
+    - min_price: offers with a minimum price >= this value (stored column)
     - max_delivery_time: offers whose minimal delivery time <= this value
-      (the view annotates `min_delivery_time` on Offer and tests/clients
+      (compares against the stored `min_delivery_time` on Offer; tests/clients
       use the name `max_delivery_time` as the query parameter)
     """
 
     # Filter by the `user_id` (the creator/owner of the Offer)
     creator_id = django_filters.NumberFilter(field_name="user_id")
 
-    # Filter annotated min_price on the Offer queryset (gte)
+    # Filter the stored (indexed) min_price on Offer (gte)
     min_price = django_filters.NumberFilter(field_name="min_price", lookup_expr="gte")
 
     # Compatibility: tests/clients send `max_delivery_time` which should
-    # compare against the annotated `min_delivery_time` value on Offer.
+    # compare against the stored `min_delivery_time` value on Offer.
     max_delivery_time = django_filters.NumberFilter(field_name="min_delivery_time", lookup_expr="lte")
 
     class Meta:
@@ -58,4 +64,28 @@ class ReviewFilter(django_filters.FilterSet):
 
     class Meta:
         model = Review
-        fields = ["business_user_id", "reviewer_id"]
\ No newline at end of file
+        fields = ["business_user_id", "reviewer_id"]
+
+
+class OfferSearchFilter(filters.SearchFilter):
+    """Full-text `search` param for offers, ranked by relevance.
+
+    Matches every word of the query as a prefix against title and
+    description using the FTS index. Unless the client sends an explicit
+    `ordering`, results are ordered by relevance (the view's default
+    ordering breaks ties), so this backend must run after OrderingFilter.
+    Falls back to DRF's `icontains` search when no index is available.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+
+        if not search.is_available(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+
+        queryset = search.search_offers(queryset, search_terms)
+        if api_settings.ORDERING_PARAM not in request.query_params:
+            queryset = queryset.order_by('search_rank', *queryset.query.order_by)
+        return queryset
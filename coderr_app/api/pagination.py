@@ -3,14 +3,318 @@
 This provides a small page size tuned for the frontend and allows
 clients to request a larger page via the `page_size` query param up to
 `max_page_size`.
+
+Clients that walk deep into the offer list can opt into keyset (cursor)
+pagination by sending a `cursor` query param (an empty `?cursor=` starts
+at the first page). Cursor pages skip the `COUNT(*)` query and seek
+directly to the last seen row, so page N costs the same as page 1.
 """
 
-from rest_framework.pagination import PageNumberPagination
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetCursorPagination(CursorPagination):
+    """Cursor pagination that seeks on the full ordering plus a pk tie-breaker.
+
+    DRF's CursorPagination only uses the first ordering field as position
+    and falls back to an OFFSET for ties, which degrades on non-unique
+    fields such as `min_price`. Here the cursor stores the values of every
+    ordering field and the primary key, so each page is a single indexed
+    range query. NULL values are always sorted last. The cursor also
+    records its ordering; cursors reused with another ordering or with
+    values that do not fit the fields are answered with 404.
+    """
+
+    ordering = '-updated_at'
+    tie_breaker = 'pk'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self._prepare(queryset, request, view)
+        if queryset is None:
+            return None
+        # Fetch one extra row to find out whether there is a further page.
+        return self._finish(list(queryset[:self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async variant of paginate_queryset for async views."""
+        queryset = self._prepare(queryset, request, view)
+        if queryset is None:
+            return None
+        return self._finish([obj async for obj in queryset[:self.page_size + 1]])
+
+    def _prepare(self, queryset, request, view):
+        """Parse the cursor and return the ordered, seeked queryset."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view) + (self.tie_breaker,)
+        self.nullable = {
+            field.lstrip('-') for field in self.ordering
+            if self._is_nullable(queryset, field.lstrip('-'))
+        }
+
+        self.position, self.reverse = self.decode_cursor(request)
+        if self.position is not None:
+            self.position = self._parse_position(queryset, self.position)
+
+        queryset = queryset.order_by(*self._order_by(self.reverse))
+        if self.position is not None:
+            queryset = queryset.filter(self._seek(self.position, self.reverse))
+        return queryset
+
+    def _finish(self, results):
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+
+        if self.reverse:
+            self.has_next = self.position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.position is not None
+
+        self.display_page_controls = self.has_next or self.has_previous
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        position = self._get_position_from_instance(self.page[-1], self.ordering)
+        return self.encode_cursor((position, False))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return replace_query_param(self.base_url, self.cursor_query_param, '')
+        position = self._get_position_from_instance(self.page[0], self.ordering)
+        return self.encode_cursor((position, True))
+
+    def decode_cursor(self, request):
+        """Return `(position, reverse)`; position is None for the first page."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            position = payload['p']
+            reverse = bool(payload.get('r', False))
+            if not isinstance(position, list):
+                raise ValueError('position must be a list')
+            # A cursor is only valid for the ordering it was issued with
+            if payload.get('o') != list(self.ordering):
+                raise ValueError('cursor ordering does not match')
+        except (TypeError, ValueError, KeyError, AttributeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def _parse_position(self, queryset, position):
+        """Convert cursor values to the ordering fields' Python types."""
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        parsed = []
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            if value is None:
+                if name not in self.nullable:
+                    raise NotFound(self.invalid_cursor_message)
+                parsed.append(None)
+                continue
+            model_field = self._get_field(queryset, name)
+            try:
+                parsed.append(value if model_field is None else model_field.to_python(value))
+            except (ValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+        return parsed
+
+    def encode_cursor(self, cursor):
+        position, reverse = cursor
+        payload = {'o': list(self.ordering), 'p': position}
+        if reverse:
+            payload['r'] = 1
+        encoded = urlsafe_b64encode(
+            json.dumps(payload, separators=(',', ':')).encode('ascii')
+        ).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _get_position_from_instance(self, instance, ordering):
+        position = []
+        for field in ordering:
+            name = field.lstrip('-')
+            value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            # Keep full precision (DjangoJSONEncoder would drop microseconds).
+            if isinstance(value, (datetime, date)):
+                value = value.isoformat()
+            elif isinstance(value, Decimal):
+                value = str(value)
+            position.append(value)
+        return position
+
+    @staticmethod
+    def _is_nullable(queryset, name):
+        # Annotations and unknown names are treated as nullable
+        if name == 'pk':
+            return False
+        try:
+            return queryset.model._meta.get_field(name).null
+        except FieldDoesNotExist:
+            return True
+
+    @staticmethod
+    def _get_field(queryset, name):
+        """The model field or annotation output field behind an ordering name."""
+        if name == 'pk':
+            return queryset.model._meta.pk
+        try:
+            return queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            annotation = queryset.query.annotations.get(name)
+            return getattr(annotation, 'output_field', None)
+
+    def _order_by(self, reverse):
+        order_by = []
+        for field in self.ordering:
+            descending = field.startswith('-')
+            name = field.lstrip('-')
+            expression = F(name)
+            # NULLS FIRST/LAST only where needed: it stops SQLite from
+            # walking an index in order
+            if name not in self.nullable:
+                nulls = {}
+            elif reverse:
+                nulls = {'nulls_first': True}
+            else:
+                nulls = {'nulls_last': True}
+            if descending != reverse:
+                order_by.append(expression.desc(**nulls))
+            else:
+                order_by.append(expression.asc(**nulls))
+        return order_by
+
+    def _seek(self, position, reverse):
+        """Build the WHERE/HAVING clause selecting rows after `position`."""
+        seek = Q(pk__in=[])
+        equal_so_far = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            lookup = f'{name}__lt' if descending else f'{name}__gt'
+
+            if value is None:
+                # NULLs sort last going forward and first going backwards.
+                after = Q(**{f'{name}__isnull': False}) if reverse else Q(pk__in=[])
+                equal = Q(**{f'{name}__isnull': True})
+            else:
+                after = Q(**{lookup: value})
+                if not reverse and name in self.nullable:
+                    after |= Q(**{f'{name}__isnull': True})
+                equal = Q(**{name: value})
+
+            seek |= equal_so_far & after
+            equal_so_far &= equal
+        return seek
 
 
 class StandardResultsSetPagination(PageNumberPagination):
-    """PageNumberPagination with small default page size and client-overridable parameter."""
+    """PageNumberPagination with small default page size and client-overridable parameter.
+
+    Sending a `cursor` query param switches the request to
+    KeysetCursorPagination; the page-number envelope stays the default.
+    """
 
     page_size = 6
     page_size_query_param = 'page_size'
-    max_page_size = 100
\ No newline at end of file
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    cursor_pagination_class = KeysetCursorPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self._use_cursor(request):
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        count = getattr(view, 'paginator_count', None)
+        if count is None:
+            return super().paginate_queryset(queryset, request, view)
+        if self._page(queryset, request, count) is None:
+            return None
+        return list(self.page)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async variant of paginate_queryset: COUNT and page via the async ORM."""
+        if self._use_cursor(request):
+            return await self.cursor_paginator.apaginate_queryset(queryset, request, view)
+        count = getattr(view, 'paginator_count', None)
+        if count is None:
+            count = await queryset.acount()
+        if self._page(queryset, request, count) is None:
+            return None
+        self.page.object_list = [obj async for obj in self.page.object_list]
+        return list(self.page)
+
+    def _page(self, queryset, request, count):
+        """Set up self.page (not yet evaluated) from an already known row count.
+
+        Views that already counted the rows (see ConditionalGetMixin) set
+        `paginator_count` to skip the COUNT query.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        # Paginator.count is a cached_property; fill it so page() does not query
+        paginator.count = count
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            ))
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def counts_rows(self, request):
+        """True when the page-number envelope (with `count`) will be used."""
+        return self.cursor_query_param not in request.query_params
+
+    def validator_state(self):
+        """Envelope values besides the rows themselves, for list ETags."""
+        if self.cursor_paginator is not None:
+            return [self.cursor_paginator.has_next, self.cursor_paginator.has_previous]
+        return [self.page.paginator.count]
+
+    def _use_cursor(self, request):
+        if self.cursor_query_param not in request.query_params:
+            self.cursor_paginator = None
+            return False
+        self.cursor_paginator = self.cursor_pagination_class()
+        self.cursor_paginator.page_size = self.page_size
+        self.cursor_paginator.page_size_query_param = self.page_size_query_param
+        self.cursor_paginator.max_page_size = self.max_page_size
+        self.cursor_paginator.cursor_query_param = self.cursor_query_param
+        return True
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -5,10 +5,46 @@ reviews. Most validation (for example: exactly three OfferDetail entries
 with unique offer_type values) happens here to keep models thin.
 """
 
-from rest_framework import serializers
+from functools import partial
+
+from rest_framework import ISO_8601, serializers
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.settings import api_settings
+from coderr_app import stats
 from coderr_app.models import Offer, OfferDetail, Order, Review
+from core_app import images
+from core_app.images import ImageVariantsField, validate_image
+from core_app.uploads import AttachUploadsMixin, ChunkedUploadField
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Manager
+from django.utils import timezone
+
+
+def offer_summary(detail_data):
+    """Compute Offer.min_price/min_delivery_time from detail dicts in memory."""
+    return {
+        'min_price': min(detail['price'] for detail in detail_data),
+        'min_delivery_time': min(detail['delivery_time_in_days'] for detail in detail_data),
+    }
+
+
+def attach_details(offer, details):
+    """Keep known detail rows on the offer so serializing it needs no query."""
+    offer.attached_details = list(details)
+
+
+def offer_details(offer):
+    """The rows given to attach_details(), else `offer.details.all()`."""
+    details = getattr(offer, 'attached_details', None)
+    return details if details is not None else offer.details.all()
+
+
+class OfferDetailsListSerializer(serializers.ListSerializer):
+    """`details` of an offer, read through offer_details()."""
+
+    def get_attribute(self, instance):
+        return offer_details(instance)
 
 # --- CREATE and UPDATE SERIALIZERS ---
 
@@ -42,21 +78,24 @@ class OfferDetailItemNestedSerializer(serializers.ModelSerializer):
         extra_kwargs = {
             'offer_type': {'required': True}
         }
+        list_serializer_class = OfferDetailsListSerializer
 
 
-class OfferSerializer(serializers.ModelSerializer):
+class OfferSerializer(AttachUploadsMixin, serializers.ModelSerializer):
     """Serializer for creating/updating an Offer with nested details.
 
     The validate() method enforces exactly three detail items on creation
     and prevents duplicate `offer_type` values on update.
     """
 
-    image = serializers.FileField(required=False, allow_null=True)
+    image = serializers.FileField(required=False, allow_null=True, validators=[validate_image])
+    # Id of a completed chunked upload, as an alternative to a multipart file
+    image_upload = ChunkedUploadField(source='image', required=False, validators=[validate_image])
     details = OfferDetailItemNestedSerializer(many=True, required=False)
 
     class Meta:
         model = Offer
-        fields = ['id', 'title', 'image', 'description', 'details']
+        fields = ['id', 'title', 'image', 'image_upload', 'description', 'details']
         read_only_fields = ['id']
 
     def validate(self, attrs):
@@ -90,39 +129,109 @@ class OfferSerializer(serializers.ModelSerializer):
         return attrs
 
     def create(self, validated_data):
-        # Create the Offer and its nested details
+        # Create the Offer (summary columns precomputed) and its three details
         detail_data = validated_data.pop('details')
 
-        offer = Offer.objects.create(**validated_data)
-        for detail in detail_data:
-            OfferDetail.objects.create(offer=offer, **detail)
+        offer = Offer.objects.create(**validated_data, **offer_summary(detail_data))
+        details = OfferDetail.objects.bulk_create(
+            [OfferDetail(offer=offer, **detail) for detail in detail_data]
+        )
+        attach_details(offer, details)
         return offer
 
+    @classmethod
+    def bulk_create(cls, validated_items, **extra):
+        """Create many validated offers with two bulk INSERTs.
+
+        `validated_items` are `validated_data` dicts from individual
+        OfferSerializer instances; `extra` (e.g. user=...) applies to all.
+        bulk_create skips signals, so image metadata is stripped, image
+        variants are scheduled and the base-info offer counter is adjusted
+        here (the FTS index is maintained by triggers).
+        """
+        offers, detail_groups = [], []
+        for item in validated_items:
+            item = dict(item)
+            detail_data = item.pop('details')
+            offer = Offer(**item, **extra, **offer_summary(detail_data))
+            images.strip_original(offer, 'image')
+            offers.append(offer)
+            detail_groups.append(detail_data)
+
+        Offer.objects.bulk_create(offers)
+        for offer in offers:
+            if images.variants_outdated(offer, 'image'):
+                images.schedule_variants(offer, 'image')
+        details = OfferDetail.objects.bulk_create([
+            OfferDetail(offer=offer, **detail)
+            for offer, detail_data in zip(offers, detail_groups)
+            for detail in detail_data
+        ])
+
+        position = 0
+        for offer, detail_data in zip(offers, detail_groups):
+            attach_details(offer, details[position:position + len(detail_data)])
+            position += len(detail_data)
+
+        transaction.on_commit(partial(stats.adjust, 'offer_count', len(offers)))
+        return offers
+
     def update(self, instance, validated_data):
-        # Update the offer fields and patch existing details by offer_type
+        # Patch offer fields and existing details (matched by offer_type)
+        # in as few queries as possible: details are read once (normally
+        # from the view's prefetch), changed details are written with one
+        # bulk_update and the offer is only saved if one of its own fields
+        # or its summary columns changed.
         detail_data = validated_data.pop('details', None)
 
-        instance.title = validated_data.get('title', instance.title)
-        instance.description = validated_data.get(
-            'description', instance.description)
-        instance.image = validated_data.get('image', instance.image)
-        instance.save()
+        changed_fields = []
+        for attr in ('title', 'description', 'image'):
+            if attr in validated_data and getattr(instance, attr) != validated_data[attr]:
+                setattr(instance, attr, validated_data[attr])
+                changed_fields.append(attr)
 
+        details = list(instance.details.all())
         if detail_data:
+            by_type = {detail.offer_type: detail for detail in details}
+            missing = [d['offer_type'] for d in detail_data if d['offer_type'] not in by_type]
+            if missing:
+                raise serializers.ValidationError(
+                    f"Detail with offer_type '{missing[0]}' does not exist."
+                )
+
+            changed_details, changed_detail_fields = [], set()
             for detail in detail_data:
-                try:
-                    single_detail = instance.details.get(
-                        offer_type=detail['offer_type'])
-                except OfferDetail.DoesNotExist:
-                    raise serializers.ValidationError(
-                        f"Detail with offer_type '{detail['offer_type']}' does not exist."
-                    )
+                single_detail = by_type[detail['offer_type']]
+                dirty = False
                 for attr, value in detail.items():
-                    if attr == 'offer_type':
+                    if attr == 'offer_type' or getattr(single_detail, attr) == value:
                         continue
                     setattr(single_detail, attr, value)
-                single_detail.save()
-
+                    changed_detail_fields.add(attr)
+                    dirty = True
+                if dirty:
+                    changed_details.append(single_detail)
+
+            if changed_details:
+                # bulk_update skips auto_now, so set updated_at explicitly
+                now = timezone.now()
+                for single_detail in changed_details:
+                    single_detail.updated_at = now
+                OfferDetail.objects.bulk_update(
+                    changed_details, sorted(changed_detail_fields) + ['updated_at'])
+                summary = offer_summary([
+                    {'price': d.price, 'delivery_time_in_days': d.delivery_time_in_days}
+                    for d in details
+                ])
+                for attr, value in summary.items():
+                    if getattr(instance, attr) != value:
+                        setattr(instance, attr, value)
+                        changed_fields.append(attr)
+
+        if changed_fields:
+            instance.save(update_fields=changed_fields + ['updated_at'])
+
+        attach_details(instance, details)
         return instance
 
 # --- LIST and DETAIL SERIALIZERS ---
@@ -147,29 +256,127 @@ class OfferListDetailNestedSerializer(serializers.ModelSerializer):
         model = OfferDetail
         fields = ['id', 'url']
         read_only_fields = ['id', 'url']
+        list_serializer_class = OfferDetailsListSerializer
+
+
+def datetime_getter(field):
+    """Return a callable rendering datetimes exactly like `field.to_representation`.
+
+    Format and timezone are resolved once instead of per value.
+    """
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def to_representation(value):
+        if not value or timezone.is_naive(value):
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return to_representation
+
+
+class OfferListItemsSerializer(serializers.ListSerializer):
+    """Read-only fast path for `OfferListSerializer(many=True)`.
+
+    The offer list renders up to 100 offers with three detail URLs each;
+    going through DRF's per-row field machinery (nested serializers and a
+    `reverse()` per detail URL) dominated the request. Here the row
+    layout is built once per call: the detail URL is reversed once with a
+    marker pk and split into prefix and suffix, datetime fields have
+    their format and timezone resolved up front, and every offer becomes
+    one dict literal. The output is identical to the generic path, which
+    is still used without a request in the context or if the child's
+    fields no longer match `fields`.
+    """
+
+    # Must equal OfferListSerializer.Meta.fields
+    fields = ('id', 'user', 'title', 'image', 'image_variants', 'description', 'created_at',
+              'updated_at', 'details', 'min_price', 'min_delivery_time', 'user_detail')
+    url_marker = 987654321
+
+    def to_representation(self, data):
+        row = self.row_builder()
+        if row is None:
+            return super().to_representation(data)
+        iterable = data.all() if isinstance(data, Manager) else data
+        return [row(offer) for offer in iterable]
+
+    def row_builder(self):
+        """Return a function rendering one offer, or None to use the generic path."""
+        fields = self.child.fields
+        request = self.context.get('request')
+        if request is None or tuple(fields) != self.fields:
+            return None
+
+        detail_url = self.detail_url_builder(fields['details'].child.fields['url'], request)
+        image = fields['image'].to_representation
+        image_variants = fields['image_variants'].to_representation
+        created_at = datetime_getter(fields['created_at'])
+        updated_at = datetime_getter(fields['updated_at'])
+
+        def row(offer):
+            user = offer.user
+            return {
+                'id': offer.pk,
+                'user': offer.user_id,
+                'title': offer.title,
+                'image': image(offer.image),
+                'image_variants': image_variants(offer),
+                'description': offer.description,
+                'created_at': created_at(offer.created_at),
+                'updated_at': updated_at(offer.updated_at),
+                'details': [
+                    {'id': detail.pk, 'url': detail_url(detail.pk)} for detail in offer_details(offer)
+                ],
+                'min_price': offer.min_price,
+                'min_delivery_time': offer.min_delivery_time,
+                'user_detail': {
+                    'first_name': user.first_name,
+                    'last_name': user.last_name,
+                    'username': user.username,
+                },
+            }
+        return row
+
+    def detail_url_builder(self, url_field, request):
+        """Reverse the detail URL once and return `pk -> absolute URL`."""
+        format = self.context.get('format')
+        if format and url_field.format and url_field.format != format:
+            format = url_field.format
+        url = url_field.get_url(
+            OfferDetail(pk=self.url_marker), url_field.view_name, request, format
+        )
+        prefix, _, suffix = url.rpartition(str(self.url_marker))
+        return lambda pk: f'{prefix}{pk}{suffix}'
 
 
 class OfferListSerializer(OfferSerializer):
     user = serializers.PrimaryKeyRelatedField(read_only=True)
     user_detail = OfferListUserNestedSerializer(source='user', read_only=True)
     details = OfferListDetailNestedSerializer(many=True, read_only=True)
+    image_variants = ImageVariantsField('image')
 
-    # Annotated fields provided by the view's queryset
+    # Denormalized summary columns maintained on write
     min_price = serializers.IntegerField(read_only=True)
     min_delivery_time = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Offer
-        fields = ['id', 'user', 'title', 'image', 'description', 'created_at',
+        fields = ['id', 'user', 'title', 'image', 'image_variants', 'description', 'created_at',
                   'updated_at', 'details', 'min_price', 'min_delivery_time', 'user_detail']
         read_only_fields = ['id']
+        list_serializer_class = OfferListItemsSerializer
 
 
 class OfferDetailSerializer(OfferListSerializer):
 
     class Meta:
         model = Offer
-        fields = ['id', 'user', 'title', 'image', 'description', 'created_at',
+        fields = ['id', 'user', 'title', 'image', 'image_variants', 'description', 'created_at',
                   'updated_at', 'details', 'min_price', 'min_delivery_time']
         read_only_fields = ['id']
 
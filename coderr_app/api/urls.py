@@ -2,13 +2,24 @@
 
 The router exposes the standard viewset endpoints and a few custom
 paths are registered below (offerdetails, order counts, base info).
+
+With `ASYNC_READ_VIEWS` enabled, GET/HEAD on the read-heavy routes are
+served by the async views in `async_views` (same paths and names).
 """
 
-from django.urls import path, include
+from django.urls import path
+from django.urls.resolvers import URLPattern
 from django.conf import settings
-from django.conf.urls.static import static
 from rest_framework import routers
 from .views import BaseInfoAPIView, OfferViewSet, OfferDetailsRetrieveAPIView, OrderCountView, OrderViewSet, ReviewViewSet
+from .async_views import (
+    AsyncBaseInfoView,
+    AsyncOfferDetailView,
+    AsyncOfferListView,
+    AsyncOfferRetrieveView,
+    AsyncReviewListView,
+    split_reads,
+)
 
 router = routers.SimpleRouter()
 router.register(r'offers', OfferViewSet)
@@ -32,6 +43,34 @@ urlpatterns = [
     ),
     # Public base info used by the frontend
     path('base-info/', BaseInfoAPIView.as_view(), name='base-info'),
-    # Include automatically generated router URLs
-    path('', include(router.urls)),
 ]
+# Automatically generated router URLs
+urlpatterns += router.urls
+
+# URL name -> async view serving its GET/HEAD requests
+ASYNC_READS = {
+    'offer-list': AsyncOfferListView,
+    'offer-detail': AsyncOfferRetrieveView,
+    'offerdetail-detail': AsyncOfferDetailView,
+    'base-info': AsyncBaseInfoView,
+    'review-list': AsyncReviewListView,
+}
+
+
+def with_async_reads(patterns):
+    """Return `patterns` with the ASYNC_READS routes split by method."""
+    return [
+        URLPattern(
+            pattern.pattern,
+            split_reads(ASYNC_READS[pattern.name].as_view(), pattern.callback),
+            pattern.default_args,
+            pattern.name,
+        )
+        if pattern.name in ASYNC_READS and not hasattr(pattern.callback, 'select_view')
+        else pattern
+        for pattern in patterns
+    ]
+
+
+if settings.ASYNC_READ_VIEWS:
+    urlpatterns = with_async_reads(urlpatterns)
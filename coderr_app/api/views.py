@@ -4,16 +4,25 @@ Only docstrings and short comments are added in this patch; the view
 logic and permissions remain unchanged.
 """
 
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import transaction
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Min, Avg
 from django.shortcuts import get_object_or_404
-from rest_framework import viewsets, generics, filters
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import viewsets, generics, filters, status
+from rest_framework.decorators import action
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
-from coderr_app.models import Offer, OfferDetail, Order, Review
+from rest_framework.parsers import MultiPartParser, FormParser
+from coderr_app import stats
+from core_app.conditional import ConditionalGetMixin
+from core_app.fastjson import FastJSONParser
+from core_app.middleware import SerializerTimingMixin, timed_serializer
+from core_app.uploads import release_uploads
+from coderr_app.models import BusinessOrderCounter, Offer, OfferDetail, Order, Review
 from .serializer import (
     OfferSerializer,
     OfferListSerializer,
@@ -33,15 +42,15 @@ from .permissions import (
     IsStaffUser,
 )
 from .pagination import StandardResultsSetPagination
-from .filters import OfferFilter, ReviewFilter
-from auth_app.models import Profile
+from .filters import OfferFilter, OfferSearchFilter, ReviewFilter
 
 
-class OfferViewSet(viewsets.ModelViewSet):
+class OfferViewSet(SerializerTimingMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """CRUD for Offer objects with filtering, searching and ordering.
 
     The view dynamically selects a serializer class for list/detail vs
-    create/update and enforces permissions per action.
+    create/update and enforces permissions per action. List and retrieve
+    answer conditional GETs (see core_app.conditional).
     """
 
     queryset = Offer.objects.all()
@@ -50,21 +59,22 @@ class OfferViewSet(viewsets.ModelViewSet):
     list_serializer_class = OfferListSerializer
     detail_serializer_class = OfferDetailSerializer
 
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    # OfferSearchFilter runs last so it can order by relevance
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, OfferSearchFilter]
     filterset_class = OfferFilter
     search_fields = ['title', 'description']
     ordering_fields = ['updated_at', 'min_price']
     ordering = ['-updated_at']
+    # Rendered image variants change the response, not updated_at
+    last_modified_fields = ('updated_at', 'variants_updated_at')
 
-    parser_classes = [JSONParser, MultiPartParser, FormParser]
+    parser_classes = [FastJSONParser, MultiPartParser, FormParser]
     pagination_class = StandardResultsSetPagination
+    bulk_max_items = 50
 
     def get_queryset(self):
-        queryset = Offer.objects.select_related("user").prefetch_related("details")
-        return queryset.annotate(
-            min_price=Min("details__price"),
-            min_delivery_time=Min("details__delivery_time_in_days"),
-        )
+        # min_price/min_delivery_time are stored columns kept in sync on write
+        return Offer.objects.select_related("user").prefetch_related("details")
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -79,30 +89,88 @@ class OfferViewSet(viewsets.ModelViewSet):
             return [AllowAny()]
         elif self.action == "retrieve":
             return [IsAuthenticated()]
-        elif self.action == "create":
+        elif self.action in ["create", "bulk"]:
             return [IsAuthenticated(), IsBusinessUser()]
         elif self.action in ["update", "partial_update", "destroy"]:
             return [IsAuthenticated(), IsOfferOwner()]
         return [IsAuthenticated()]
 
+    def object_fingerprint(self, obj):
+        # Detail changes outside the API refresh the summary without updated_at
+        return [obj.min_price, obj.min_delivery_time]
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
-
-class OfferDetailsRetrieveAPIView(generics.RetrieveAPIView):
+    @action(detail=False, methods=['post'], url_path='bulk', parser_classes=[FastJSONParser])
+    def bulk(self, request, *args, **kwargs):
+        """Create up to `bulk_max_items` offers from a JSON list in one transaction.
+
+        Each item is validated with OfferSerializer on its own. Valid items
+        are written together with bulk_create; the response lists one result
+        per input item (201 + data or 400 + errors). The overall status is
+        201 when all items were created, 400 when none were and 207 otherwise.
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"detail": "Expected a non-empty list of offers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > self.bulk_max_items:
+            return Response(
+                {"detail": f"At most {self.bulk_max_items} offers can be created per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        context = self.get_serializer_context()
+        results, valid = [], []
+        for item in items:
+            serializer = timed_serializer(OfferSerializer(data=item, context=context))
+            if serializer.is_valid():
+                valid.append(serializer.validated_data)
+                results.append(None)
+            else:
+                results.append({"status": status.HTTP_400_BAD_REQUEST, "errors": serializer.errors})
+
+        if valid:
+            with transaction.atomic():
+                offers = OfferSerializer.bulk_create(valid, user=request.user)
+                for item in valid:
+                    release_uploads(item)
+            created = iter(offers)
+            for index, result in enumerate(results):
+                if result is None:
+                    data = timed_serializer(OfferSerializer(next(created), context=context)).data
+                    results[index] = {"status": status.HTTP_201_CREATED, "data": data}
+
+        if len(valid) == len(items):
+            response_status = status.HTTP_201_CREATED
+        elif not valid:
+            response_status = status.HTTP_400_BAD_REQUEST
+        else:
+            response_status = status.HTTP_207_MULTI_STATUS
+        return Response(results, status=response_status)
+
+
+class OfferDetailsRetrieveAPIView(SerializerTimingMixin, generics.RetrieveAPIView):
     """Retrieve single OfferDetail item."""
 
     queryset = OfferDetail.objects.all()
     serializer_class = OfferDetailItemSerializer
 
 
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(SerializerTimingMixin, ConditionalGetMixin, viewsets.ModelViewSet):
 
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
     patch_serializer_class = OrderStatusUpdateSerializer
     http_method_names = ['get', 'post', 'patch', 'delete', 'head', 'options']
 
+    # Orders render the current offer detail values; the list is per user
+    last_modified_fields = ('updated_at', 'offer_detail__updated_at')
+    conditional_per_user = True
+
     def get_queryset(self):
         user = self.request.user
         if self.action == "list":
@@ -130,19 +198,32 @@ class OrderViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         offer_detail_id = serializer.validated_data.pop("offer_detail_id")
-        offer_detail = get_object_or_404(OfferDetail, pk=offer_detail_id)
+        offer_detail = get_object_or_404(
+            OfferDetail.objects.select_related("offer"), pk=offer_detail_id)
 
-        serializer.save(
-            offer_detail=offer_detail,
-            customer_user=self.request.user,
-            business_user=offer_detail.offer.user,
-        )
+        # The order and its BusinessOrderCounter update commit together
+        with transaction.atomic():
+            serializer.save(
+                offer_detail=offer_detail,
+                customer_user=self.request.user,
+                business_user_id=offer_detail.offer.user_id,
+            )
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
 
 
 class OrderCountView(APIView):
     """Return a count of orders for a given business user and status.
 
     The view is configured via as_view(status=..., count_key=...) in urls.
+    Counts come from the user's BusinessOrderCounter row (one primary-key
+    lookup); users without a row fall back to counting Order rows.
     """
 
     permission_classes = [IsAuthenticated]
@@ -153,13 +234,19 @@ class OrderCountView(APIView):
     def get(self, request, business_user_id: int, *args, **kwargs):
         status_value = getattr(self, "status", kwargs.get("status", "in_progress"))
         count_key = getattr(self, "count_key", kwargs.get("count_key", "order_count"))
-        business_user = get_object_or_404(User, pk=business_user_id)
-        count = Order.objects.filter(
-            business_user=business_user, status=status_value).count()
+        count = (
+            BusinessOrderCounter.objects.filter(pk=business_user_id)
+            .values_list(status_value, flat=True)
+            .first()
+        )
+        if count is None:
+            business_user = get_object_or_404(User, pk=business_user_id)
+            count = Order.objects.filter(
+                business_user=business_user, status=status_value).count()
         return Response({count_key: count})
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(SerializerTimingMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """CRUD for reviews with filtering and ordering support."""
 
     queryset = Review.objects.all()
@@ -189,22 +276,26 @@ class ReviewViewSet(viewsets.ModelViewSet):
 
 
 class BaseInfoAPIView(APIView):
-    """Public endpoint that returns aggregate base information used by the frontend."""
+    """Public endpoint that returns aggregate base information used by the frontend.
+
+    Counters are served from the cache (see coderr_app.stats). The response
+    carries an ETag and a public Cache-Control max-age so browsers and
+    proxies can revalidate or reuse it; a matching If-None-Match yields 304.
+    """
 
     permission_classes = [AllowAny]
     
     def get(self, request, *args, **kwargs):
-        review_count = Review.objects.count()
-        avg = Review.objects.aggregate(avg=Avg("rating"))["avg"] or 0
-        average_rating = round(avg, 1)
-        business_profile_count = Profile.objects.filter(type="business").count()
-        offer_count = Offer.objects.count()
-
-        data = {
-            "review_count": review_count,
-            "average_rating": average_rating,
-            "business_profile_count": business_profile_count,
-            "offer_count": offer_count,
-        }
-
-        return Response(data)
+        return self.base_info_response(request, *stats.get_base_info())
+
+    def base_info_response(self, request, data, etag):
+        etag = quote_etag(etag)
+
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(data)
+
+        response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=settings.BASE_INFO_MAX_AGE)
+        return response
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CoderrAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'coderr_app'
+
+    def ready(self):
+        # Register signal handlers (denormalized offer summary columns)
+        from coderr_app import signals  # noqa: F401
@@ -0,0 +1,60 @@
+"""Backfill or verify the denormalized summary columns on Offer.
+
+Usage:
+    python manage.py backfill_offer_summary            # fix stale rows
+    python manage.py backfill_offer_summary --verify   # report only, fail on drift
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Min
+
+from coderr_app.models import Offer
+
+
+class Command(BaseCommand):
+    help = "Recompute Offer.min_price/min_delivery_time from OfferDetail rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only report offers whose stored values are stale; exit non-zero if any.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of offers updated per bulk_update call.",
+        )
+
+    def handle(self, *args, **options):
+        verify = options["verify"]
+        batch_size = options["batch_size"]
+
+        rows = (
+            Offer.objects.order_by()
+            .annotate(
+                calc_price=Min("details__price"),
+                calc_delivery_time=Min("details__delivery_time_in_days"),
+            )
+            .values_list("pk", "min_price", "min_delivery_time", "calc_price", "calc_delivery_time")
+        )
+
+        checked = 0
+        stale = []
+        for pk, min_price, min_delivery_time, calc_price, calc_delivery_time in rows.iterator(chunk_size=batch_size):
+            checked += 1
+            if (min_price, min_delivery_time) != (calc_price, calc_delivery_time):
+                stale.append(Offer(pk=pk, min_price=calc_price, min_delivery_time=calc_delivery_time))
+
+        if verify:
+            if stale:
+                ids = ", ".join(str(offer.pk) for offer in stale[:20])
+                raise CommandError(f"{len(stale)} of {checked} offers have stale summary columns (ids: {ids}).")
+            self.stdout.write(self.style.SUCCESS(f"All {checked} offers are in sync."))
+            return
+
+        with transaction.atomic():
+            Offer.objects.bulk_update(stale, ["min_price", "min_delivery_time"], batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} offers, updated {len(stale)}."))
@@ -0,0 +1,27 @@
+"""Create (if needed) and rebuild the offer full-text search index.
+
+Usage:
+    python manage.py rebuild_offer_search
+"""
+
+from django.core.management.base import BaseCommand
+
+from coderr_app import search
+
+
+class Command(BaseCommand):
+    help = "Create and rebuild the full-text search index for offers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default", help="Database alias to use.")
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        search.ensure_search_index(using)
+        if not search.is_available(using):
+            self.stdout.write(self.style.WARNING(
+                "No full-text index available for this database; search falls back to LIKE."
+            ))
+            return
+        search.rebuild_search_index(using)
+        self.stdout.write(self.style.SUCCESS("Offer search index rebuilt."))
@@ -0,0 +1,76 @@
+"""Reconcile BusinessOrderCounter rows with the Order table.
+
+Usage:
+    python manage.py reconcile_order_counters            # fix drifted rows
+    python manage.py reconcile_order_counters --verify   # report only, fail on drift
+"""
+
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+
+from coderr_app.models import BusinessOrderCounter, Order
+
+STATUSES = [status for status, _ in Order.STATUS_CHOICES]
+
+
+class Command(BaseCommand):
+    help = "Recount orders per business user and status and fix BusinessOrderCounter rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only report drifted counters; exit non-zero if any.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows written per bulk call.",
+        )
+
+    def handle(self, *args, **options):
+        verify = options["verify"]
+        batch_size = options["batch_size"]
+
+        actual = defaultdict(lambda: dict.fromkeys(STATUSES, 0))
+        grouped = (
+            Order.objects.order_by()
+            .values_list("business_user_id", "status")
+            .annotate(total=Count("id"))
+        )
+        for business_user_id, status, total in grouped.iterator(chunk_size=batch_size):
+            actual[business_user_id][status] = total
+
+        stored = {
+            row["pk"]: row
+            for row in BusinessOrderCounter.objects.values("pk", *STATUSES).iterator(chunk_size=batch_size)
+        }
+
+        to_create, to_update = [], []
+        for business_user_id in actual.keys() | stored.keys():
+            counts = actual.get(business_user_id, dict.fromkeys(STATUSES, 0))
+            row = stored.get(business_user_id)
+            if row is None:
+                to_create.append(BusinessOrderCounter(pk=business_user_id, **counts))
+            elif any(row[status] != counts[status] for status in STATUSES):
+                to_update.append(BusinessOrderCounter(pk=business_user_id, **counts))
+
+        drifted = len(to_create) + len(to_update)
+        if verify:
+            if drifted:
+                raise CommandError(
+                    f"{len(to_update)} counters drifted and {len(to_create)} are missing."
+                )
+            self.stdout.write(self.style.SUCCESS(f"All {len(stored)} counters are in sync."))
+            return
+
+        with transaction.atomic():
+            BusinessOrderCounter.objects.bulk_create(to_create, batch_size=batch_size)
+            BusinessOrderCounter.objects.bulk_update(to_update, STATUSES, batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(to_create)} and updated {len(to_update)} counters."
+        ))
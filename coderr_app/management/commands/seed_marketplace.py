@@ -0,0 +1,62 @@
+"""Seed the database with a synthetic, production-shaped marketplace.
+
+Usage:
+    python manage.py seed_marketplace                                  # ~500 users, 1000 offers
+    python manage.py seed_marketplace --business 20000 --customers 200000 \
+        --orders 2000000 --batch-size 5000 --seed 7                    # benchmark scale
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from coderr_app.seeding import MarketplaceSeeder, SeedConfig
+
+
+class Command(BaseCommand):
+    help = "Generate business/customer profiles, offers, orders and reviews for load tests."
+
+    def add_arguments(self, parser):
+        defaults = SeedConfig()
+        parser.add_argument("--business", type=int, default=defaults.business,
+                            help="Number of business users.")
+        parser.add_argument("--customers", type=int, default=defaults.customers,
+                            help="Number of customer users.")
+        parser.add_argument("--offers-per-business", type=int, default=defaults.offers_per_business,
+                            help="Offers per business user (each with three detail tiers).")
+        parser.add_argument("--orders", type=int, default=defaults.orders,
+                            help="Total number of orders, spread over all statuses.")
+        parser.add_argument("--reviews-per-customer", type=int, default=defaults.reviews_per_customer,
+                            help="Reviews each customer writes for distinct business users.")
+        parser.add_argument("--batch-size", type=int, default=defaults.batch_size,
+                            help="Number of rows written per bulk call.")
+        parser.add_argument("--seed", type=int, default=defaults.seed,
+                            help="Random seed; the same seed always produces the same data.")
+        parser.add_argument("--prefix", default=defaults.prefix,
+                            help="Username prefix for generated users.")
+        parser.add_argument("--password", default=defaults.password,
+                            help="Password set on every generated user.")
+
+    def handle(self, *args, **options):
+        config = SeedConfig(
+            business=options["business"],
+            customers=options["customers"],
+            offers_per_business=options["offers_per_business"],
+            orders=options["orders"],
+            reviews_per_customer=options["reviews_per_customer"],
+            batch_size=options["batch_size"],
+            seed=options["seed"],
+            prefix=options["prefix"],
+            password=options["password"],
+        )
+        if min(config.business, config.customers, config.offers_per_business,
+               config.orders, config.reviews_per_customer) < 0 or config.batch_size < 1:
+            raise CommandError("Counts must not be negative and --batch-size must be positive.")
+
+        seeder = MarketplaceSeeder(config, log=self.stdout.write)
+        if seeder.usernames_taken():
+            raise CommandError(
+                f"Users with prefix '{config.prefix}_' already exist; choose another --prefix."
+            )
+
+        counts = seeder.run()
+        summary = ", ".join(f"{total} {name.replace('_', ' ')}" for name, total in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Created {summary}."))
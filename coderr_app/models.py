@@ -9,6 +9,7 @@ unit testing and reasoning simpler for this project.
 """
 
 from django.db import models
+from django.db.models import Count, F, Min
 from django.contrib.auth.models import User
 
 
@@ -17,18 +18,49 @@ class Offer(models.Model):
 
     Offers have a title, description and optional image. Detailed price
     tiers are stored in the related OfferDetail model (one-to-many).
+
+    `min_price` and `min_delivery_time` are denormalized copies of the
+    cheapest/fastest detail so list filtering and ordering can use an
+    index instead of aggregating over OfferDetail on every request.
     """
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="offers")
     title = models.CharField(max_length=100)
     description = models.TextField()
     image = models.FileField(upload_to='offers/', blank=True, null=True)
+    # Resized copies of `image`, written by core_app.images
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # When image_variants was last written; moves ETags, not updated_at
+    variants_updated_at = models.DateTimeField(blank=True, null=True, editable=False)
+    min_price = models.IntegerField(blank=True, null=True, editable=False, db_index=True)
+    min_delivery_time = models.IntegerField(blank=True, null=True, editable=False, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Default list ordering and the creator_id filter + ordering;
+            # variants_updated_at lets the list ETag aggregate use the index
+            models.Index(fields=["-updated_at", "variants_updated_at"], name="offer_updated_idx"),
+            models.Index(fields=["user", "-updated_at"], name="offer_user_updated_idx"),
+        ]
+
     def __str__(self):
         return self.title
 
+    def refresh_summary(self):
+        """Recompute the stored min_price/min_delivery_time from the details.
+
+        Uses a queryset update so `updated_at` is left untouched.
+        """
+        summary = self.details.aggregate(
+            min_price=Min("price"),
+            min_delivery_time=Min("delivery_time_in_days"),
+        )
+        self.min_price = summary["min_price"]
+        self.min_delivery_time = summary["min_delivery_time"]
+        Offer.objects.filter(pk=self.pk).update(**summary)
+
 
 class OfferDetail(models.Model):
     """A single tier/detail for an Offer (basic/standard/premium).
@@ -50,6 +82,14 @@ class OfferDetail(models.Model):
     price = models.IntegerField()
     features = models.JSONField(default=list)
     offer_type = models.CharField(max_length=10, choices=TYPE_CHOICES, default='basic')
+    # Orders show the current detail values, so their ETags include this
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Detail lookups by tier when patching an offer
+            models.Index(fields=["offer", "offer_type"], name="offerdetail_offer_type_idx"),
+        ]
 
     def __str__(self):
         return f"Detail for {self.offer.title}"
@@ -75,10 +115,68 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # customer_user lookups use the implicit foreign key index
+        indexes = [
+            models.Index(fields=["business_user", "status"], name="order_business_status_idx"),
+        ]
+
     def __str__(self):
         return f"Order {self.id}: {self.offer_detail.title} ({self.status})"
 
 
+class BusinessOrderCounter(models.Model):
+    """Materialized per-business-user order counts by status.
+
+    Lets the order-count endpoints answer with a single primary-key lookup
+    instead of counting Order rows. Rows are created lazily on the first
+    order for a business user and adjusted with F() expressions when
+    orders are created, change status or are deleted.
+    """
+
+    business_user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name="order_counter",
+        primary_key=True,
+    )
+    in_progress = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    cancelled = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Order counts for {self.business_user_id}"
+
+    @classmethod
+    def adjust(cls, business_user_id, create=True, **deltas):
+        """Atomically add per-status deltas, e.g. adjust(5, in_progress=1).
+
+        If the user has no counter row yet it is rebuilt from the Order
+        table, which already reflects the change being counted. With
+        create=False a missing row stays missing; the count endpoints
+        then count Order rows instead.
+        """
+        changes = {status: F(status) + delta for status, delta in deltas.items() if delta}
+        if not changes:
+            return
+        if not cls.objects.filter(pk=business_user_id).update(**changes) and create:
+            cls.rebuild(business_user_id)
+
+    @classmethod
+    def rebuild(cls, business_user_id):
+        """Recount a business user's orders and store the result."""
+        counts = dict(
+            Order.objects.filter(business_user_id=business_user_id)
+            .order_by()
+            .values_list("status")
+            .annotate(total=Count("id"))
+        )
+        values = {status: counts.get(status, 0) for status, _ in Order.STATUS_CHOICES}
+        counter, _ = cls.objects.update_or_create(pk=business_user_id, defaults=values)
+        return counter
+
+
 class Review(models.Model):
     """A review for a business user written by a reviewer (customer).
 
@@ -93,5 +191,13 @@ class Review(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Duplicate-review check in ReviewSerializer.validate
+            models.Index(fields=["business_user", "reviewer"], name="review_business_reviewer_idx"),
+            # Default list ordering
+            models.Index(fields=["-updated_at"], name="review_updated_idx"),
+        ]
+
     def __str__(self):
         return f"Review {self.id} for {self.business_user.username} by {self.reviewer.username}"
@@ -0,0 +1,177 @@
+"""Full-text search index for offer titles and descriptions.
+
+Two database-specific backends are supported:
+
+- SQLite: an FTS5 external-content table (`coderr_app_offer_fts`) that
+  shadows `coderr_app_offer`. Triggers on the offer table keep it in
+  sync, so ORM saves, bulk_create and queryset updates are all indexed.
+- PostgreSQL: a GIN expression index over a weighted `tsvector` of the
+  same two columns. The index is maintained by PostgreSQL itself.
+
+On any other engine (or SQLite builds without FTS5) `is_available()`
+returns False and callers fall back to `icontains` matching.
+
+Results are annotated with `search_rank`, where lower means more
+relevant on both backends.
+"""
+
+import re
+
+from django.db import DatabaseError, connections
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+
+from coderr_app.models import Offer
+
+FTS_TABLE = "coderr_app_offer_fts"
+GIN_INDEX = "coderr_app_offer_search_gin"
+
+# Title matches weigh more than description matches.
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# The query must repeat the index expression exactly for the GIN index to
+# be used; `prefix` is either empty (index DDL) or the quoted table name.
+_PG_VECTOR = (
+    "setweight(to_tsvector('simple'::regconfig, coalesce({prefix}title, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce({prefix}description, '')), 'B')"
+)
+
+_SQLITE_SCHEMA = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description,
+        content='coderr_app_offer', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON coderr_app_offer BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON coderr_app_offer BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description ON coderr_app_offer BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+]
+
+
+def _backend(using):
+    vendor = connections[using].vendor
+    if vendor in ("sqlite", "postgresql"):
+        return vendor
+    return None
+
+
+def _table_exists(connection, name):
+    with connection.cursor() as cursor:
+        return name in connection.introspection.table_names(cursor)
+
+
+# Databases (by NAME) known to have the SQLite FTS table, to avoid an
+# introspection query on every search request.
+_fts_ready = set()
+
+
+def is_available(using="default"):
+    """Return True when the database has a usable full-text index."""
+    connection = connections[using]
+    backend = _backend(using)
+    if backend == "sqlite":
+        name = str(connection.settings_dict["NAME"])
+        if name not in _fts_ready and _table_exists(connection, FTS_TABLE):
+            _fts_ready.add(name)
+        return name in _fts_ready
+    return backend == "postgresql"
+
+
+def ensure_search_index(using="default"):
+    """Create the FTS table/triggers or GIN index if they do not exist yet.
+
+    Called after migrate. A freshly created SQLite index is rebuilt from
+    the existing offer rows.
+    """
+    connection = connections[using]
+    backend = _backend(using)
+    if backend is None or not _table_exists(connection, Offer._meta.db_table):
+        return
+
+    if backend == "sqlite":
+        created = not _table_exists(connection, FTS_TABLE)
+        try:
+            with connection.cursor() as cursor:
+                for statement in _SQLITE_SCHEMA:
+                    cursor.execute(statement)
+        except DatabaseError:
+            # SQLite compiled without FTS5: search falls back to LIKE.
+            return
+        if created:
+            rebuild_search_index(using)
+    else:
+        vector = _PG_VECTOR.format(prefix="")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {GIN_INDEX} "
+                f"ON {connection.ops.quote_name(Offer._meta.db_table)} USING GIN (({vector}))"
+            )
+
+
+def rebuild_search_index(using="default"):
+    """Rebuild the SQLite FTS index from the offer table (no-op on PostgreSQL)."""
+    if _backend(using) != "sqlite" or not is_available(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def tokenize(terms):
+    """Split raw search terms into safe word tokens."""
+    tokens = []
+    for term in terms:
+        tokens.extend(_TOKEN_RE.findall(term))
+    return tokens
+
+
+def search_offers(queryset, terms):
+    """Filter `queryset` to offers matching all `terms` (prefix match).
+
+    Adds a `search_rank` annotation (lower is more relevant).
+    """
+    tokens = tokenize(terms)
+    if not tokens:
+        return queryset
+
+    using = queryset.db
+    connection = connections[using]
+    table = connection.ops.quote_name(Offer._meta.db_table)
+
+    if _backend(using) == "sqlite":
+        match = " ".join(f'"{token}"*' for token in tokens)
+        matching_ids = RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,)
+        )
+        rank = RawSQL(
+            f"SELECT bm25({FTS_TABLE}, {TITLE_WEIGHT}, {DESCRIPTION_WEIGHT}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id",
+            (match,),
+            output_field=FloatField(),
+        )
+        return queryset.filter(pk__in=matching_ids).annotate(search_rank=rank)
+
+    query = " & ".join(f"{token}:*" for token in tokens)
+    vector = _PG_VECTOR.format(prefix=f"{table}.")
+    matches = RawSQL(
+        f"({vector}) @@ to_tsquery('simple'::regconfig, %s)", (query,),
+        output_field=BooleanField(),
+    )
+    rank = RawSQL(
+        f"-ts_rank(({vector}), to_tsquery('simple'::regconfig, %s))", (query,),
+        output_field=FloatField(),
+    )
+    return queryset.filter(matches).annotate(search_rank=rank)
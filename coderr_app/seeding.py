@@ -0,0 +1,226 @@
+"""Synthetic marketplace data for load tests, benchmarks and index work.
+
+`MarketplaceSeeder` writes business/customer users with profiles, offers
+with their three OfferDetail tiers, orders in every status and reviews.
+All rows are inserted with bulk_create in fixed-size batches and only
+integer ids are kept between phases, so memory stays small even for
+millions of rows. The same seed always produces the same data.
+
+bulk_create bypasses signals, so data normally maintained by them is
+written explicitly: Offer summary columns are computed in memory,
+BusinessOrderCounter rows are created from the generated orders and the
+cached base-info counters are invalidated at the end. The SQLite FTS
+index is kept current by its triggers.
+"""
+
+import random
+import time
+from array import array
+from dataclasses import dataclass
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from auth_app.models import Profile
+from coderr_app import stats
+from coderr_app.models import BusinessOrderCounter, Offer, OfferDetail, Order, Review
+
+WORDS = [
+    "logo", "website", "branding", "design", "seo", "shop", "landing", "app",
+    "api", "backend", "frontend", "audit", "migration", "video", "copywriting",
+    "newsletter", "illustration", "database", "hosting", "analytics",
+]
+CITIES = ["Berlin", "Hamburg", "Munich", "Cologne", "Vienna", "Zurich", "Remote"]
+
+# Roughly how orders are spread across statuses in production
+STATUS_WEIGHTS = {"in_progress": 3, "completed": 6, "cancelled": 1}
+
+
+@dataclass
+class SeedConfig:
+    business: int = 100
+    customers: int = 400
+    offers_per_business: int = 10
+    orders: int = 3000
+    reviews_per_customer: int = 3
+    batch_size: int = 2000
+    seed: int = 1234
+    prefix: str = "seed"
+    password: str = "password"
+
+
+class MarketplaceSeeder:
+    """Generate a marketplace according to a SeedConfig."""
+
+    def __init__(self, config, log=None):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.log = log or (lambda message: None)
+        self.business_ids = array("q")
+        self.customer_ids = array("q")
+        self.detail_ids = array("q")
+        self.detail_owner_ids = array("q")
+        self.counts = {}
+
+    def usernames_taken(self):
+        return User.objects.filter(username__startswith=f"{self.config.prefix}_").exists()
+
+    def run(self):
+        with transaction.atomic():
+            self._phase("users", self._create_users)
+            self._phase("offers", self._create_offers)
+            self._phase("orders", self._create_orders)
+            self._phase("reviews", self._create_reviews)
+        stats.invalidate()
+        return self.counts
+
+    def _phase(self, name, func):
+        start = time.perf_counter()
+        func()
+        self.log(f"{name}: done in {time.perf_counter() - start:.1f}s")
+
+    def _batches(self, total):
+        size = self.config.batch_size
+        for start in range(0, total, size):
+            yield start, min(start + size, total)
+
+    def _create_users(self):
+        config = self.config
+        password = make_password(config.password)
+
+        for kind, total, ids in (
+            ("business", config.business, self.business_ids),
+            ("customer", config.customers, self.customer_ids),
+        ):
+            for start, stop in self._batches(total):
+                users = User.objects.bulk_create([
+                    User(
+                        username=f"{config.prefix}_{kind}_{i}",
+                        email=f"{config.prefix}_{kind}_{i}@example.com",
+                        first_name=kind.title(),
+                        last_name=str(i),
+                        password=password,
+                    )
+                    for i in range(start, stop)
+                ])
+                Profile.objects.bulk_create([
+                    Profile(
+                        user_id=user.pk,
+                        type=kind,
+                        location=self.rng.choice(CITIES),
+                        description=f"{kind.title()} account {user.username}",
+                    )
+                    for user in users
+                ])
+                ids.extend(user.pk for user in users)
+
+        self.counts["users"] = len(self.business_ids) + len(self.customer_ids)
+
+    def _create_offers(self):
+        rng = self.rng
+        per_business = self.config.offers_per_business
+        owners_per_batch = max(1, self.config.batch_size // max(per_business, 1))
+        total_offers = 0
+
+        for start in range(0, len(self.business_ids), owners_per_batch):
+            owners = self.business_ids[start:start + owners_per_batch]
+            offers, tiers = [], []
+            for owner_id in owners:
+                for _ in range(per_business):
+                    words = rng.sample(WORDS, 3)
+                    base_price = rng.randint(20, 800)
+                    base_days = rng.randint(1, 14)
+                    tier = [
+                        ("basic", base_price, base_days, 1),
+                        ("standard", base_price * 2, base_days + 3, 3),
+                        ("premium", base_price * 4, base_days + 7, 6),
+                    ]
+                    offers.append(Offer(
+                        user_id=owner_id,
+                        title=" ".join(words).title(),
+                        description=(
+                            f"Professional {words[0]} and {words[1]} services "
+                            f"with optional {words[2]} support."
+                        ),
+                        min_price=base_price,
+                        min_delivery_time=base_days,
+                    ))
+                    tiers.append(tier)
+
+            Offer.objects.bulk_create(offers)
+            details = OfferDetail.objects.bulk_create([
+                OfferDetail(
+                    offer_id=offer.pk,
+                    title=f"{offer_type.title()} package",
+                    revisions=revisions,
+                    delivery_time_in_days=days,
+                    price=price,
+                    features=rng.sample(["Source files", "Revisions", "Support", "Hosting", "Docs"], 2),
+                    offer_type=offer_type,
+                )
+                for offer, tier in zip(offers, tiers)
+                for offer_type, price, days, revisions in tier
+            ])
+            for detail, offer in zip(details, (o for o in offers for _ in range(3))):
+                self.detail_ids.append(detail.pk)
+                self.detail_owner_ids.append(offer.user_id)
+            total_offers += len(offers)
+
+        self.counts["offers"] = total_offers
+        self.counts["offer_details"] = len(self.detail_ids)
+
+    def _create_orders(self):
+        rng = self.rng
+        if not self.detail_ids or not self.customer_ids:
+            self.counts["orders"] = 0
+            return
+
+        statuses = list(STATUS_WEIGHTS)
+        weights = list(STATUS_WEIGHTS.values())
+        counters = {}
+
+        for start, stop in self._batches(self.config.orders):
+            orders = []
+            for _ in range(stop - start):
+                index = rng.randrange(len(self.detail_ids))
+                business_id = self.detail_owner_ids[index]
+                status = rng.choices(statuses, weights)[0]
+                orders.append(Order(
+                    customer_user_id=rng.choice(self.customer_ids),
+                    business_user_id=business_id,
+                    offer_detail_id=self.detail_ids[index],
+                    status=status,
+                ))
+                counter = counters.setdefault(business_id, dict.fromkeys(statuses, 0))
+                counter[status] += 1
+            Order.objects.bulk_create(orders)
+
+        counter_rows = [BusinessOrderCounter(pk=pk, **counts) for pk, counts in counters.items()]
+        BusinessOrderCounter.objects.bulk_create(counter_rows, batch_size=self.config.batch_size)
+        self.counts["orders"] = self.config.orders
+
+    def _create_reviews(self):
+        rng = self.rng
+        business_ids = self.business_ids.tolist()
+        per_customer = min(self.config.reviews_per_customer, len(business_ids))
+        total = 0
+        reviews = []
+
+        for customer_id in self.customer_ids:
+            for business_id in rng.sample(business_ids, per_customer):
+                reviews.append(Review(
+                    business_user_id=business_id,
+                    reviewer_id=customer_id,
+                    rating=rng.choices([1, 2, 3, 4, 5], [1, 1, 2, 4, 6])[0],
+                    description="Generated review.",
+                ))
+            if len(reviews) >= self.config.batch_size:
+                Review.objects.bulk_create(reviews)
+                total += len(reviews)
+                reviews = []
+
+        if reviews:
+            Review.objects.bulk_create(reviews)
+            total += len(reviews)
+        self.counts["reviews"] = total
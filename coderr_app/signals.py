@@ -0,0 +1,133 @@
+"""Signal handlers for coderr_app.
+
+Keeps denormalized data on Offer in sync when OfferDetail rows are written
+outside the API serializers (admin, shell, fixtures, tests), creates
+the offer full-text search index after migrate and keeps the cached
+base-info counters (`coderr_app.stats`) up to date. Counter adjustments
+run on commit so rolled-back writes never reach the cache.
+
+Order writes also maintain BusinessOrderCounter rows in the same
+transaction as the order itself. Committed order and review creations
+are counted in the Prometheus metrics (`core_app.metrics`).
+"""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_migrate, post_save
+from django.dispatch import receiver
+
+from auth_app.models import Profile
+from coderr_app import search, stats
+from coderr_app.models import BusinessOrderCounter, Offer, OfferDetail, Order, Review
+from core_app import metrics
+
+
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def refresh_offer_summary(sender, instance, raw=False, **kwargs):
+    """Recompute the parent offer's min_price/min_delivery_time."""
+    if raw:
+        return
+    Offer(pk=instance.offer_id).refresh_summary()
+
+
+@receiver(post_migrate)
+def create_offer_search_index(sender, using="default", **kwargs):
+    """Create the FTS table/triggers (SQLite) or GIN index (PostgreSQL)."""
+    if sender.name != "coderr_app":
+        return
+    search.ensure_search_index(using)
+
+
+# --- Cached base-info counters ---
+
+
+@receiver(post_save, sender=Offer)
+def count_offer_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        transaction.on_commit(partial(stats.adjust, "offer_count", 1))
+
+
+@receiver(post_delete, sender=Offer)
+def count_offer_deleted(sender, instance, **kwargs):
+    transaction.on_commit(partial(stats.adjust, "offer_count", -1))
+
+
+@receiver(post_save, sender=Review)
+def count_review_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        transaction.on_commit(partial(stats.adjust, "review_count", 1))
+        transaction.on_commit(partial(stats.adjust, "rating_sum", instance.rating))
+        transaction.on_commit(metrics.REVIEWS_CREATED.inc)
+    else:
+        # The rating may have changed; let the next read recompute the sum
+        transaction.on_commit(stats.invalidate)
+
+
+@receiver(post_delete, sender=Review)
+def count_review_deleted(sender, instance, **kwargs):
+    transaction.on_commit(partial(stats.adjust, "review_count", -1))
+    transaction.on_commit(partial(stats.adjust, "rating_sum", -instance.rating))
+
+
+@receiver(post_init, sender=Profile)
+def remember_profile_type(sender, instance, **kwargs):
+    # Remember the loaded type so a later save can tell whether it changed;
+    # read __dict__ so a deferred field is not fetched here.
+    instance._stats_type = instance.__dict__.get("type")
+
+
+@receiver(post_save, sender=Profile)
+def count_business_profile_saved(sender, instance, created, raw=False, **kwargs):
+    previous = None if created else instance._stats_type
+    instance._stats_type = instance.type
+    if raw or previous == instance.type:
+        return
+    if previous is None and not created:
+        transaction.on_commit(stats.invalidate)
+        return
+    if instance.type == "business":
+        transaction.on_commit(partial(stats.adjust, "business_profile_count", 1))
+    elif previous == "business":
+        transaction.on_commit(partial(stats.adjust, "business_profile_count", -1))
+
+
+@receiver(post_delete, sender=Profile)
+def count_business_profile_deleted(sender, instance, **kwargs):
+    if instance.type == "business":
+        transaction.on_commit(partial(stats.adjust, "business_profile_count", -1))
+
+
+# --- Per-business order counters ---
+
+
+@receiver(post_init, sender=Order)
+def remember_order_status(sender, instance, **kwargs):
+    instance._counter_status = instance.__dict__.get("status")
+
+
+@receiver(post_save, sender=Order)
+def count_order_saved(sender, instance, created, raw=False, **kwargs):
+    previous = None if created else instance._counter_status
+    instance._counter_status = instance.status
+    if raw:
+        return
+    if created:
+        BusinessOrderCounter.adjust(instance.business_user_id, **{instance.status: 1})
+        transaction.on_commit(metrics.ORDERS_CREATED.inc)
+    elif previous is None:
+        BusinessOrderCounter.rebuild(instance.business_user_id)
+    elif previous != instance.status:
+        BusinessOrderCounter.adjust(
+            instance.business_user_id, **{previous: -1, instance.status: 1}
+        )
+
+
+@receiver(post_delete, sender=Order)
+def count_order_deleted(sender, instance, **kwargs):
+    # Deleting a business user cascades to its counter row before its
+    # orders; recreating the row here would reference the deleted user.
+    BusinessOrderCounter.adjust(instance.business_user_id, create=False, **{instance.status: -1})
@@ -0,0 +1,128 @@
+"""Cached platform statistics served by BaseInfoAPIView.
+
+The raw counters (review count, rating sum, business profile count and
+offer count) live in Django's cache as separate integer keys so they can
+be adjusted atomically with `cache.incr` from signal handlers when rows
+are created or deleted. Reads recompute everything only when a key is
+missing, which happens on first use, after `invalidate()` and when the
+safety-net TTL (`BASE_INFO_CACHE_TTL`) expires.
+
+`aget_base_info()` is the same read for async views, using the cache's
+and the ORM's async APIs.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Sum
+
+from auth_app.models import Profile
+from coderr_app.models import Offer, Review
+from core_app import metrics
+
+KEY_PREFIX = "coderr:baseinfo:"
+COUNTERS = ("review_count", "rating_sum", "business_profile_count", "offer_count")
+
+
+def _key(name):
+    return f"{KEY_PREFIX}{name}"
+
+
+def _ttl():
+    return getattr(settings, "BASE_INFO_CACHE_TTL", 300)
+
+
+def _keyed(counters):
+    return {_key(name): value for name, value in counters.items()}
+
+
+def _counters(reviews, business_profile_count, offer_count):
+    return {
+        "review_count": reviews["count"],
+        "rating_sum": reviews["rating_sum"] or 0,
+        "business_profile_count": business_profile_count,
+        "offer_count": offer_count,
+    }
+
+
+def _recompute():
+    counters = _counters(
+        Review.objects.aggregate(count=Count("id"), rating_sum=Sum("rating")),
+        Profile.objects.filter(type="business").count(),
+        Offer.objects.count(),
+    )
+    cache.set_many(_keyed(counters), timeout=_ttl())
+    return counters
+
+
+async def _arecompute():
+    counters = _counters(
+        await Review.objects.aaggregate(count=Count("id"), rating_sum=Sum("rating")),
+        await Profile.objects.filter(type="business").acount(),
+        await Offer.objects.acount(),
+    )
+    await cache.aset_many(_keyed(counters), timeout=_ttl())
+    return counters
+
+
+def _cached(cached):
+    """Return the counters from a get_many() result, or None on a miss."""
+    if len(cached) != len(COUNTERS):
+        metrics.CACHE_REQUESTS.inc(cache="base_info", result="miss")
+        return None
+    metrics.CACHE_REQUESTS.inc(cache="base_info", result="hit")
+    return {name: cached[_key(name)] for name in COUNTERS}
+
+
+def get_counters():
+    """Return the raw counters, recomputing them if any key is missing."""
+    counters = _cached(cache.get_many([_key(name) for name in COUNTERS]))
+    return counters if counters is not None else _recompute()
+
+
+async def aget_counters():
+    """Async variant of get_counters()."""
+    counters = _cached(await cache.aget_many([_key(name) for name in COUNTERS]))
+    return counters if counters is not None else await _arecompute()
+
+
+def _base_info(counters):
+    review_count = counters["review_count"]
+    average_rating = round(counters["rating_sum"] / review_count, 1) if review_count else 0
+
+    data = {
+        "review_count": review_count,
+        "average_rating": average_rating,
+        "business_profile_count": counters["business_profile_count"],
+        "offer_count": counters["offer_count"],
+    }
+    fingerprint = ":".join(str(counters[name]) for name in COUNTERS)
+    etag = hashlib.md5(fingerprint.encode("ascii")).hexdigest()
+    return data, etag
+
+
+def get_base_info():
+    """Return the public base-info payload and an ETag derived from it."""
+    return _base_info(get_counters())
+
+
+async def aget_base_info():
+    """Async variant of get_base_info()."""
+    return _base_info(await aget_counters())
+
+
+def adjust(name, delta):
+    """Atomically add `delta` to a cached counter.
+
+    A missing key is left alone; the next read recomputes from the DB.
+    """
+    try:
+        cache.incr(_key(name), delta)
+    except ValueError:
+        pass
+
+
+def invalidate():
+    """Drop all counters so the next read recomputes them."""
+    cache.delete_many([_key(name) for name in COUNTERS])
@@ -0,0 +1,11 @@
+"""Root URLconf with the async read views routed in (ASYNC_READ_VIEWS)."""
+
+from django.urls import include, path
+
+from coderr_app.api import urls as coderr_urls
+from core.urls import urlpatterns as core_urlpatterns
+
+urlpatterns = [
+    path("api/", include(coderr_urls.with_async_reads(coderr_urls.urlpatterns))),
+    *core_urlpatterns,
+]
@@ -0,0 +1,115 @@
+from io import StringIO
+from django.urls import reverse
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from auth_app.models import Profile
+from coderr_app.models import Offer, OfferDetail
+
+
+class OfferSummaryColumnsTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business_user = User.objects.create_user(
+            username="business_user", email="business_user@example.com", password="x"
+        )
+        Profile.objects.create(user=cls.business_user, type="business")
+
+        cls.offer = Offer.objects.create(
+            user=cls.business_user, title="Summary Offer", description="For tests"
+        )
+        OfferDetail.objects.create(
+            offer=cls.offer, title="Basic", revisions=1,
+            delivery_time_in_days=4, price=70, features=["A"], offer_type="basic"
+        )
+        OfferDetail.objects.create(
+            offer=cls.offer, title="Standard", revisions=2,
+            delivery_time_in_days=6, price=100, features=["A", "B"], offer_type="standard"
+        )
+        OfferDetail.objects.create(
+            offer=cls.offer, title="Premium", revisions=3,
+            delivery_time_in_days=8, price=200, features=["A", "B", "C"], offer_type="premium"
+        )
+
+        cls.list_url = reverse("offer-list")
+        cls.detail_url = reverse("offer-detail", args=[cls.offer.id])
+
+    def setUp(self):
+        cache.clear()
+
+    def _payload(self):
+        return {
+            "title": "T",
+            "description": "D",
+            "details": [
+                {"title": "Basic", "revisions": 1, "delivery_time_in_days": 9,
+                 "price": 40, "features": ["A"], "offer_type": "basic"},
+                {"title": "Standard", "revisions": 2, "delivery_time_in_days": 5,
+                 "price": 90, "features": ["A", "B"], "offer_type": "standard"},
+                {"title": "Premium", "revisions": 3, "delivery_time_in_days": 2,
+                 "price": 150, "features": ["A", "B", "C"], "offer_type": "premium"},
+            ],
+        }
+
+    def test_orm_detail_writes_keep_summary_in_sync(self):
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 70)
+        self.assertEqual(self.offer.min_delivery_time, 4)
+
+    def test_post_201_sets_summary_columns(self):
+        self.client.force_authenticate(user=self.business_user)
+        resp = self.client.post(self.list_url, self._payload(), format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+        offer = Offer.objects.get(pk=resp.data['id'])
+        self.assertEqual(offer.min_price, 40)
+        self.assertEqual(offer.min_delivery_time, 2)
+
+    def test_patch_200_updates_summary_columns(self):
+        self.client.force_authenticate(user=self.business_user)
+        resp = self.client.patch(self.detail_url, {
+            "details": [
+                {"offer_type": "basic", "price": 120},
+                {"offer_type": "premium", "delivery_time_in_days": 1},
+            ],
+        }, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 100)
+        self.assertEqual(self.offer.min_delivery_time, 1)
+
+    def test_list_filters_without_aggregation(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(self.list_url, {
+                'min_price': 50, 'max_delivery_time': 5, 'ordering': 'min_price',
+            })
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(resp.data['results']), 1)
+        self.assertEqual(resp.data['results'][0]['min_price'], 70)
+        for query in ctx.captured_queries:
+            self.assertNotIn('GROUP BY', query['sql'])
+
+    def test_command_verify_and_backfill(self):
+        Offer.objects.filter(pk=self.offer.pk).update(min_price=None, min_delivery_time=None)
+
+        with self.assertRaises(CommandError):
+            call_command('backfill_offer_summary', '--verify', stdout=StringIO())
+
+        out = StringIO()
+        call_command('backfill_offer_summary', stdout=out)
+        self.assertIn('updated 1', out.getvalue())
+
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 70)
+        self.assertEqual(self.offer.min_delivery_time, 4)
+
+        out = StringIO()
+        call_command('backfill_offer_summary', '--verify', stdout=out)
+        self.assertIn('in sync', out.getvalue())
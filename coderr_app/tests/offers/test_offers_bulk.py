@@ -0,0 +1,105 @@
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APITestCase
+from auth_app.models import Profile
+from coderr_app.models import Offer, OfferDetail
+
+
+class OffersBulkCreateTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business_user = User.objects.create_user(
+            username="business_user", email="business_user@example.com", password="x"
+        )
+        Profile.objects.create(user=cls.business_user, type="business")
+
+        cls.customer_user = User.objects.create_user(
+            username="customer_user", email="customer_user@example.com", password="x"
+        )
+        Profile.objects.create(user=cls.customer_user, type="customer")
+
+        cls.list_url = reverse("offer-list")
+        cls.bulk_url = reverse("offer-bulk")
+
+    def setUp(self):
+        cache.clear()
+
+    def _payload(self, title="T", base_price=50):
+        return {
+            "title": title,
+            "description": "D",
+            "details": [
+                {"title": "Basic", "revisions": 1, "delivery_time_in_days": 3,
+                 "price": base_price, "features": ["A"], "offer_type": "basic"},
+                {"title": "Standard", "revisions": 2, "delivery_time_in_days": 5,
+                 "price": base_price * 2, "features": ["A", "B"], "offer_type": "standard"},
+                {"title": "Premium", "revisions": 3, "delivery_time_in_days": 7,
+                 "price": base_price * 3, "features": ["A", "B", "C"], "offer_type": "premium"},
+            ],
+        }
+
+    def test_post_201_single_offer_uses_bulk_details_insert(self):
+        self.client.force_authenticate(user=self.business_user)
+        with self.assertNumQueries(2):
+            # one offer insert and one insert for all three details
+            resp = self.client.post(self.list_url, self._payload(), format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(resp.data['details']), 3)
+
+    def test_post_201_bulk_creates_all_offers(self):
+        self.client.force_authenticate(user=self.business_user)
+        payload = [self._payload(f"Offer {i}", 10 * (i + 1)) for i in range(4)]
+        resp = self.client.post(self.bulk_url, payload, format='json')
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(resp.data), 4)
+        for index, result in enumerate(resp.data):
+            self.assertEqual(result['status'], 201)
+            self.assertEqual(result['data']['title'], f"Offer {index}")
+            self.assertEqual(len(result['data']['details']), 3)
+
+        offers = Offer.objects.filter(user=self.business_user).order_by('id')
+        self.assertEqual(offers.count(), 4)
+        self.assertEqual(OfferDetail.objects.filter(offer__in=offers).count(), 12)
+        self.assertEqual([offer.min_price for offer in offers], [10, 20, 30, 40])
+
+    def test_post_207_bulk_reports_per_item_errors(self):
+        self.client.force_authenticate(user=self.business_user)
+        invalid = self._payload("Broken")
+        invalid['details'] = invalid['details'][:2]
+        resp = self.client.post(self.bulk_url, [self._payload("Good"), invalid], format='json')
+
+        self.assertEqual(resp.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(resp.data[0]['status'], 201)
+        self.assertEqual(resp.data[1]['status'], 400)
+        self.assertIn('non_field_errors', resp.data[1]['errors'])
+        self.assertEqual(Offer.objects.filter(title="Good").count(), 1)
+        self.assertFalse(Offer.objects.filter(title="Broken").exists())
+
+    def test_post_400_bulk_all_invalid(self):
+        self.client.force_authenticate(user=self.business_user)
+        resp = self.client.post(self.bulk_url, [{"title": "X"}], format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Offer.objects.count(), 0)
+
+    def test_post_400_bulk_requires_list(self):
+        self.client.force_authenticate(user=self.business_user)
+        resp = self.client.post(self.bulk_url, self._payload(), format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_post_400_bulk_too_many_items(self):
+        self.client.force_authenticate(user=self.business_user)
+        resp = self.client.post(self.bulk_url, [self._payload()] * 51, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_post_403_bulk_customer(self):
+        self.client.force_authenticate(user=self.customer_user)
+        resp = self.client.post(self.bulk_url, [self._payload()], format='json')
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_post_401_bulk_anonymous(self):
+        resp = self.client.post(self.bulk_url, [self._payload()], format='json')
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,114 @@
+import json
+from base64 import urlsafe_b64encode
+
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APITestCase
+from auth_app.models import Profile
+from coderr_app.models import Offer, OfferDetail
+
+
+class OffersCursorPaginationTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business_user = User.objects.create_user(
+            username="business_user", email="business_user@example.com", password="x"
+        )
+        Profile.objects.create(user=cls.business_user, type="business")
+
+        # Several offers share the same min_price to exercise the id tie-breaker
+        cls.offers = []
+        for index, price in enumerate([50, 50, 50, 80, 80, 120, 150]):
+            offer = Offer.objects.create(
+                user=cls.business_user, title=f"Offer {index}", description="Cursor tests"
+            )
+            for otype, factor in (("basic", 1), ("standard", 2), ("premium", 3)):
+                OfferDetail.objects.create(
+                    offer=offer, title=f"{otype} {index}", revisions=1,
+                    delivery_time_in_days=3 * factor, price=price * factor,
+                    features=["A"], offer_type=otype,
+                )
+            cls.offers.append(offer)
+
+        cls.list_url = reverse("offer-list")
+
+    def setUp(self):
+        # Keep the anonymous throttle history from leaking between tests
+        cache.clear()
+
+    def _walk(self, params):
+        ids = []
+        resp = self.client.get(self.list_url, params)
+        while True:
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            ids.extend(item['id'] for item in resp.data['results'])
+            if not resp.data['next']:
+                return ids, resp
+            resp = self.client.get(resp.data['next'])
+
+    def test_get_200_cursor_envelope_has_no_count(self):
+        resp = self.client.get(self.list_url, {'cursor': ''})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(resp.data.keys()), {"next", "previous", "results"})
+        self.assertIsNone(resp.data['previous'])
+        self.assertEqual(len(resp.data['results']), 6)
+
+    def test_get_200_page_number_envelope_stays_default(self):
+        resp = self.client.get(self.list_url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertIn('count', resp.data)
+
+    def test_get_200_cursor_walk_default_ordering(self):
+        ids, _ = self._walk({'cursor': '', 'page_size': 2})
+        expected = list(
+            Offer.objects.order_by('-updated_at', 'pk').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_get_200_cursor_walk_min_price_ties(self):
+        ids, _ = self._walk({'cursor': '', 'page_size': 2, 'ordering': 'min_price'})
+        self.assertEqual(ids, [offer.id for offer in self.offers])
+
+    def test_get_200_cursor_walk_min_price_descending(self):
+        ids, _ = self._walk({'cursor': '', 'page_size': 3, 'ordering': '-min_price'})
+        self.assertEqual(len(ids), len(self.offers))
+        self.assertEqual(len(set(ids)), len(self.offers))
+        self.assertEqual(ids[0], self.offers[-1].id)
+
+    def test_get_200_cursor_previous_link(self):
+        first = self.client.get(self.list_url, {'cursor': '', 'page_size': 2, 'ordering': 'min_price'})
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(back.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item['id'] for item in back.data['results']],
+            [item['id'] for item in first.data['results']],
+        )
+
+    def test_get_200_cursor_respects_filters(self):
+        ids, _ = self._walk({'cursor': '', 'page_size': 2, 'min_price': 80})
+        self.assertEqual(set(ids), {offer.id for offer in self.offers[3:]})
+
+    def test_get_404_invalid_cursor(self):
+        resp = self.client.get(self.list_url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_404_tampered_cursor_values(self):
+        ordering = ['-updated_at', 'pk']
+        for position in (["abc", 1], [{"a": 1}, 1], [None, "x"], [None, 1], [[], 1]):
+            with self.subTest(position=position):
+                cursor = urlsafe_b64encode(json.dumps({'o': ordering, 'p': position}).encode()).decode()
+                resp = self.client.get(self.list_url, {'cursor': cursor})
+                self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_404_cursor_from_another_ordering(self):
+        first = self.client.get(self.list_url, {'cursor': '', 'page_size': 2, 'ordering': 'min_price'})
+        stale = first.data['next'].replace('ordering=min_price', 'ordering=-updated_at')
+        self.assertEqual(self.client.get(stale).status_code, status.HTTP_404_NOT_FOUND)
+
+        # A cursor without its ordering (or a forged one) is rejected too
+        cursor = urlsafe_b64encode(json.dumps({'p': ["2024-01-01T00:00:00+00:00", 1]}).encode()).decode()
+        self.assertEqual(self.client.get(self.list_url, {'cursor': cursor}).status_code, status.HTTP_404_NOT_FOUND)
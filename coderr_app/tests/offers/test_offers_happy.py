@@ -1,13 +1,13 @@
 from django.urls import reverse
-from django.core.files.uploadedfile import SimpleUploadedFile
 from django.contrib.auth.models import User
 from rest_framework import status
 from rest_framework.test import APITestCase
 from auth_app.models import Profile
 from coderr_app.models import Offer, OfferDetail
+from core_app.tests.images import TemporaryMediaMixin, image_upload
 
 
-class OffersHappyTests(APITestCase):
+class OffersHappyTests(TemporaryMediaMixin, APITestCase):
 
     @classmethod
     def setUpTestData(cls):
@@ -109,9 +109,7 @@ class OffersHappyTests(APITestCase):
         self.assertIsNone(create_resp.data['image'])
 
         # Patch image
-        file_bytes = b'fake image bytes'
-        upload = SimpleUploadedFile(
-            'logo.png', file_bytes, content_type='image/png')
+        upload = image_upload('logo.png')
         patch_resp = self.client.patch(
             reverse('offer-detail', args=[offer_id]),
             data={'image': upload},
@@ -257,9 +255,7 @@ class OffersHappyTests(APITestCase):
 
     def test_patch_200_image_post(self):
         self.client.force_authenticate(user=self.business_user)
-        file_bytes = b'fake image bytes'
-        upload = SimpleUploadedFile(
-            'logo.png', file_bytes, content_type='image/png')
+        upload = image_upload('logo.png')
         
         response = self.client.patch(
             self.detail_url,
@@ -0,0 +1,78 @@
+from django.contrib.auth.models import User
+from django.test import override_settings
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+from auth_app.models import Profile
+from coderr_app.api.serializer import OfferListItemsSerializer, OfferListSerializer
+from coderr_app.api.views import OfferViewSet
+from coderr_app.models import Offer, OfferDetail
+from loadtest import serializer_bench
+
+
+@override_settings(ALLOWED_HOSTS=["api.example.com"])
+class OfferListSerializerFastPathTests(APITestCase):
+    """The many=True fast path renders exactly what the field machinery renders."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business_user = User.objects.create_user(
+            username="business_user", email="business_user@example.com", password="x",
+            first_name="Zoë", last_name="O'Brien",
+        )
+        Profile.objects.create(user=cls.business_user, type="business")
+
+        for number in range(3):
+            offer = Offer.objects.create(
+                user=cls.business_user, title=f"Offer {number}", description="Design \"pro\"",
+                min_price=50 + number, min_delivery_time=3,
+            )
+            for offer_type in ("basic", "standard", "premium"):
+                OfferDetail.objects.create(
+                    offer=offer, title=offer_type, revisions=1, delivery_time_in_days=3,
+                    price=50 + number, features=["A"], offer_type=offer_type,
+                )
+        # Image set with variants, no details and no summary values
+        Offer.objects.create(
+            user=cls.business_user, title="Bare", description="", image="offers/logo.png",
+            image_variants={"source": "offers/logo.png",
+                            "variants": {"thumb": {"webp": "images/ab/ab.webp", "jpeg": "images/ab/ab.jpeg"}}},
+        )
+
+    def _render(self, fast, path="/api/offers/"):
+        request = Request(APIRequestFactory().get(path, HTTP_HOST="api.example.com:8443"))
+        offers = OfferViewSet.queryset.select_related("user").prefetch_related("details").order_by("pk")
+        context = {"request": request}
+        if fast:
+            serializer = OfferListSerializer(offers, many=True, context=context)
+        else:
+            serializer = serializers.ListSerializer(offers, child=OfferListSerializer(), context=context)
+        return JSONRenderer().render(serializer.data)
+
+    def test_many_uses_fast_path(self):
+        self.assertIsInstance(OfferListSerializer(many=True), OfferListItemsSerializer)
+
+    def test_output_is_byte_identical(self):
+        fast = self._render(fast=True)
+        self.assertEqual(fast, self._render(fast=False))
+        self.assertIn(b'"url":"http://api.example.com:8443/api/offerdetails/', fast)
+        self.assertIn(b'"image":"http://api.example.com:8443/media/offers/logo.png"', fast)
+        self.assertIn(b'"thumb":{"webp":"http://api.example.com:8443/media/images/ab/ab.webp"', fast)
+
+    @override_settings(TIME_ZONE="Europe/Berlin")
+    def test_output_is_byte_identical_in_other_timezone(self):
+        fast = self._render(fast=True)
+        self.assertEqual(fast, self._render(fast=False))
+        self.assertNotIn(b'Z"', fast)
+
+    def test_without_request_falls_back(self):
+        offers = Offer.objects.filter(details__isnull=True)
+        data = OfferListSerializer(offers, many=True).data
+        self.assertEqual(data[0]["details"], [])
+        self.assertEqual(data[0]["image"], "/media/offers/logo.png")
+
+    def test_benchmark_runs(self):
+        report = serializer_bench.run(offers_count=5, repeat=1, host="api.example.com")
+        self.assertEqual(report["offers"], 5)
+        self.assertGreater(report["bytes"], 0)
@@ -0,0 +1,76 @@
+from unittest import mock
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from auth_app.models import Profile
+from coderr_app import search
+from coderr_app.models import Offer
+
+
+class OffersFullTextSearchTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business_user = User.objects.create_user(
+            username="business_user", email="business_user@example.com", password="x"
+        )
+        Profile.objects.create(user=cls.business_user, type="business")
+
+        cls.described = Offer.objects.create(
+            user=cls.business_user, title="Website Relaunch",
+            description="Includes a fresh logo and typography",
+        )
+        cls.titled = Offer.objects.create(
+            user=cls.business_user, title="Logo Design",
+            description="Vector files in every format",
+        )
+        cls.unrelated = Offer.objects.create(
+            user=cls.business_user, title="SEO Audit",
+            description="Keyword research and reporting",
+        )
+
+        cls.list_url = reverse("offer-list")
+
+    def setUp(self):
+        cache.clear()
+
+    def _ids(self, params):
+        resp = self.client.get(self.list_url, params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return [item['id'] for item in resp.data['results']]
+
+    def test_index_is_available(self):
+        self.assertTrue(search.is_available())
+
+    def test_get_200_search_uses_fts_index(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self._ids({'search': 'logo'})
+        self.assertTrue(any(search.FTS_TABLE in q['sql'] for q in ctx.captured_queries))
+
+    def test_get_200_search_ranks_title_matches_first(self):
+        self.assertEqual(self._ids({'search': 'logo'}), [self.titled.id, self.described.id])
+
+    def test_get_200_search_prefix_and_all_words(self):
+        self.assertEqual(self._ids({'search': 'typo'}), [self.described.id])
+        self.assertEqual(self._ids({'search': 'logo vector'}), [self.titled.id])
+
+    def test_get_200_search_explicit_ordering_wins(self):
+        ids = self._ids({'search': 'logo', 'ordering': 'updated_at'})
+        self.assertEqual(ids, [self.described.id, self.titled.id])
+
+    def test_index_follows_offer_writes(self):
+        self.unrelated.title = "Logo Audit"
+        self.unrelated.save()
+        self.assertIn(self.unrelated.id, self._ids({'search': 'logo'}))
+
+        Offer.objects.filter(pk=self.titled.pk).delete()
+        self.assertNotIn(self.titled.id, self._ids({'search': 'logo'}))
+
+    def test_get_200_search_falls_back_without_index(self):
+        with mock.patch.object(search, 'is_available', return_value=False):
+            ids = self._ids({'search': 'ypograph'})
+        self.assertEqual(ids, [self.described.id])
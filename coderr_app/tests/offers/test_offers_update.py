@@ -0,0 +1,87 @@
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from auth_app.models import Profile
+from coderr_app.models import Offer, OfferDetail
+
+
+class OfferUpdateQueryTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business_user = User.objects.create_user(
+            username="business_user", email="business_user@example.com", password="x"
+        )
+        Profile.objects.create(user=cls.business_user, type="business")
+
+        cls.offer = Offer.objects.create(
+            user=cls.business_user, title="Offer", description="For tests"
+        )
+        for otype, price, days in (("basic", 50, 3), ("standard", 100, 5), ("premium", 200, 7)):
+            OfferDetail.objects.create(
+                offer=cls.offer, title=otype.title(), revisions=1,
+                delivery_time_in_days=days, price=price, features=["A"], offer_type=otype
+            )
+
+        cls.detail_url = reverse("offer-detail", args=[cls.offer.id])
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(user=self.business_user)
+
+    def test_patch_200_three_tiers_in_four_queries(self):
+        # offer + user, prefetched details, one bulk UPDATE, one offer UPDATE
+        with self.assertNumQueries(4):
+            resp = self.client.patch(self.detail_url, {
+                "details": [
+                    {"offer_type": "basic", "price": 40},
+                    {"offer_type": "standard", "price": 110},
+                    {"offer_type": "premium", "price": 210},
+                ],
+            }, format='json')
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        prices = {d['offer_type']: d['price'] for d in resp.data['details']}
+        self.assertEqual(prices, {"basic": 40, "standard": 110, "premium": 210})
+
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 40)
+
+    def test_patch_200_skips_offer_save_without_offer_changes(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.patch(self.detail_url, {
+                "title": "Offer",
+                "details": [{"offer_type": "premium", "revisions": 4}],
+            }, format='json')
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('coderr_app_offerdetail', updates[0])
+        self.assertIn('"revisions"', updates[0])
+        self.assertNotIn('"price"', updates[0])
+
+    def test_patch_200_only_changed_offer_fields_written(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.patch(self.detail_url, {"description": "New"}, format='json')
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['description'], "New")
+        updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('"title"', updates[0])
+
+    def test_patch_400_unknown_offer_type_writes_nothing(self):
+        OfferDetail.objects.filter(offer=self.offer, offer_type="premium").delete()
+        resp = self.client.patch(self.detail_url, {
+            "title": "Changed",
+            "details": [{"offer_type": "premium", "price": 1}],
+        }, format='json')
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.title, "Offer")
@@ -0,0 +1,105 @@
+from io import StringIO
+from django.urls import reverse
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APITestCase
+from auth_app.models import Profile
+from coderr_app.models import BusinessOrderCounter, Offer, OfferDetail, Order
+
+
+class BusinessOrderCounterTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business_user = User.objects.create_user(
+            username="business_user", email="business_user@example.com", password="x"
+        )
+        Profile.objects.create(user=cls.business_user, type="business")
+
+        cls.customer_user = User.objects.create_user(
+            username="customer_user", email="customer_user@example.com", password="x"
+        )
+        Profile.objects.create(user=cls.customer_user, type="customer")
+
+        offer = Offer.objects.create(user=cls.business_user, title="Offer", description="D")
+        cls.offer_detail = OfferDetail.objects.create(
+            offer=offer, title="Basic", revisions=1,
+            delivery_time_in_days=3, price=50, features=["A"], offer_type="basic"
+        )
+        cls.order = Order.objects.create(
+            customer_user=cls.customer_user,
+            offer_detail=cls.offer_detail,
+            business_user=cls.business_user,
+        )
+
+        cls.count_url = reverse("order-count", args=[cls.business_user.id])
+        cls.completed_url = reverse("completed-order-count", args=[cls.business_user.id])
+
+    def setUp(self):
+        cache.clear()
+
+    def _counter(self):
+        return BusinessOrderCounter.objects.get(pk=self.business_user.pk)
+
+    def test_post_201_increments_in_progress(self):
+        self.client.force_authenticate(self.customer_user)
+        resp = self.client.post(reverse("order-list"), {"offer_detail_id": self.offer_detail.id}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self._counter().in_progress, 2)
+
+    def test_patch_200_moves_count_between_statuses(self):
+        self.client.force_authenticate(self.business_user)
+        resp = self.client.patch(
+            reverse("order-detail", args=[self.order.id]), {"status": "completed"}, format="json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        counter = self._counter()
+        self.assertEqual((counter.in_progress, counter.completed, counter.cancelled), (0, 1, 0))
+
+        resp = self.client.get(self.completed_url)
+        self.assertEqual(resp.data['completed_order_count'], 1)
+
+    def test_delete_decrements_counter(self):
+        self.order.delete()
+        self.assertEqual(self._counter().in_progress, 0)
+
+    def test_delete_without_counter_row_does_not_create_one(self):
+        BusinessOrderCounter.objects.all().delete()
+        self.order.delete()
+        self.assertFalse(BusinessOrderCounter.objects.exists())
+
+    def test_deleting_business_user_with_orders(self):
+        self.business_user.delete()
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(BusinessOrderCounter.objects.exists())
+
+    def test_get_200_count_is_single_lookup(self):
+        self.client.force_authenticate(self.business_user)
+        self.client.get(self.count_url)
+        with self.assertNumQueries(1):
+            resp = self.client.get(self.count_url)
+        self.assertEqual(resp.data['order_count'], 1)
+
+    def test_get_200_user_without_counter_row(self):
+        self.client.force_authenticate(self.business_user)
+        resp = self.client.get(reverse("order-count", args=[self.customer_user.id]))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['order_count'], 0)
+
+    def test_command_reconciles_drift(self):
+        BusinessOrderCounter.objects.filter(pk=self.business_user.pk).update(in_progress=7, completed=3)
+
+        with self.assertRaises(CommandError):
+            call_command('reconcile_order_counters', '--verify', stdout=StringIO())
+
+        out = StringIO()
+        call_command('reconcile_order_counters', stdout=out)
+        self.assertIn('updated 1', out.getvalue())
+
+        counter = self._counter()
+        self.assertEqual((counter.in_progress, counter.completed), (1, 0))
+        call_command('reconcile_order_counters', '--verify', stdout=StringIO())
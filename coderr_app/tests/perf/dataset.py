@@ -0,0 +1,47 @@
+"""Deterministic, production-shaped dataset for the endpoint budget tests.
+
+The rows come from the same generator as `manage.py seed_marketplace`,
+so budgets are measured against the data shape used for load tests.
+"""
+
+from django.contrib.auth.models import User
+
+from coderr_app.models import Offer, OfferDetail, Order, Review
+from coderr_app.seeding import MarketplaceSeeder, SeedConfig
+from core_app.models import ChunkedUpload
+
+PASSWORD = "perf-password"
+
+
+def build_dataset(scale=1, seed=1234):
+    """Create users, profiles, offers, details, orders and reviews.
+
+    Returns a dict of handles the endpoint specs use to build URLs.
+    """
+    MarketplaceSeeder(SeedConfig(
+        business=100 * scale,
+        customers=400 * scale,
+        offers_per_business=10,
+        orders=3000 * scale,
+        reviews_per_customer=3,
+        seed=seed,
+        prefix="perf",
+        password=PASSWORD,
+    )).run()
+
+    business = User.objects.get(username="perf_business_0")
+    customer = User.objects.get(username="perf_customer_0")
+    reviewed = Review.objects.filter(reviewer=customer).values("business_user_id")
+    return {
+        "business": business,
+        "customer": customer,
+        "staff": User.objects.create_user(username="perf_staff", password=PASSWORD, is_staff=True),
+        "offer": Offer.objects.filter(user=business).first(),
+        "offer_detail": OfferDetail.objects.filter(offer__user=business).first(),
+        "order": Order.objects.filter(business_user=business).first(),
+        "unreviewed_business": User.objects.filter(
+            username__startswith="perf_business_"
+        ).exclude(pk__in=reviewed).order_by("pk").first(),
+        "review": Review.objects.filter(reviewer=customer).first(),
+        "upload": ChunkedUpload.objects.create(user=business, filename="logo.png", size=1024, sha256="0" * 64),
+    }
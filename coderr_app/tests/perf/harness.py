@@ -0,0 +1,222 @@
+"""Query-count and latency budget harness for the API.
+
+`ENDPOINTS` describes one request per route (and per interesting variant)
+across core_app, auth_app and coderr_app. `measure()` runs a request
+through the test client and records the number of SQL queries and the
+wall time. Budgets live in `budgets.json` next to this module:
+
+    {"offer-list": {"queries": 3, "ms": 400}, ...}
+
+Query counts are always checked. Wall times depend on the machine, so
+the "ms" budgets are only enforced with PERF_CHECK_MS=1. Set
+PERF_BUDGET_UPDATE=1 to rewrite the budget file from a run (with
+headroom) and PERF_REPORT=1 to print the measurements.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, reverse
+from django.urls.resolvers import URLPattern, URLResolver
+
+from .dataset import PASSWORD
+
+BUDGET_FILE = Path(__file__).with_name("budgets.json")
+
+# Headroom applied when budgets are regenerated
+QUERY_HEADROOM = 0
+MS_FACTOR = 5
+MS_FLOOR = 100
+
+
+@dataclass
+class Endpoint:
+    """One request to measure. Callables receive the dataset handles."""
+
+    name: str
+    route: str
+    method: str = "get"
+    user: Optional[str] = None
+    args: Callable[[dict], list] = lambda ctx: []
+    params: Callable[[dict], Optional[dict]] = lambda ctx: None
+    warm: bool = True
+    expected_status: tuple = (200,)
+
+
+@dataclass
+class Measurement:
+    name: str
+    status: int
+    queries: int
+    ms: float
+    sql: list = field(default_factory=list)
+
+
+def _offer_payload(title):
+    return {
+        "title": title,
+        "description": "Budget harness offer",
+        "details": [
+            {"title": "Basic", "revisions": 1, "delivery_time_in_days": 3,
+             "price": 50, "features": ["A"], "offer_type": "basic"},
+            {"title": "Standard", "revisions": 2, "delivery_time_in_days": 5,
+             "price": 100, "features": ["A", "B"], "offer_type": "standard"},
+            {"title": "Premium", "revisions": 3, "delivery_time_in_days": 7,
+             "price": 200, "features": ["A", "B", "C"], "offer_type": "premium"},
+        ],
+    }
+
+
+# Read-only requests run twice (warm-up, then measured); writes run once.
+# Destructive requests come last so they do not disturb earlier ones.
+ENDPOINTS = [
+    # core_app
+    Endpoint("health", "health"),
+    Endpoint("metrics", "metrics"),
+    Endpoint("ready", "ready"),
+    Endpoint("upload-detail", "upload-detail", user="business", args=lambda c: [c["upload"].pk]),
+    # auth_app
+    Endpoint("profile-detail", "profile-detail", user="customer", args=lambda c: [c["business"].pk]),
+    Endpoint("profile-business-list", "profile-business-list", user="customer"),
+    Endpoint("profile-customer-list", "profile-customer-list", user="customer"),
+    # coderr_app
+    Endpoint("base-info", "base-info"),
+    Endpoint("offer-list", "offer-list"),
+    Endpoint("offer-list-page-size-100", "offer-list", params=lambda c: {"page_size": 100}),
+    Endpoint("offer-list-deep-page", "offer-list", params=lambda c: {"page": 100}),
+    Endpoint("offer-list-cursor", "offer-list", params=lambda c: {"cursor": "", "page_size": 100}),
+    Endpoint("offer-list-filtered", "offer-list", params=lambda c: {
+        "min_price": 100, "max_delivery_time": 5, "ordering": "min_price",
+    }),
+    Endpoint("offer-list-creator", "offer-list", params=lambda c: {"creator_id": c["business"].pk}),
+    Endpoint("offer-list-search", "offer-list", params=lambda c: {"search": "logo design"}),
+    Endpoint("offer-detail", "offer-detail", user="customer", args=lambda c: [c["offer"].pk]),
+    Endpoint("offerdetail-detail", "offerdetail-detail", user="customer", args=lambda c: [c["offer_detail"].pk]),
+    Endpoint("order-list-customer", "order-list", user="customer"),
+    Endpoint("order-list-business", "order-list", user="business"),
+    Endpoint("order-detail", "order-detail", user="business", args=lambda c: [c["order"].pk]),
+    Endpoint("order-count", "order-count", user="business", args=lambda c: [c["business"].pk]),
+    Endpoint("completed-order-count", "completed-order-count", user="business", args=lambda c: [c["business"].pk]),
+    Endpoint("review-list", "review-list", user="customer"),
+    Endpoint("review-list-business", "review-list", user="customer",
+             params=lambda c: {"business_user_id": c["business"].pk}),
+    Endpoint("review-detail", "review-detail", user="customer", args=lambda c: [c["review"].pk]),
+    # writes
+    Endpoint("upload-create", "upload-list", method="post", user="business", warm=False,
+             expected_status=(201,), params=lambda c: {"filename": "logo.png", "size": 1024, "sha256": "0" * 64}),
+    Endpoint("registration", "registration", method="post", warm=False, expected_status=(201,),
+             params=lambda c: {"username": "perf_new", "email": "perf_new@example.com",
+                               "password": "S3cure-pass!", "repeated_password": "S3cure-pass!",
+                               "type": "customer"}),
+    Endpoint("login", "login", method="post", warm=False,
+             params=lambda c: {"username": c["customer"].username, "password": PASSWORD}),
+    Endpoint("profile-patch", "profile-detail", method="patch", user="customer", warm=False,
+             args=lambda c: [c["customer"].pk], params=lambda c: {"location": "Hamburg"}),
+    Endpoint("offer-create", "offer-list", method="post", user="business", warm=False,
+             expected_status=(201,), params=lambda c: _offer_payload("Budget offer")),
+    Endpoint("offer-bulk", "offer-bulk", method="post", user="business", warm=False,
+             expected_status=(201,), params=lambda c: [_offer_payload(f"Bulk {i}") for i in range(10)]),
+    Endpoint("offer-patch", "offer-detail", method="patch", user="business", warm=False,
+             args=lambda c: [c["offer"].pk],
+             params=lambda c: {"title": "Patched", "details": [{"offer_type": "basic", "price": 10}]}),
+    Endpoint("order-create", "order-list", method="post", user="customer", warm=False,
+             expected_status=(201,), params=lambda c: {"offer_detail_id": c["offer_detail"].pk}),
+    Endpoint("order-patch", "order-detail", method="patch", user="business", warm=False,
+             args=lambda c: [c["order"].pk], params=lambda c: {"status": "completed"}),
+    Endpoint("review-create", "review-list", method="post", user="customer", warm=False,
+             expected_status=(201,), params=lambda c: {
+                 "business_user": c["unreviewed_business"].pk, "rating": 5, "description": "Great"}),
+    Endpoint("review-patch", "review-detail", method="patch", user="customer", warm=False,
+             args=lambda c: [c["review"].pk], params=lambda c: {"rating": 2}),
+    Endpoint("review-delete", "review-detail", method="delete", user="customer", warm=False,
+             expected_status=(204,), args=lambda c: [c["review"].pk]),
+    Endpoint("order-delete", "order-detail", method="delete", user="staff", warm=False,
+             expected_status=(204,), args=lambda c: [c["order"].pk]),
+    Endpoint("offer-delete", "offer-detail", method="delete", user="business", warm=False,
+             expected_status=(204,), args=lambda c: [c["offer"].pk]),
+]
+
+
+def api_route_names():
+    """Return the names of all routes mounted below /api/."""
+    names = set()
+
+    def walk(patterns, prefix):
+        for pattern in patterns:
+            route = prefix + str(pattern.pattern)
+            if isinstance(pattern, URLResolver):
+                walk(pattern.url_patterns, route)
+            elif isinstance(pattern, URLPattern) and pattern.name and route.startswith("api/"):
+                names.add(pattern.name)
+
+    walk(get_resolver().url_patterns, "")
+    return names
+
+
+def measure(client, endpoint, ctx):
+    """Run `endpoint` (after an optional warm-up) and return a Measurement."""
+    user = ctx.get(endpoint.user) if endpoint.user else None
+    client.force_authenticate(user)
+    url = reverse(endpoint.route, args=endpoint.args(ctx))
+    data = endpoint.params(ctx)
+    send = getattr(client, endpoint.method)
+    kwargs = {"format": "json"} if endpoint.method != "get" else {}
+
+    if endpoint.warm:
+        send(url, data, **kwargs)
+
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        response = send(url, data, **kwargs)
+        elapsed = (time.perf_counter() - start) * 1000
+
+    return Measurement(
+        name=endpoint.name,
+        status=response.status_code,
+        queries=len(queries.captured_queries),
+        ms=elapsed,
+        sql=[q["sql"] for q in queries.captured_queries],
+    )
+
+
+def load_budgets():
+    with open(BUDGET_FILE, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def write_budgets(measurements):
+    budgets = {
+        m.name: {
+            "queries": m.queries + QUERY_HEADROOM,
+            "ms": max(MS_FLOOR, int(round(m.ms * MS_FACTOR, -1))),
+        }
+        for m in measurements
+    }
+    with open(BUDGET_FILE, "w", encoding="utf-8") as fh:
+        json.dump(budgets, fh, indent=2, sort_keys=True)
+        fh.write("\n")
+
+
+def report(measurements):
+    lines = [f"{'endpoint':32} {'status':>6} {'queries':>7} {'ms':>9}"]
+    for m in measurements:
+        lines.append(f"{m.name:32} {m.status:>6} {m.queries:>7} {m.ms:>9.1f}")
+    return "\n".join(lines)
+
+
+def update_requested():
+    return os.environ.get("PERF_BUDGET_UPDATE") == "1"
+
+
+def report_requested():
+    return os.environ.get("PERF_REPORT") == "1"
+
+
+def timing_requested():
+    return os.environ.get("PERF_CHECK_MS") == "1"
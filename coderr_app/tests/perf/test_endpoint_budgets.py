@@ -0,0 +1,60 @@
+import os
+import sys
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+from core_app.tests.images import TemporaryMediaMixin
+from .dataset import build_dataset
+from . import harness
+
+
+class EndpointBudgetTests(TemporaryMediaMixin, APITestCase):
+    """Fail when an endpoint exceeds its committed query/latency budget.
+
+    Seeds a production-shaped dataset (thousands of rows) so N+1 queries
+    and unbounded responses show up in the numbers.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ctx = build_dataset(scale=int(os.environ.get("PERF_SCALE", "1")))
+
+    def setUp(self):
+        # Start each run with empty throttle history and cold counters
+        cache.clear()
+
+    def test_every_api_route_is_covered(self):
+        covered = {endpoint.route for endpoint in harness.ENDPOINTS}
+        missing = harness.api_route_names() - covered
+        self.assertEqual(missing, set(), "Add these routes to harness.ENDPOINTS")
+
+    def test_endpoints_within_budget(self):
+        measurements = []
+        for endpoint in harness.ENDPOINTS:
+            measurement = harness.measure(self.client, endpoint, self.ctx)
+            self.assertIn(
+                measurement.status, endpoint.expected_status,
+                f"{endpoint.name} returned {measurement.status}",
+            )
+            measurements.append(measurement)
+
+        if harness.report_requested():
+            sys.stderr.write("\n" + harness.report(measurements) + "\n")
+        if harness.update_requested():
+            harness.write_budgets(measurements)
+            return
+
+        budgets = harness.load_budgets()
+        for measurement in measurements:
+            with self.subTest(endpoint=measurement.name):
+                budget = budgets.get(measurement.name)
+                self.assertIsNotNone(budget, f"No budget for {measurement.name}")
+                self.assertLessEqual(
+                    measurement.queries, budget["queries"],
+                    f"{measurement.name}: {measurement.queries} queries > budget {budget['queries']}\n"
+                    + "\n".join(measurement.sql),
+                )
+                if harness.timing_requested():
+                    self.assertLessEqual(
+                        measurement.ms, budget["ms"],
+                        f"{measurement.name}: {measurement.ms:.0f} ms > budget {budget['ms']} ms",
+                    )
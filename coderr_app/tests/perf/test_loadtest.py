@@ -0,0 +1,71 @@
+from django.core.cache import cache
+from django.core.servers.basehttp import WSGIServer
+from django.test import LiveServerTestCase
+from django.test.testcases import LiveServerThread, QuietWSGIRequestHandler
+from coderr_app.models import Order, Review
+from coderr_app.seeding import MarketplaceSeeder, SeedConfig
+from loadtest import runner, scenarios
+from loadtest.stats import percentile
+
+SEED = SeedConfig(business=3, customers=6, offers_per_business=4, orders=30,
+                  reviews_per_customer=1, prefix="load", password="load-password")
+
+
+class SerialLiveServerThread(LiveServerThread):
+    """Handle one request at a time.
+
+    The in-memory test database is a single connection shared by all
+    server threads, so concurrent write transactions would collide.
+    """
+
+    def _create_server(self, connections_override=None):
+        return WSGIServer((self.host, self.port), QuietWSGIRequestHandler, allow_reuse_address=False)
+
+
+class LoadTestRunnerTests(LiveServerTestCase):
+    """Run every journey briefly against a live server."""
+
+    server_thread_class = SerialLiveServerThread
+
+    def setUp(self):
+        cache.clear()
+        MarketplaceSeeder(SEED).run()
+        self.accounts = scenarios.Accounts(SEED.prefix, SEED.password, SEED.business, SEED.customers)
+
+    def _run(self, journey, iterations=2):
+        return runner.run(self.live_server_url, users=2, duration=60, iterations=iterations,
+                          accounts=self.accounts, journeys=[journey])
+
+    def assertNoFailures(self, stats):
+        rows = stats.summary()
+        self.assertEqual([row for row in rows if row["failures"]], [])
+        return {row["name"]: row for row in rows}
+
+    def test_anonymous_browsing(self):
+        rows = self.assertNoFailures(self._run(scenarios.AnonymousBrowsing))
+        self.assertIn("GET /api/base-info/", rows)
+        self.assertIn("GET /api/offers/", rows)
+        self.assertEqual(rows["GET /api/base-info/"]["requests"], 4)
+
+    def test_customer_ordering(self):
+        orders = Order.objects.count()
+        rows = self.assertNoFailures(self._run(scenarios.CustomerOrdering))
+        self.assertEqual(rows["POST /api/login/"]["requests"], 4)
+        self.assertEqual(Order.objects.count(), orders + rows["POST /api/orders/"]["requests"])
+
+    def test_business_order_handling(self):
+        rows = self.assertNoFailures(self._run(scenarios.BusinessOrderHandling))
+        self.assertGreater(rows["PATCH /api/orders/{id}/"]["requests"], 0)
+
+    def test_customer_reviewing(self):
+        reviews = Review.objects.count()
+        rows = self.assertNoFailures(self._run(scenarios.CustomerReviewing, iterations=1))
+        self.assertEqual(Review.objects.count(), reviews + rows["POST /api/reviews/"]["requests"])
+
+    def test_report_percentiles(self):
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2)
+        self.assertEqual(percentile(list(range(1, 101)), 99), 99)
+        self.assertEqual(percentile([], 95), 0.0)
+        report = self._run(scenarios.AnonymousBrowsing, iterations=1).format_table()
+        self.assertIn("p99 ms", report)
+        self.assertIn("total", report)
@@ -0,0 +1,127 @@
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from auth_app.models import Profile
+from coderr_app.models import Offer, OfferDetail, Review
+from core_app import metrics
+
+
+@override_settings(ROOT_URLCONF="coderr_app.tests.async_urls")
+class AsyncReadViewsTests(APITestCase):
+    """The async read views answer exactly like their sync counterparts."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business_user = User.objects.create_user(
+            username="business_user", email="business_user@example.com", password="x"
+        )
+        Profile.objects.create(user=cls.business_user, type="business")
+        cls.customer_user = User.objects.create_user(
+            username="customer_user", email="customer_user@example.com", password="x"
+        )
+        Profile.objects.create(user=cls.customer_user, type="customer")
+        cls.token = Token.objects.create(user=cls.customer_user)
+
+        for number in range(8):
+            offer = Offer.objects.create(
+                user=cls.business_user, title=f"Logo design {number}", description="Vector logo",
+            )
+            for offer_type, price in (("basic", 100 + number), ("standard", 200), ("premium", 300)):
+                OfferDetail.objects.create(
+                    offer=offer, title=offer_type.title(), revisions=1, delivery_time_in_days=3 + number,
+                    price=price, features=["A"], offer_type=offer_type,
+                )
+        cls.offer = offer
+        Review.objects.create(
+            business_user=cls.business_user, reviewer=cls.customer_user, rating=4, description="Good"
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def _auth(self):
+        return {"Authorization": f"Token {self.token.key}"}
+
+    def _compare(self, url, data=None, auth=True, expected_status=status.HTTP_200_OK):
+        """GET `url` through the sync and the async view and compare the responses."""
+        headers = self._auth() if auth else {}
+        with override_settings(ROOT_URLCONF="core.urls"):
+            sync_resp = self.client.get(url, data, headers=headers)
+        async_resp = async_to_sync(self.async_client.get)(url, data, headers=headers)
+
+        self.assertEqual(sync_resp.status_code, expected_status, sync_resp.content)
+        self.assertEqual(async_resp.status_code, sync_resp.status_code)
+        self.assertEqual(async_resp.content, sync_resp.content)
+        self.assertEqual(async_resp["Content-Type"], sync_resp["Content-Type"])
+        self.assertEqual(async_resp.get("ETag"), sync_resp.get("ETag"))
+        return async_resp
+
+    def test_offer_list(self):
+        url = reverse("offer-list")
+        self._compare(url, auth=False)
+        self._compare(url, {"page": 2, "page_size": 3}, auth=False)
+        self._compare(url, {"min_price": 104, "ordering": "min_price"}, auth=False)
+        self._compare(url, {"search": "logo"}, auth=False)
+        self._compare(url, {"page": 99}, auth=False, expected_status=status.HTTP_404_NOT_FOUND)
+
+    def test_offer_list_cursor_pages(self):
+        resp = self._compare(reverse("offer-list"), {"cursor": "", "page_size": 3}, auth=False)
+        next_url = resp.json()["next"]
+        self.assertIsNotNone(next_url)
+        self._compare(next_url.replace("http://testserver", ""), auth=False)
+
+    def test_offer_retrieve(self):
+        url = reverse("offer-detail", args=[self.offer.pk])
+        self._compare(url)
+        self._compare(url, auth=False, expected_status=status.HTTP_401_UNAUTHORIZED)
+        self._compare(reverse("offer-detail", args=[999999]), expected_status=status.HTTP_404_NOT_FOUND)
+
+    def test_offer_detail_item(self):
+        detail = self.offer.details.first()
+        self._compare(reverse("offerdetail-detail", args=[detail.pk]))
+        self._compare(reverse("offerdetail-detail", args=[999999]), expected_status=status.HTTP_404_NOT_FOUND)
+
+    def test_review_list(self):
+        url = reverse("review-list")
+        self._compare(url)
+        self._compare(url, {"business_user_id": self.business_user.pk, "ordering": "rating"})
+        self._compare(url, auth=False, expected_status=status.HTTP_401_UNAUTHORIZED)
+
+    def test_base_info_and_conditional_get(self):
+        resp = self._compare(reverse("base-info"), auth=False)
+        not_modified = async_to_sync(self.async_client.get)(
+            reverse("base-info"), headers={"If-None-Match": resp["ETag"]}
+        )
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified["ETag"], resp["ETag"])
+
+    def test_writes_use_sync_views(self):
+        resp = async_to_sync(self.async_client.post)(
+            reverse("review-list"),
+            {"business_user": self.business_user.pk, "rating": 5, "description": "Again"},
+            content_type="application/json", headers=self._auth(),
+        )
+        # Handled by ReviewViewSet.create: one review per business and reviewer
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+        resp = async_to_sync(self.async_client.delete)(reverse("offer-detail", args=[self.offer.pk]))
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_metrics_count_async_queries(self):
+        labels = {"view": "AsyncOfferListView.get", "method": "GET", "status": "200"}
+        requests = metrics.get_sample_value("coderr_http_requests_total", **labels)
+        queries = metrics.get_sample_value("coderr_db_queries_per_request_sum", view="AsyncOfferListView.get")
+
+        with override_settings(REQUEST_TIMING_SAMPLE_RATE=1.0):
+            resp = async_to_sync(self.async_client.get)(reverse("offer-list"))
+
+        self.assertEqual(metrics.get_sample_value("coderr_http_requests_total", **labels), requests + 1)
+        counted = metrics.get_sample_value("coderr_db_queries_per_request_sum", view="AsyncOfferListView.get")
+        # COUNT, page of offers, prefetched details
+        self.assertEqual(counted - queries, 3)
+        self.assertIn('desc="3 queries"', resp["Server-Timing"])
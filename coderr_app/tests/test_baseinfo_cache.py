@@ -0,0 +1,86 @@
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APITestCase
+from auth_app.models import Profile
+from coderr_app.models import Offer, Review
+
+
+class BaseInfoCacheTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business_user = User.objects.create_user(
+            username="business_user", email="business_user@example.com", password="x"
+        )
+        Profile.objects.create(user=cls.business_user, type="business")
+
+        cls.customer_user = User.objects.create_user(
+            username="customer_user", email="customer_user@example.com", password="x"
+        )
+        cls.customer_profile = Profile.objects.create(user=cls.customer_user, type="customer")
+
+        Offer.objects.create(user=cls.business_user, title="Offer", description="D")
+        Review.objects.create(
+            business_user=cls.business_user, reviewer=cls.customer_user,
+            rating=4, description="Good"
+        )
+
+        cls.url = reverse("base-info")
+
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_get_200_served_from_cache(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['offer_count'], 1)
+
+    def test_get_200_sends_etag_and_cache_control(self):
+        resp = self.client.get(self.url)
+        self.assertIn('ETag', resp)
+        self.assertIn('public', resp['Cache-Control'])
+        self.assertIn('max-age=', resp['Cache-Control'])
+
+    def test_get_304_if_none_match(self):
+        etag = self.client.get(self.url)['ETag']
+        resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(resp['ETag'], etag)
+
+    def test_counters_follow_creates_and_deletes(self):
+        first = self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            offer = Offer.objects.create(user=self.business_user, title="Second", description="D")
+            other = User.objects.create_user(username="other", email="other@example.com", password="x")
+            Profile.objects.create(user=other, type="business")
+            Review.objects.create(
+                business_user=other, reviewer=self.customer_user, rating=5, description="Great"
+            )
+
+        with self.assertNumQueries(0):
+            resp = self.client.get(self.url)
+        self.assertEqual(resp.data['offer_count'], 2)
+        self.assertEqual(resp.data['business_profile_count'], 2)
+        self.assertEqual(resp.data['review_count'], 2)
+        self.assertEqual(resp.data['average_rating'], 4.5)
+        self.assertNotEqual(resp['ETag'], first['ETag'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            offer.delete()
+        self.assertEqual(self.client.get(self.url).data['offer_count'], 1)
+
+    def test_profile_type_change_adjusts_business_count(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            profile = Profile.objects.get(pk=self.customer_user.pk)
+            profile.type = "business"
+            profile.save()
+        self.assertEqual(self.client.get(self.url).data['business_profile_count'], 2)
@@ -0,0 +1,167 @@
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APITestCase
+from auth_app.models import Profile
+from coderr_app.models import Offer, OfferDetail, Order, Review
+
+
+class ConditionalGetTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business_user = User.objects.create_user(
+            username="business_user", email="business_user@example.com", password="x"
+        )
+        Profile.objects.create(user=cls.business_user, type="business")
+        cls.customer_user = User.objects.create_user(
+            username="customer_user", email="customer_user@example.com", password="x"
+        )
+        Profile.objects.create(user=cls.customer_user, type="customer")
+        cls.other_customer = User.objects.create_user(
+            username="other_customer", email="other_customer@example.com", password="x"
+        )
+        Profile.objects.create(user=cls.other_customer, type="customer")
+
+        cls.offers = []
+        for number in range(8):
+            offer = Offer.objects.create(user=cls.business_user, title=f"Offer {number}", description="D")
+            for offer_type, price in (("basic", 100 + number), ("standard", 200), ("premium", 300)):
+                OfferDetail.objects.create(
+                    offer=offer, title=offer_type.title(), revisions=1, delivery_time_in_days=3,
+                    price=price, features=["A"], offer_type=offer_type,
+                )
+            cls.offers.append(offer)
+        cls.detail = cls.offers[0].details.get(offer_type="basic")
+        cls.order = Order.objects.create(
+            customer_user=cls.customer_user, business_user=cls.business_user, offer_detail=cls.detail,
+        )
+        cls.review = Review.objects.create(
+            business_user=cls.business_user, reviewer=cls.customer_user, rating=4, description="Good"
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.customer_user)
+
+    def _revalidate(self, url, params=None, expected=status.HTTP_304_NOT_MODIFIED, **headers):
+        first = self.client.get(url, params)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        etag = first["ETag"]
+        self.assertIn("Last-Modified", first)
+        second = self.client.get(url, params, headers={"If-None-Match": etag, **headers})
+        self.assertEqual(second.status_code, expected)
+        return etag
+
+    def test_offer_list_304_costs_one_query(self):
+        url = reverse("offer-list")
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(1):
+            resp = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(resp["ETag"], etag)
+
+        # Different filters or pages are different representations
+        resp = self.client.get(url, {"page": 2}, headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        resp = self.client.get(url, {"min_price": 105}, headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def test_offer_list_changes_on_update_and_delete(self):
+        url = reverse("offer-list")
+        etag = self._revalidate(url)
+
+        self.offers[3].save()
+        resp = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        # Deleting an older offer does not move MAX(updated_at)
+        etag = resp["ETag"]
+        self.offers[0].delete()
+        resp = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["count"], 7)
+
+    def test_offer_list_cursor_page(self):
+        url = reverse("offer-list")
+        params = {"cursor": "", "page_size": 3}
+        etag = self._revalidate(url, params)
+
+        # A new offer moves into the first page
+        Offer.objects.create(user=self.business_user, title="New", description="D")
+        resp = self.client.get(url, params, headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def test_offer_retrieve(self):
+        url = reverse("offer-detail", args=[self.offers[1].pk])
+        etag = self._revalidate(url)
+        with self.assertNumQueries(2):
+            self.client.get(url, headers={"If-None-Match": etag})
+
+        # The summary can be refreshed without touching updated_at
+        OfferDetail.objects.filter(pk=self.offers[1].details.get(offer_type="basic").pk).update(price=1)
+        self.offers[1].refresh_summary()
+        resp = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["min_price"], 1)
+
+    def test_offer_retrieve_ignores_if_modified_since(self):
+        url = reverse("offer-detail", args=[self.offers[2].pk])
+        last_modified = self.client.get(url)["Last-Modified"]
+        self.offers[2].details.filter(offer_type="basic").update(price=1)
+        self.offers[2].refresh_summary()
+        resp = self.client.get(url, headers={"If-Modified-Since": last_modified})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["min_price"], 1)
+
+    def test_review_detail_if_modified_since(self):
+        url = reverse("review-detail", args=[self.review.pk])
+        last_modified = self.client.get(url)["Last-Modified"]
+        resp = self.client.get(url, headers={"If-Modified-Since": last_modified})
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_review_list_and_detail(self):
+        url = reverse("review-list")
+        etag = self._revalidate(url)
+        with self.assertNumQueries(1):
+            self.client.get(url, headers={"If-None-Match": etag})
+
+        self._revalidate(reverse("review-detail", args=[self.review.pk]))
+
+        self.client.force_authenticate(self.other_customer)
+        self.client.post(url, {"business_user": self.business_user.pk, "rating": 5, "description": "Ok"})
+        resp = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(resp.data), 2)
+
+    def test_order_list_is_per_user(self):
+        url = reverse("order-list")
+        etag = self._revalidate(url)
+
+        self.client.force_authenticate(self.other_customer)
+        resp = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data, [])
+
+    def test_order_changes_with_its_offer_detail(self):
+        url = reverse("order-detail", args=[self.order.pk])
+        etag = self._revalidate(url)
+
+        self.client.force_authenticate(self.business_user)
+        resp = self.client.patch(
+            reverse("offer-detail", args=[self.offers[0].pk]),
+            {"details": [{"offer_type": "basic", "features": ["A", "B"]}]}, format="json",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        self.client.force_authenticate(self.customer_user)
+        resp = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["features"], ["A", "B"])
+
+    def test_list_ignores_if_modified_since(self):
+        url = reverse("offer-list")
+        last_modified = self.client.get(url)["Last-Modified"]
+        resp = self.client.get(url, headers={"If-Modified-Since": last_modified})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
@@ -0,0 +1,134 @@
+import re
+import unittest
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from auth_app.models import Profile
+from coderr_app.models import Offer, OfferDetail, Order, Review
+
+# A plan line such as "SCAN coderr_app_offer" (no index, not a virtual table)
+FULL_SCAN = re.compile(r"\bSCAN (?!CONSTANT ROW)\S+$")
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN checks are SQLite-specific")
+class QueryPlanTests(APITestCase):
+    """Every list/filter endpoint must be served through indexes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business_users = []
+        cls.customer_users = []
+        for index in range(3):
+            business = User.objects.create_user(
+                username=f"business_{index}", email=f"business_{index}@example.com", password="x"
+            )
+            Profile.objects.create(user=business, type="business")
+            cls.business_users.append(business)
+
+            customer = User.objects.create_user(
+                username=f"customer_{index}", email=f"customer_{index}@example.com", password="x"
+            )
+            Profile.objects.create(user=customer, type="customer")
+            cls.customer_users.append(customer)
+
+        for business in cls.business_users:
+            for number in range(4):
+                offer = Offer.objects.create(
+                    user=business, title=f"Logo offer {number}", description="Design package"
+                )
+                for factor, otype in enumerate(["basic", "standard", "premium"], start=1):
+                    detail = OfferDetail.objects.create(
+                        offer=offer, title=otype, revisions=factor,
+                        delivery_time_in_days=2 * factor, price=40 * factor + number,
+                        features=["A"], offer_type=otype,
+                    )
+                for customer in cls.customer_users:
+                    Order.objects.create(
+                        customer_user=customer, business_user=business, offer_detail=detail
+                    )
+
+        for business in cls.business_users:
+            for customer in cls.customer_users[:2]:
+                Review.objects.create(
+                    business_user=business, reviewer=customer, rating=4, description="Good"
+                )
+
+    def setUp(self):
+        cache.clear()
+
+    def _full_scans(self, captured):
+        scans = []
+        with connection.cursor() as cursor:
+            for query in captured:
+                sql = query["sql"]
+                if not sql.lstrip().upper().startswith("SELECT"):
+                    continue
+                cursor.execute("EXPLAIN QUERY PLAN " + sql)
+                for row in cursor.fetchall():
+                    if FULL_SCAN.search(row[-1]):
+                        scans.append(f"{row[-1]}  <-  {sql}")
+        return scans
+
+    def assertIndexedRequest(self, method, url, user=None, data=None):
+        self.client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = getattr(self.client, method)(url, data, format="json" if method == "post" else None)
+        self.assertLess(resp.status_code, 400, resp.content)
+        scans = self._full_scans(ctx.captured_queries)
+        self.assertEqual(scans, [], f"{method.upper()} {url} {data or ''} fell back to a full table scan")
+
+    def test_offer_list_endpoints(self):
+        url = reverse("offer-list")
+        for params in [
+            {},
+            {"creator_id": self.business_users[0].id},
+            {"min_price": 42},
+            {"max_delivery_time": 2},
+            {"ordering": "min_price"},
+            {"ordering": "-updated_at", "page": 2},
+            {"search": "logo"},
+            {"cursor": ""},
+        ]:
+            with self.subTest(params=params):
+                self.assertIndexedRequest("get", url, data=params)
+
+    def test_offer_detail_endpoints(self):
+        offer = Offer.objects.first()
+        user = self.customer_users[0]
+        self.assertIndexedRequest("get", reverse("offer-detail", args=[offer.id]), user)
+        self.assertIndexedRequest("get", reverse("offerdetail-detail", args=[offer.details.first().id]), user)
+
+    def test_order_list_endpoints(self):
+        url = reverse("order-list")
+        self.assertIndexedRequest("get", url, self.customer_users[0])
+        self.assertIndexedRequest("get", url, self.business_users[0])
+
+    def test_order_count_endpoints(self):
+        user = self.business_users[0]
+        self.assertIndexedRequest("get", reverse("order-count", args=[user.id]), user)
+        self.assertIndexedRequest("get", reverse("completed-order-count", args=[user.id]), user)
+
+    def test_review_list_endpoints(self):
+        url = reverse("review-list")
+        user = self.customer_users[0]
+        for params in [
+            {},
+            {"business_user_id": self.business_users[0].id},
+            {"reviewer_id": user.id},
+        ]:
+            with self.subTest(params=params):
+                self.assertIndexedRequest("get", url, user, params)
+
+    def test_review_duplicate_check(self):
+        payload = {"business_user": self.business_users[0].id, "rating": 5, "description": "Again"}
+        self.assertIndexedRequest("post", reverse("review-list"), self.customer_users[2], payload)
+
+    def test_profile_list_endpoints(self):
+        user = self.customer_users[0]
+        self.assertIndexedRequest("get", reverse("profile-business-list"), user)
+        self.assertIndexedRequest("get", reverse("profile-customer-list"), user)
+        self.assertIndexedRequest("get", reverse("profile-detail", args=[user.id]), user)
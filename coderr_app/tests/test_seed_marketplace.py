@@ -0,0 +1,59 @@
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from auth_app.models import Profile
+from coderr_app import stats
+from coderr_app.models import BusinessOrderCounter, Offer, OfferDetail, Order, Review
+
+
+class SeedMarketplaceCommandTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def _seed(self, **options):
+        options = {"business": 4, "customers": 6, "offers_per_business": 2, "orders": 40,
+                   "reviews_per_customer": 2, "batch_size": 7, **options}
+        call_command("seed_marketplace", stdout=StringIO(), **options)
+
+    def test_creates_requested_rows(self):
+        self._seed()
+        self.assertEqual(Profile.objects.filter(type="business").count(), 4)
+        self.assertEqual(Profile.objects.filter(type="customer").count(), 6)
+        self.assertEqual(Offer.objects.count(), 8)
+        self.assertEqual(OfferDetail.objects.count(), 24)
+        self.assertEqual(Order.objects.count(), 40)
+        self.assertEqual(Review.objects.count(), 12)
+        self.assertEqual(
+            set(Order.objects.values_list("status", flat=True)),
+            {status for status, _ in Order.STATUS_CHOICES},
+        )
+        self.assertTrue(User.objects.get(username="seed_customer_0").check_password("password"))
+
+    def test_derived_data_is_consistent(self):
+        stats.get_counters()
+        self._seed()
+        call_command("reconcile_order_counters", verify=True, stdout=StringIO())
+        call_command("backfill_offer_summary", verify=True, stdout=StringIO())
+        self.assertEqual(BusinessOrderCounter.objects.count(), 4)
+        self.assertEqual(stats.get_counters()["offer_count"], 8)
+        for business_user_id, reviewer_id in Review.objects.values_list("business_user_id", "reviewer_id"):
+            self.assertEqual(Profile.objects.get(user_id=business_user_id).type, "business")
+            self.assertEqual(Profile.objects.get(user_id=reviewer_id).type, "customer")
+
+    def test_same_seed_produces_same_data(self):
+        self._seed(prefix="first")
+        self._seed(prefix="second")
+        first = list(Offer.objects.filter(user__username__startswith="first_")
+                     .order_by("pk").values_list("title", "min_price"))
+        second = list(Offer.objects.filter(user__username__startswith="second_")
+                      .order_by("pk").values_list("title", "min_price"))
+        self.assertEqual(first, second)
+
+    def test_existing_prefix_is_rejected(self):
+        self._seed()
+        with self.assertRaises(CommandError):
+            self._seed()
@@ -19,6 +19,14 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
 
+# Uploads are deduplicated by content (core_app.storage); identical files
+# share one blob in MEDIA_ROOT/.blobs. Run `manage.py gc_media` to remove
+# files and blobs nothing refers to any more.
+STORAGES = {
+    "default": {"BACKEND": "core_app.storage.ContentAddressedStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
 
@@ -49,6 +57,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core_app.middleware.MetricsMiddleware',
+    'core_app.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -125,6 +135,101 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Cache for the public base-info counters (coderr_app.stats).
+# BASE_INFO_CACHE_TTL is the safety-net lifetime of the cached counters,
+# BASE_INFO_MAX_AGE the Cache-Control max-age sent to browsers/proxies.
+BASE_INFO_CACHE_TTL = 300
+BASE_INFO_MAX_AGE = 60
+
+# Fraction of requests (0.0-1.0) measured by RequestTimingMiddleware.
+# Sampled responses carry a Server-Timing header with DB, serializer and
+# total time, and are logged on the "core_app.timing" logger.
+REQUEST_TIMING_SAMPLE_RATE = 0.1
+
+# Prometheus metrics (core_app.metrics, served at /api/metrics/).
+# None keeps them in process memory. With several WSGI worker processes
+# set a directory shared by all workers; each writes its own mmap file
+# and a scrape sums them. Empty the directory when deploying.
+METRICS_DIR = None
+
+# Who may scrape /api/metrics/: clients whose REMOTE_ADDR is in one of
+# METRICS_ALLOWED_NETWORKS, or that send "Authorization: Bearer
+# <METRICS_BEARER_TOKEN>" (None disables the token). Everyone else gets 403.
+METRICS_ALLOWED_NETWORKS = ["127.0.0.1/32", "::1/128"]
+METRICS_BEARER_TOKEN = os.environ.get("METRICS_BEARER_TOKEN") or None
+
+# Readiness probe (/api/ready/): per-check timeout in seconds and how long
+# a result is reused before the checks run again.
+READINESS_CHECK_TIMEOUT = 2.0
+READINESS_CACHE_SECONDS = 5
+
+# Serve GET/HEAD of the read-heavy endpoints (offer list/detail, offer
+# details, reviews list, base info) from async views. Only worthwhile
+# under an ASGI server (core.asgi); under WSGI every request to those
+# routes would pay for an event loop.
+ASYNC_READ_VIEWS = False
+
+# Seconds a token's user id is cached by
+# core_app.authentication.CachedTokenAuthentication. Logout drops the
+# entry earlier, in every process only if the default cache is shared.
+AUTH_TOKEN_CACHE_TTL = 60
+
+# The default LocMemCache is per process and only suitable for the
+# development server. Production must use a cache shared by all workers
+# (token cache invalidation, cached base info); `manage.py check
+# --deploy` fails otherwise. For example:
+#   CACHES = {"default": {
+#       "BACKEND": "django.core.cache.backends.redis.RedisCache",
+#       "LOCATION": "redis://127.0.0.1:6379/1",
+#   }}
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
+# Storage for the sliding-window API throttles (core_app.throttling).
+# None keeps the counters in the default cache, which is per process
+# with LocMemCache. Set a URL like "redis://:password@host:6379/0"
+# shared by all workers so the rates hold across processes.
+THROTTLE_REDIS_URL = None
+
+# Offer images and profile pictures (core_app.images). Uploads larger
+# than IMAGE_MAX_PIXELS are rejected; IMAGE_VARIANTS maps each variant to
+# its longest edge in pixels, rendered as WebP and JPEG by a background
+# task after upload.
+IMAGE_MAX_PIXELS = 40_000_000
+IMAGE_VARIANTS = {"thumb": 320, "medium": 960}
+
+# Background tasks (core_app.tasks). TASK_EXECUTOR is "worker" (run
+# `manage.py run_worker`; use this in production), "thread" (in-process
+# thread pool and poller, for the development server) or "inline" (once,
+# on commit, in the request thread; tests only, no retries). A running
+# task is retried elsewhere after TASK_VISIBILITY_TIMEOUT seconds; failed
+# tasks are retried after TASK_RETRY_DELAY seconds, doubled per attempt.
+# Workers and the "thread" poller look for due tasks every
+# TASK_POLL_INTERVAL seconds.
+TASK_EXECUTOR = "thread"
+TASK_VISIBILITY_TIMEOUT = 300
+TASK_RETRY_DELAY = 10
+TASK_POLL_INTERVAL = 1.0
+
+# Resumable chunked uploads (core_app.uploads). Part files live in
+# CHUNKED_UPLOAD_DIR, which should be on the same filesystem as
+# MEDIA_ROOT so finished uploads are renamed rather than copied.
+# Unfinished or unattached uploads are removed by
+# `manage.py clear_stale_uploads` after CHUNKED_UPLOAD_EXPIRY_HOURS.
+CHUNKED_UPLOAD_DIR = BASE_DIR / 'uploads'
+CHUNKED_UPLOAD_MAX_SIZE = 50 * 1024 * 1024
+CHUNKED_UPLOAD_EXPIRY_HOURS = 24
+
+# Media serving (core_app.views.serve_media). Behind nginx set
+# MEDIA_X_ACCEL_REDIRECT to an `internal` location aliased to MEDIA_ROOT,
+# e.g. "/protected-media/"; behind Apache (mod_xsendfile) set MEDIA_X_SENDFILE.
+# Without either the file is sent by the WSGI server. MEDIA_MAX_AGE is
+# the browser cache lifetime of files that are not content-addressed.
+MEDIA_X_ACCEL_REDIRECT = None
+MEDIA_X_SENDFILE = False
+MEDIA_MAX_AGE = 3600
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -135,11 +240,11 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'core_app.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'core_app.throttling.SlidingWindowAnonRateThrottle',
+        'core_app.throttling.SlidingWindowUserRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/day',
@@ -150,4 +255,14 @@ REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
     ],
+    # orjson-backed JSON when installed, DRF's JSON otherwise (core_app.fastjson)
+    'DEFAULT_RENDERER_CLASSES': [
+        'core_app.fastjson.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core_app.fastjson.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
@@ -17,13 +17,13 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
-from django.conf.urls.static import static
+
+from core_app.views import serve_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path("api/", include("core_app.api.urls")),
     path("api/", include("auth_app.api.urls")),
-    path("api/", include("coderr_app.api.urls"))
-]
-
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+    path("api/", include("coderr_app.api.urls")),
+    path(settings.MEDIA_URL.lstrip("/") + "<path:path>", serve_media, name="media"),
+]
\ No newline at end of file
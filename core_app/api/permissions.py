@@ -0,0 +1,34 @@
+"""Permission classes for core_app API."""
+
+import ipaddress
+import secrets
+
+from django.conf import settings
+from rest_framework.permissions import BasePermission
+
+
+class IsMetricsScraper(BasePermission):
+    """Allow clients from METRICS_ALLOWED_NETWORKS or with METRICS_BEARER_TOKEN.
+
+    The address checked is REMOTE_ADDR, i.e. the direct peer; behind a
+    reverse proxy use the bearer token (or allow the proxy and restrict
+    the location there).
+    """
+
+    message = "Metrics are only available to configured scrapers."
+
+    def has_permission(self, request, view):
+        token = settings.METRICS_BEARER_TOKEN
+        if token:
+            header = request.META.get("HTTP_AUTHORIZATION", "")
+            scheme, _, credentials = header.partition(" ")
+            # Compared as bytes: compare_digest rejects non-ASCII str
+            if scheme.lower() == "bearer" and secrets.compare_digest(
+                credentials.strip().encode(), token.encode()
+            ):
+                return True
+        try:
+            address = ipaddress.ip_address(request.META.get("REMOTE_ADDR", ""))
+        except ValueError:
+            return False
+        return any(address in ipaddress.ip_network(network) for network in settings.METRICS_ALLOWED_NETWORKS)
@@ -0,0 +1,45 @@
+"""Serializers for core_app.api."""
+
+import os
+import re
+
+from django.conf import settings
+from rest_framework import serializers
+
+from core_app.models import ChunkedUpload
+
+SHA256_HEX = re.compile(r'^[0-9a-f]{64}$')
+
+
+class ChunkedUploadSerializer(serializers.ModelSerializer):
+    """Announce an upload (filename, size, checksum) and report its progress."""
+
+    complete = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ChunkedUpload
+        fields = ['id', 'filename', 'size', 'sha256', 'offset', 'complete', 'created_at']
+        read_only_fields = ['id', 'offset', 'created_at']
+
+    def get_complete(self, obj):
+        return obj.completed_at is not None
+
+    def validate_filename(self, value):
+        # Only the base name is kept; storage picks the final path
+        name = os.path.basename(value.replace('\\', '/')).strip()
+        if not name:
+            raise serializers.ValidationError("A file name is required.")
+        return name
+
+    def validate_size(self, value):
+        if not 0 < value <= settings.CHUNKED_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Size must be between 1 and {settings.CHUNKED_UPLOAD_MAX_SIZE} bytes."
+            )
+        return value
+
+    def validate_sha256(self, value):
+        value = value.lower()
+        if not SHA256_HEX.match(value):
+            raise serializers.ValidationError("Expected a hex-encoded SHA-256 digest.")
+        return value
@@ -1,6 +1,10 @@
 from django.urls import path
-from .views import HealthView
+from .views import ChunkedUploadCreateView, ChunkedUploadDetailView, HealthView, MetricsView, ReadyView
 
 urlpatterns = [
    path("health/", HealthView.as_view(), name="health"),
-]
\ No newline at end of file
+   path("metrics/", MetricsView.as_view(), name="metrics"),
+   path("ready/", ReadyView.as_view(), name="ready"),
+   path("uploads/", ChunkedUploadCreateView.as_view(), name="upload-list"),
+   path("uploads/<uuid:pk>/", ChunkedUploadDetailView.as_view(), name="upload-detail"),
+]
@@ -1,9 +1,93 @@
+from django.http import HttpResponse
+from rest_framework import exceptions, generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
+
+from core_app import metrics, readiness, uploads
+from core_app.middleware import SerializerTimingMixin
+from core_app.models import ChunkedUpload
+from .permissions import IsMetricsScraper
+from .serializers import ChunkedUploadSerializer
 
 class HealthView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request, format=None):
-        return Response({"status": "okay"})
\ No newline at end of file
+        return Response({"status": "okay"})
+
+
+class MetricsView(APIView):
+    """Prometheus scrape target; aggregates all worker processes.
+
+    Restricted to METRICS_ALLOWED_NETWORKS and METRICS_BEARER_TOKEN.
+    """
+
+    authentication_classes = []
+    permission_classes = [IsMetricsScraper]
+    # Scrapers poll every few seconds and must never be rate limited
+    throttle_classes = []
+
+    def get(self, request, format=None):
+        return HttpResponse(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+
+class ReadyView(APIView):
+    """Readiness probe: 200 when DB, cache, media and migrations are usable, else 503."""
+
+    permission_classes = [AllowAny]
+    throttle_classes = []
+
+    def get(self, request, format=None):
+        result, age = readiness.get_readiness()
+        data = {
+            "status": "ready" if result["ready"] else "unavailable",
+            "checked_seconds_ago": round(age, 2),
+            "checks": result["checks"],
+        }
+        code = status.HTTP_200_OK if result["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE
+        response = Response(data, status=code)
+        response["Cache-Control"] = "no-store"
+        return response
+
+
+class ChunkedUploadCreateView(SerializerTimingMixin, generics.CreateAPIView):
+    """Start a resumable upload (see core_app.uploads)."""
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = ChunkedUploadSerializer
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+
+class ChunkedUploadDetailView(SerializerTimingMixin, generics.RetrieveDestroyAPIView):
+    """Upload progress (GET), next chunk (PATCH) and cancellation (DELETE)."""
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = ChunkedUploadSerializer
+    chunk_content_type = "application/offset+octet-stream"
+
+    def get_queryset(self):
+        return ChunkedUpload.objects.filter(user=self.request.user)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if isinstance(response.data, dict) and "offset" in response.data:
+            response["Upload-Offset"] = response.data["offset"]
+        return response
+
+    def patch(self, request, *args, **kwargs):
+        # The body is read from request.stream; request.data is never parsed
+        if request.content_type.split(";")[0].strip() != self.chunk_content_type:
+            raise exceptions.UnsupportedMediaType(request.content_type)
+        try:
+            offset = int(request.headers["Upload-Offset"])
+            length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except (KeyError, ValueError):
+            raise exceptions.ValidationError({"detail": "Upload-Offset and Content-Length headers are required."})
+
+        upload = self.get_object()
+        stream = request.stream if length else None
+        upload = uploads.append_chunk(upload, stream, offset, length)
+        return Response(self.get_serializer(upload).data)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CoreAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core_app'
+
+    def ready(self):
+        # Register signal handlers (token authentication cache) and checks
+        from core_app import checks, signals  # noqa: F401
@@ -0,0 +1,70 @@
+"""Token authentication with a short-lived cache.
+
+DRF's `TokenAuthentication` joins the token table on every request, and
+permission checks such as `IsBusinessUser` then load `user.profile` with
+a second query. `CachedTokenAuthentication` keeps only the mapping from
+token to user id in the default cache for `AUTH_TOKEN_CACHE_TTL`
+seconds. A cache hit loads the user and profile by primary key in one
+query, so password, active-flag and profile-type changes are seen on
+the next request; a miss loads token, user and profile in one query.
+
+Cache entries are keyed by a hash of the token, never the token itself,
+and hold no user data. They are dropped (see `core_app.signals`) when
+the token is deleted (logout, key rotation). That only reaches other
+worker processes when the default cache is shared by all of them
+(`CACHES`); `manage.py check --deploy` reports a process-local cache.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from core_app import metrics
+
+
+def token_cache_key(key):
+    return "auth_token:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+def invalidate_token(key):
+    cache.delete(token_cache_key(key))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication resolving the token's user id from the cache."""
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        user_id = cache.get(cache_key)
+        if user_id is None:
+            metrics.CACHE_REQUESTS.inc(cache="auth_token", result="miss")
+            token = self.load_token(key)
+            cache.set(cache_key, token.user_id, settings.AUTH_TOKEN_CACHE_TTL)
+        else:
+            metrics.CACHE_REQUESTS.inc(cache="auth_token", result="hit")
+            token = self.get_model()(key=key, user=self.load_user(key, user_id))
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return (token.user, token)
+
+    def load_token(self, key):
+        """Return the token with its user and the user's profile (or None) loaded."""
+        model = self.get_model()
+        try:
+            return model.objects.select_related('user', 'user__profile').get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+    def load_user(self, key, user_id):
+        """Return the user with the profile loaded, for a cached token."""
+        try:
+            return get_user_model().objects.select_related('profile').get(pk=user_id)
+        except get_user_model().DoesNotExist:
+            invalidate_token(key)
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
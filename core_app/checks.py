@@ -0,0 +1,28 @@
+"""System checks for core_app."""
+
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+PROCESS_LOCAL_CACHES = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_auth_cache(app_configs, **kwargs):
+    """CachedTokenAuthentication must share its cache between worker processes.
+
+    Otherwise a deleted token keeps working in the other processes until
+    AUTH_TOKEN_CACHE_TTL runs out.
+    """
+    authentication = settings.REST_FRAMEWORK.get("DEFAULT_AUTHENTICATION_CLASSES", ())
+    if "core_app.authentication.CachedTokenAuthentication" not in authentication:
+        return []
+    if settings.CACHES["default"]["BACKEND"] not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Error(
+        "CachedTokenAuthentication needs a default cache shared by all worker processes.",
+        hint="Configure CACHES['default'] with a shared backend (e.g. Redis or Memcached).",
+        id="core_app.E001",
+    )]
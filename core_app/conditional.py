@@ -0,0 +1,206 @@
+"""Conditional GET (ETag / Last-Modified) for DRF list and retrieve views.
+
+`ConditionalGetMixin` derives validators from the `updated_at` columns
+instead of the rendered body, so a matching `If-None-Match` (or, for
+single objects, `If-Modified-Since`) is answered with 304 before any
+serializer runs.
+
+List ETags hash the path, the query params (filters, ordering, page),
+the response media type, `MAX()` of each `last_modified_fields` column
+and the row count; the count catches deletions, which do not move
+`MAX(updated_at)`. How the values are obtained depends on pagination:
+
+- page-number pages: one aggregate query (`MAX(...)`, `COUNT(*)`) before
+  the page is read. A 304 costs only that query; otherwise its count is
+  handed to the paginator instead of a separate `COUNT(*)`;
+- unpaginated lists and cursor pages: computed from the fetched rows
+  (plus their primary keys), so no query is added.
+
+Because deletions do not move it, `Last-Modified` is informational on
+lists and `If-Modified-Since` is only evaluated for single objects.
+Object ETags hash the object's `last_modified_fields` and
+`object_fingerprint()` for values that change without touching them.
+Those values have no date, so objects with a fingerprint are only
+answered with 304 for a matching `If-None-Match`.
+
+Views whose lists depend on the requesting user set
+`conditional_per_user` so the user id is part of the list ETag.
+"""
+
+import hashlib
+from datetime import datetime
+
+from django.db.models import Count, Max
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """Add ETag/Last-Modified and 304 handling to `list` and `retrieve`."""
+
+    last_modified_fields = ("updated_at",)
+    conditional_per_user = False
+
+    # --- validators ---
+
+    def list_aggregates(self):
+        aggregates = {f"max_{index}": Max(field) for index, field in enumerate(self.last_modified_fields)}
+        aggregates["count"] = Count("pk")
+        return aggregates
+
+    def aggregate_validators(self, aggregated):
+        """Return (etag, last_modified) from the `list_aggregates()` result."""
+        stamps = [aggregated[f"max_{index}"] for index in range(len(self.last_modified_fields))]
+        return self._list_validators(stamps, [aggregated["count"]])
+
+    def rows_validators(self, rows):
+        """Return (etag, last_modified) for already fetched list rows."""
+        stamps = [
+            self._latest([self._lookup(row, field) for row in rows])
+            for field in self.last_modified_fields
+        ]
+        state = [len(rows), [row.pk for row in rows]]
+        if self.paginator is not None:
+            state.extend(self.paginator.validator_state())
+        return self._list_validators(stamps, state)
+
+    def _list_validators(self, stamps, state):
+        request = self.request
+        parts = [request.path, request.accepted_media_type, *state]
+        if self.conditional_per_user:
+            parts.append(request.user.pk)
+        parts.extend(sorted(request.query_params.lists()))
+        parts.extend(stamps)
+        return self._etag(parts), self._latest(stamps)
+
+    def object_fingerprint(self, obj):
+        """Extra values that change the representation without touching updated_at."""
+        return []
+
+    def object_validators(self, obj):
+        """Return (etag, last_modified, modified_since).
+
+        `modified_since` is what If-Modified-Since is compared with; it is
+        None when the fingerprint adds values Last-Modified does not cover.
+        """
+        stamps = [self._lookup(obj, field) for field in self.last_modified_fields]
+        parts = [type(obj).__name__, obj.pk, self.request.accepted_media_type, *stamps]
+        fingerprint = self.object_fingerprint(obj)
+        parts.extend(fingerprint)
+        last_modified = self._latest(stamps)
+        return self._etag(parts), last_modified, None if fingerprint else last_modified
+
+    @staticmethod
+    def _lookup(obj, path):
+        for name in path.split("__"):
+            obj = getattr(obj, name)
+        return obj
+
+    @staticmethod
+    def _latest(stamps):
+        stamps = [stamp for stamp in stamps if stamp is not None]
+        return max(stamps) if stamps else None
+
+    @staticmethod
+    def _etag(parts):
+        fingerprint = "\x1f".join(
+            part.isoformat() if isinstance(part, datetime) else repr(part) for part in parts
+        )
+        return quote_etag(hashlib.md5(fingerprint.encode("utf-8")).hexdigest())
+
+    def _counts_rows(self):
+        counts_rows = getattr(self.paginator, "counts_rows", None)
+        return counts_rows is not None and counts_rows(self.request)
+
+    # --- evaluation ---
+
+    def not_modified(self, etag, last_modified=None):
+        """Return a 304 response if the request's preconditions match."""
+        request = self.request
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match is not None:
+            matches = parse_etags(if_none_match)
+            if "*" not in matches and etag not in matches:
+                return None
+        elif last_modified is not None:
+            since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+            if since is None or int(last_modified.timestamp()) > since:
+                return None
+        else:
+            return None
+        return Response(status=status.HTTP_304_NOT_MODIFIED)
+
+    @staticmethod
+    def with_validators(response, etag, last_modified):
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified.timestamp())
+        return response
+
+    def _list_response(self, page, rows):
+        serializer = self.get_serializer(page if page is not None else rows, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+    # --- views ---
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = rows = None
+        if self._counts_rows():
+            aggregated = queryset.aggregate(**self.list_aggregates())
+            etag, last_modified = self.aggregate_validators(aggregated)
+            response = self.not_modified(etag)
+            if response is None:
+                self.paginator_count = aggregated["count"]
+                page = self.paginate_queryset(queryset)
+                if page is None:
+                    rows = list(queryset)
+        else:
+            page = self.paginate_queryset(queryset)
+            rows = page if page is not None else list(queryset)
+            etag, last_modified = self.rows_validators(rows)
+            response = self.not_modified(etag)
+        if response is None:
+            response = self._list_response(page, rows)
+        return self.with_validators(response, etag, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified, modified_since = self.object_validators(instance)
+        response = self.not_modified(etag, modified_since)
+        if response is None:
+            response = Response(self.get_serializer(instance).data)
+        return self.with_validators(response, etag, last_modified)
+
+    async def alist(self, request):
+        queryset = await self.afilter_queryset(self.get_queryset())
+        page = rows = None
+        if self._counts_rows():
+            aggregated = await queryset.aaggregate(**self.list_aggregates())
+            etag, last_modified = self.aggregate_validators(aggregated)
+            response = self.not_modified(etag)
+            if response is None:
+                self.paginator_count = aggregated["count"]
+                page = await self.apaginate_queryset(queryset)
+                if page is None:
+                    rows = [obj async for obj in queryset]
+        else:
+            page = await self.apaginate_queryset(queryset)
+            rows = page if page is not None else [obj async for obj in queryset]
+            etag, last_modified = self.rows_validators(rows)
+            response = self.not_modified(etag)
+        if response is None:
+            response = self._list_response(page, rows)
+        return self.with_validators(response, etag, last_modified)
+
+    async def aretrieve(self, request):
+        instance = await self.aget_object()
+        etag, last_modified, modified_since = self.object_validators(instance)
+        response = self.not_modified(etag, modified_since)
+        if response is None:
+            response = Response(self.get_serializer(instance).data)
+        return self.with_validators(response, etag, last_modified)
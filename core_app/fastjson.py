@@ -0,0 +1,76 @@
+"""JSON renderer and parser backed by orjson when it is installed.
+
+`FastJSONRenderer` and `FastJSONParser` are drop-in replacements for
+DRF's `JSONRenderer` and `JSONParser` (see `REST_FRAMEWORK` in
+`core.settings`). orjson is an optional dependency (`pip install
+orjson`); without it both classes behave exactly like DRF's.
+
+The renderer produces the same bytes as DRF's compact JSON output:
+datetimes, dates and times are passed through to DRF's `JSONEncoder`
+(millisecond precision, `Z` for UTC), as are Decimal, lazy strings and
+any other type orjson does not know; `FileField` URLs and `Hyperlink`
+values are plain strings; U+2028/U+2029 are escaped like DRF does. Known
+differences: floats below 1e-4 or from 1e16 are written as `0.00001`
+or `1e16` instead of `1e-05` or `1e+16` (same value), and NaN or
+infinity become `null` where DRF raises. Indented output (the browsable
+API, `indent=` in the Accept header), non-compact or ASCII-only
+settings and anything orjson cannot encode (e.g. integers beyond 64
+bits) fall back to DRF's renderer. The parser hands bodies to DRF's
+parser when orjson rejects them or when they may hold integers beyond
+64 bits.
+"""
+
+import io
+import re
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+# orjson reads integers beyond 64 bits as floats; any run of 20 digits
+# (also inside strings, which only costs the fallback) goes to DRF
+LONG_NUMBER = re.compile(rb'\d{20}')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson when possible."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default, option=orjson.OPT_PASSTHROUGH_DATETIME
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as JSONRenderer: valid JSON, but not valid JavaScript
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser that decodes UTF-8 bodies with orjson when possible."""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', 'utf-8')
+        if orjson is None or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        if LONG_NUMBER.search(body):
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            # DRF's parser reports the error (or accepts what orjson is stricter about)
+            return super().parse(io.BytesIO(body), media_type, parser_context)
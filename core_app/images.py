@@ -0,0 +1,242 @@
+"""Upload pipeline for offer images and profile pictures.
+
+Uploads are validated with Pillow (`validate_image`): the file has to be
+a JPEG, PNG, WebP or GIF image of at most `IMAGE_MAX_PIXELS` pixels.
+
+The original is re-encoded in its own format before it is stored
+(`strip_metadata`, from a pre_save signal): EXIF (GPS, camera, dates),
+XMP and comments are dropped and the EXIF orientation is applied to the
+pixels. JPEGs keep their quantization tables, so quality is unchanged;
+ICC profiles are kept so colours do not shift.
+
+After the upload is committed, `generate_variants` renders every size in
+`IMAGE_VARIANTS` (longest edge in pixels, never upscaled) as WebP and
+JPEG. The EXIF orientation is applied and all metadata (EXIF, GPS, ICC
+profiles, comments) is dropped. Variants are stored under their content
+hash (`images/ab/abcdef....webp`), so identical renditions are written
+once. Their paths are kept in a JSON column next to the image field
+(`Offer.image_variants`, `Profile.file_variants`):
+
+    {"source": "offers/logo.png",
+     "variants": {"thumb": {"webp": "images/..", "jpeg": "images/.."}, ...}}
+
+`source` is the file the variants were made from; `ImageVariantsField`
+only exposes variants whose source is still the current file, so a
+replaced image never shows the old thumbnails while new ones render.
+Writing them sets `variants_updated_at`, which the views include in
+their ETags (`core_app.conditional`).
+
+Rendering is a background task (`core_app.tasks`) so uploads do not
+wait for it.
+"""
+
+import hashlib
+import io
+import logging
+import os
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+from rest_framework import serializers
+
+from core_app.tasks import task
+
+logger = logging.getLogger("core_app.images")
+
+ALLOWED_FORMATS = {"JPEG", "PNG", "WEBP", "GIF"}
+
+# extension -> (Pillow format, save options)
+OUTPUT_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+# Image fields with variants, by model label
+IMAGE_FIELDS = {
+    "coderr_app.Offer": "image",
+    "auth_app.Profile": "file",
+}
+
+INVALID_IMAGE = "Upload a valid image (JPEG, PNG, WebP or GIF)."
+
+# Image.info entries written back when stripping an original; everything
+# else (exif, xmp, comment, ...) is dropped
+KEPT_INFO = {"icc_profile", "transparency", "duration", "loop", "background"}
+
+EXIF_ORIENTATION = 0x0112
+
+IMAGE_ERRORS = (UnidentifiedImageError, OSError, SyntaxError, ValueError, Image.DecompressionBombError)
+
+
+def variants_field(field_name):
+    return f"{field_name}_variants"
+
+
+def validate_image(file):
+    """Serializer validator: reject anything but a supported, reasonably sized image."""
+    try:
+        file.seek(0)
+        with Image.open(file) as image:
+            image_format = image.format
+            width, height = image.size
+            image.verify()
+    except IMAGE_ERRORS:
+        raise serializers.ValidationError(INVALID_IMAGE)
+    finally:
+        file.seek(0)
+    if image_format not in ALLOWED_FORMATS:
+        raise serializers.ValidationError(INVALID_IMAGE)
+    if width * height > settings.IMAGE_MAX_PIXELS:
+        raise serializers.ValidationError(
+            f"Image is too large ({width}x{height}); at most {settings.IMAGE_MAX_PIXELS} pixels are allowed."
+        )
+
+
+def strip_metadata(file):
+    """Return the image in `file` re-encoded in its format without metadata."""
+    with Image.open(file) as image:
+        image_format = image.format
+        options = {}
+        if getattr(image, "n_frames", 1) > 1:
+            options["save_all"] = True
+        elif image.getexif().get(EXIF_ORIENTATION, 1) != 1:
+            image = ImageOps.exif_transpose(image)
+        elif image_format == "JPEG":
+            options.update(quality="keep", subsampling="keep")
+        if image_format == "JPEG" and "quality" not in options:
+            options["quality"] = 95
+        if image_format == "WEBP" and not image.info.get("lossless"):
+            options["quality"] = 90
+        image.info = {key: value for key, value in image.info.items() if key in KEPT_INFO}
+        buffer = io.BytesIO()
+        image.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def strip_original(instance, field_name):
+    """Replace a newly assigned, not yet stored image file by its stripped copy."""
+    file = getattr(instance, field_name)
+    if not file or file._committed:
+        return
+    try:
+        file.seek(0)
+        data = strip_metadata(file.file)
+    except IMAGE_ERRORS as exc:
+        # Not from an API upload (those are validated); store it as it is
+        logger.warning("Could not strip metadata from %s: %s", file.name, exc)
+        return
+    setattr(instance, field_name, ContentFile(data, name=os.path.basename(file.name)))
+
+
+def render_variants(file):
+    """Return `{variant: {extension: bytes}}` for an open image file."""
+    with Image.open(file) as original:
+        image = ImageOps.exif_transpose(original)
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    rendered = {}
+    for name, size in settings.IMAGE_VARIANTS.items():
+        variant = image.copy()
+        variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+        rendered[name] = {}
+        for extension, (image_format, options) in OUTPUT_FORMATS.items():
+            output = variant
+            if image_format == "JPEG" and has_alpha:
+                # JPEG has no alpha channel: flatten onto white
+                output = Image.new("RGB", variant.size, (255, 255, 255))
+                output.paste(variant, mask=variant.getchannel("A"))
+            buffer = io.BytesIO()
+            # No exif/icc_profile arguments: the variants carry no metadata
+            output.save(buffer, image_format, **options)
+            rendered[name][extension] = buffer.getvalue()
+    return rendered
+
+
+def store(data, extension):
+    """Save `data` under its content hash and return the storage name."""
+    digest = hashlib.sha256(data).hexdigest()
+    name = f"images/{digest[:2]}/{digest}.{extension}"
+    if default_storage.exists(name):
+        return name
+    return default_storage.save(name, ContentFile(data))
+
+
+@task(max_attempts=3)
+def generate_variants(label, pk, field_name):
+    """Render and store the variants of one instance's image field."""
+    model = apps.get_model(label)
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return
+    file = getattr(instance, field_name)
+    source = file.name or None
+
+    variants = {}
+    if source:
+        try:
+            with file.open("rb"):
+                rendered = render_variants(file)
+        except IMAGE_ERRORS as exc:
+            # Recorded with no variants so the file is not retried on every save
+            logger.warning("No image variants for %s %s (%s): %s", label, pk, source, exc)
+        else:
+            variants = {
+                name: {extension: store(data, extension) for extension, data in formats.items()}
+                for name, formats in rendered.items()
+            }
+
+    # Only if the file was not replaced meanwhile; variants_updated_at
+    # changes the ETags so clients fetch the new URLs. updated_at is left
+    # alone: it is the owner's last edit and the default offer ordering
+    unchanged = Q(**{field_name: source}) if source else Q(**{field_name: ""}) | Q(**{f"{field_name}__isnull": True})
+    model.objects.filter(unchanged, pk=pk).update(**{
+        variants_field(field_name): {"source": source, "variants": variants} if source else {},
+        "variants_updated_at": timezone.now(),
+    })
+
+
+def schedule_variants(instance, field_name):
+    """Queue rendering of `instance.<field_name>`'s variants (core_app.tasks)."""
+    generate_variants.enqueue(instance._meta.label, instance.pk, field_name)
+
+
+def variants_outdated(instance, field_name):
+    """True if the stored variants were not made from the current file."""
+    stored = getattr(instance, variants_field(field_name)) or {}
+    return (getattr(instance, field_name).name or None) != stored.get("source")
+
+
+class ImageVariantsField(serializers.Field):
+    """Read-only URLs of an image field's variants.
+
+    `{"thumb": {"webp": url, "jpeg": url}, ...}`, absolute when the
+    serializer has a request in its context; `{}` while no current
+    variants exist.
+    """
+
+    def __init__(self, image_field, **kwargs):
+        self.image_field = image_field
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        if variants_outdated(instance, self.image_field):
+            return {}
+        stored = getattr(instance, variants_field(self.image_field)) or {}
+        request = self.context.get("request")
+        return {
+            name: {extension: self.url(path, request) for extension, path in formats.items()}
+            for name, formats in stored.get("variants", {}).items()
+        }
+
+    @staticmethod
+    def url(path, request):
+        url = default_storage.url(path)
+        return request.build_absolute_uri(url) if request is not None else url
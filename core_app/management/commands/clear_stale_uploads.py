@@ -0,0 +1,35 @@
+"""Delete chunked uploads that were never finished or attached.
+
+Usage:
+    python manage.py clear_stale_uploads               # older than CHUNKED_UPLOAD_EXPIRY_HOURS
+    python manage.py clear_stale_uploads --hours 1
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core_app.models import ChunkedUpload
+
+
+class Command(BaseCommand):
+    help = "Delete chunked uploads (and their part files) older than the expiry."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hours",
+            type=float,
+            default=settings.CHUNKED_UPLOAD_EXPIRY_HOURS,
+            help="Age in hours after which an upload is stale.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options["hours"])
+        # Deleted one by one so post_delete removes each part file
+        deleted = 0
+        for upload in ChunkedUpload.objects.filter(created_at__lt=cutoff).iterator():
+            upload.delete()
+            deleted += 1
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} stale upload(s)."))
@@ -0,0 +1,105 @@
+"""Remove media files and blobs that nothing refers to any more.
+
+Usage:
+    python manage.py gc_media              # delete
+    python manage.py gc_media --dry-run    # report only
+
+Files under MEDIA_ROOT that are neither an offer image, a profile file
+nor one of their variants (core_app.images) are deleted once older than
+--min-age hours, which covers images replaced through the API and
+variants of old images. Age is the later of mtime and ctime: a name
+linked to an existing blob keeps the blob's mtime, but linking updates
+the ctime. Blobs of ContentAddressedStorage
+(core_app.storage) left without any name are deleted afterwards, as are
+abandoned temporary files. Hidden files and directories are skipped.
+"""
+
+import os
+import time
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from core_app import images
+from core_app.storage import BLOB_DIR
+
+
+def referenced_names():
+    names = set()
+    for label, field_name in images.IMAGE_FIELDS.items():
+        rows = apps.get_model(label).objects.exclude(**{field_name: ""}).exclude(**{f"{field_name}__isnull": True})
+        for name, stored in rows.values_list(field_name, images.variants_field(field_name)).iterator():
+            names.add(name)
+            for formats in (stored or {}).get("variants", {}).values():
+                names.update(formats.values())
+    return names
+
+
+def last_changed(stat):
+    return max(stat.st_mtime, stat.st_ctime)
+
+
+def walk_files(root):
+    """Yield (relative name, absolute path) of non-hidden files below root."""
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        for filename in filenames:
+            if filename.startswith("."):
+                continue
+            path = os.path.join(directory, filename)
+            yield os.path.relpath(path, root).replace("\\", "/"), path
+
+
+class Command(BaseCommand):
+    help = "Delete unreferenced media files and orphaned deduplicated blobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report what would be deleted.",
+        )
+        parser.add_argument(
+            "--min-age",
+            type=float,
+            default=1.0,
+            help="Hours a file must be old before it is deleted (uploads may not be committed yet).",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        cutoff = time.time() - options["min_age"] * 3600
+        root = default_storage.location
+        if not os.path.isdir(root):
+            self.stdout.write("No media directory.")
+            return
+
+        referenced = referenced_names()
+        files = 0
+        for name, path in walk_files(root):
+            if name in referenced or last_changed(os.stat(path)) > cutoff:
+                continue
+            files += 1
+            if dry_run:
+                self.stdout.write(f"unreferenced: {name}")
+            else:
+                default_storage.delete(name)
+
+        blobs = 0
+        blob_root = os.path.join(root, BLOB_DIR)
+        for directory, _, filenames in os.walk(blob_root):
+            in_tmp = os.path.basename(directory) == "tmp"
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                stat = os.stat(path)
+                # Blobs without names, and temp files of interrupted saves
+                if last_changed(stat) < cutoff and (in_tmp or stat.st_nlink == 1):
+                    blobs += 1
+                    if dry_run:
+                        self.stdout.write(f"orphaned blob: {os.path.relpath(path, root)}")
+                    else:
+                        os.remove(path)
+
+        verb = "Would delete" if dry_run else "Deleted"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {files} unreferenced file(s) and {blobs} blob(s)."))
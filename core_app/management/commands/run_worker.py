@@ -0,0 +1,62 @@
+"""Process background tasks (core_app.tasks) from the database queue.
+
+Usage:
+    python manage.py run_worker            # run until stopped (SIGTERM/SIGINT)
+    python manage.py run_worker --once     # run all due tasks, then exit
+
+Run one or more of these next to the web workers with
+TASK_EXECUTOR = "worker". A stop signal lets the current task finish.
+"""
+
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core_app import tasks
+
+
+class Command(BaseCommand):
+    help = "Run queued background tasks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit when no task is due instead of polling.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.TASK_POLL_INTERVAL,
+            help="Seconds to wait before looking for new tasks when the queue is empty.",
+        )
+        parser.add_argument(
+            "--max-tasks",
+            type=int,
+            default=None,
+            help="Exit after running this many tasks (e.g. to recycle the process).",
+        )
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        if not options["once"]:
+            signal.signal(signal.SIGTERM, self.stop)
+            signal.signal(signal.SIGINT, self.stop)
+
+        ran = 0
+        while not self.stopping and (options["max_tasks"] is None or ran < options["max_tasks"]):
+            close_old_connections()
+            if tasks.run_next():
+                ran += 1
+            elif options["once"]:
+                break
+            else:
+                time.sleep(options["poll_interval"])
+
+        self.stdout.write(self.style.SUCCESS(f"Ran {ran} task(s)."))
+
+    def stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,384 @@
+"""Prometheus metrics collected in-process.
+
+Counters and histograms are plain float cells addressed by a sample key
+(metric name, suffix and label values). Where the cells live depends on
+`METRICS_DIR`:
+
+- unset: a dict in this process (development server, tests);
+- a directory: one memory-mapped file per worker process
+  (`<pid>.db`), written only by that process. `/api/metrics/` sums the
+  cells of all files, so every worker of a multi-process WSGI server is
+  included whichever one serves the scrape. Files of exited workers are
+  kept so counters never go backwards; clear the directory on deploy.
+
+`render()` produces the Prometheus text exposition format (0.0.4).
+"""
+
+import bisect
+import glob
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+
+from django.conf import settings
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# Other method tokens are counted as "other" to bound the label values
+HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CONNECT"})
+
+
+# --- storage -------------------------------------------------------------
+
+class MemoryValues:
+    """Sample cells of a single process."""
+
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, key, amount):
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def items(self):
+        with self._lock:
+            return list(self._values.items())
+
+
+class MmapedValues:
+    """Sample cells in a memory-mapped file owned by one process.
+
+    Layout: an 8-byte header holding the number of used bytes, followed
+    by entries of `<int32 key length><utf-8 key><padding><float64 value>`.
+    The padding keeps every value 8-byte aligned. New entries are written
+    before the header is bumped, so a concurrent reader never sees a
+    partial entry.
+    """
+
+    INITIAL_SIZE = 1 << 16
+    HEADER = struct.Struct("i4x")
+    LENGTH = struct.Struct("i")
+    VALUE = struct.Struct("d")
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a+b")
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._file.truncate(self.INITIAL_SIZE)
+        self._capacity = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), self._capacity)
+        self._positions = {}
+        self._used = self.HEADER.unpack_from(self._map, 0)[0]
+        if self._used == 0:
+            self._used = self.HEADER.size
+            self.HEADER.pack_into(self._map, 0, self._used)
+        for key, _, position in _entries(self._map, self._used):
+            self._positions[key] = position
+
+    def _append(self, key):
+        data = key.encode("utf-8")
+        padding = (8 - (self.LENGTH.size + len(data)) % 8) % 8
+        entry = self.LENGTH.pack(len(data)) + data + b" " * padding + self.VALUE.pack(0.0)
+        while self._used + len(entry) > self._capacity:
+            self._capacity *= 2
+            self._map.close()
+            self._file.truncate(self._capacity)
+            self._map = mmap.mmap(self._file.fileno(), self._capacity)
+        self._map[self._used:self._used + len(entry)] = entry
+        position = self._used + len(entry) - self.VALUE.size
+        self._used += len(entry)
+        self.HEADER.pack_into(self._map, 0, self._used)
+        self._positions[key] = position
+        return position
+
+    def inc(self, key, amount):
+        with self._lock:
+            position = self._positions.get(key)
+            if position is None:
+                position = self._append(key)
+            value = self.VALUE.unpack_from(self._map, position)[0]
+            self.VALUE.pack_into(self._map, position, value + amount)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def _entries(buffer, used):
+    """Yield (key, value, value offset) for the entries of a values file."""
+    offset = MmapedValues.HEADER.size
+    while offset < used:
+        length = MmapedValues.LENGTH.unpack_from(buffer, offset)[0]
+        start = offset + MmapedValues.LENGTH.size
+        key = bytes(buffer[start:start + length]).decode("utf-8")
+        offset = start + length + (8 - (MmapedValues.LENGTH.size + length) % 8) % 8
+        yield key, MmapedValues.VALUE.unpack_from(buffer, offset)[0], offset
+        offset += MmapedValues.VALUE.size
+
+
+def read_values_file(path):
+    """Return the sample cells stored in one values file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < MmapedValues.HEADER.size:
+        return []
+    used = MmapedValues.HEADER.unpack_from(data, 0)[0]
+    return [(key, value) for key, value, _ in _entries(data, min(used, len(data)))]
+
+
+_stores = {}
+_store_lock = threading.Lock()
+
+
+def _metrics_dir():
+    return getattr(settings, "METRICS_DIR", None)
+
+
+def _get_store():
+    """Return this process's store, opening a new one after a fork."""
+    owner = (_metrics_dir(), os.getpid())
+    store = _stores.get(owner)
+    if store is None:
+        with _store_lock:
+            store = _stores.get(owner)
+            if store is None:
+                directory = owner[0]
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                    store = MmapedValues(os.path.join(directory, f"{os.getpid()}.db"))
+                else:
+                    store = MemoryValues()
+                _stores[owner] = store
+    return store
+
+
+def collect():
+    """Return {key: value} summed over every process that reports metrics."""
+    directory = _metrics_dir()
+    if not directory:
+        return dict(_get_store().items())
+    _get_store()
+    totals = {}
+    for path in glob.glob(os.path.join(directory, "*.db")):
+        for key, value in read_values_file(path):
+            totals[key] = totals.get(key, 0.0) + value
+    return totals
+
+
+# --- metric types --------------------------------------------------------
+
+REGISTRY = []
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._keys = {}
+        REGISTRY.append(self)
+
+    def _key(self, suffix, labels, le=None):
+        """Return the storage key of one sample, memoised per label set."""
+        cache_key = (suffix, tuple(labels.items()), le)
+        key = self._keys.get(cache_key)
+        if key is None:
+            if set(labels) != set(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+            values = [str(labels[name]) for name in self.labelnames]
+            key = self._keys[cache_key] = json.dumps([self.name, suffix, values, le])
+        return key
+
+    def samples(self, series, grouped):
+        """Yield (sample name, label pairs, value).
+
+        `series` maps (suffix, label values, le) to this metric's values,
+        `grouped` holds the series of all metrics by name.
+        """
+        raise NotImplementedError
+
+    def expose(self, grouped):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for name, pairs, value in self.samples(grouped.get(self.name, {}), grouped):
+            lines.append(f"{name}{_format_labels(pairs)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        _get_store().inc(self._key("", labels), amount)
+
+    def samples(self, series, grouped):
+        if not series and not self.labelnames:
+            yield self.name, (), 0
+        for (_, values, _), value in sorted(series.items()):
+            yield self.name, tuple(zip(self.labelnames, values)), value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(float(bound) for bound in buckets) + (math.inf,)
+        self._bounds = [_format_value(bound) for bound in self.buckets]
+
+    def observe(self, value, **labels):
+        store = _get_store()
+        index = bisect.bisect_left(self.buckets, value)
+        store.inc(self._key("_bucket", labels, self._bounds[index]), 1)
+        store.inc(self._key("_sum", labels), value)
+        store.inc(self._key("_count", labels), 1)
+
+    def samples(self, series, grouped):
+        label_sets = sorted({values for (_, values, _) in series})
+        for values in label_sets:
+            pairs = tuple(zip(self.labelnames, values))
+            cumulative = 0
+            for bound in self._bounds:
+                cumulative += series.get(("_bucket", values, bound), 0)
+                yield f"{self.name}_bucket", pairs + (("le", bound),), cumulative
+            yield f"{self.name}_sum", pairs, series.get(("_sum", values, None), 0)
+            yield f"{self.name}_count", pairs, series.get(("_count", values, None), 0)
+
+
+class DerivedGauge(Metric):
+    """A gauge computed at scrape time from other metrics' samples."""
+
+    type = "gauge"
+
+    def __init__(self, name, documentation, labelnames, compute):
+        super().__init__(name, documentation, labelnames)
+        self.compute = compute
+
+    def samples(self, series, grouped):
+        for values, value in sorted(self.compute(grouped).items()):
+            yield self.name, tuple(zip(self.labelnames, values)), value
+
+
+def _series_by_metric(collected):
+    grouped = {}
+    for key, value in collected.items():
+        name, suffix, values, le = json.loads(key)
+        grouped.setdefault(name, {})[(suffix, tuple(values), le)] = value
+    return grouped
+
+
+def render():
+    """Return all metrics in the Prometheus text format."""
+    grouped = _series_by_metric(collect())
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.expose(grouped))
+    return "\n".join(lines) + "\n"
+
+
+def get_sample_value(name, **labels):
+    """Return the aggregated value of one counter, or histogram _sum/_count, sample.
+
+    Unseen samples are 0.
+    """
+    grouped = _series_by_metric(collect())
+    metric, suffix = next(
+        (metric, suffix) for metric in REGISTRY for suffix in ("", "_sum", "_count")
+        if metric.name + suffix == name
+    )
+    values = tuple(str(labels[label]) for label in metric.labelnames)
+    return grouped.get(metric.name, {}).get((suffix, values, None), 0)
+
+
+# --- application metrics -------------------------------------------------
+
+REQUESTS = Counter(
+    "coderr_http_requests_total", "HTTP requests by view, method and status.",
+    ["view", "method", "status"],
+)
+REQUEST_DURATION = Histogram(
+    "coderr_http_request_duration_seconds", "Time spent handling a request, per view.", ["view"],
+)
+DB_QUERIES = Histogram(
+    "coderr_db_queries_per_request", "SQL queries executed per request, per view.", ["view"],
+    buckets=QUERY_BUCKETS,
+)
+DB_DURATION = Histogram(
+    "coderr_db_duration_seconds", "Time spent in SQL queries per request, per view.", ["view"],
+)
+THROTTLED = Counter(
+    "coderr_throttle_rejections_total", "Requests rejected by DRF throttling (HTTP 429).", ["view"],
+)
+CACHE_REQUESTS = Counter(
+    "coderr_cache_requests_total", "Lookups in application caches by result (hit/miss).",
+    ["cache", "result"],
+)
+ORDERS_CREATED = Counter("coderr_orders_created_total", "Orders created.")
+REVIEWS_CREATED = Counter("coderr_reviews_created_total", "Reviews created.")
+TASKS = Counter(
+    "coderr_tasks_total", "Background tasks run, by task and result (success/retry/failed).",
+    ["task", "result"],
+)
+TASK_DURATION = Histogram(
+    "coderr_task_duration_seconds", "Time spent running a background task, per task.", ["task"],
+)
+TASK_WAIT = Histogram(
+    "coderr_task_wait_seconds", "Time a background task waited in the queue before its first run.", ["task"],
+    buckets=DEFAULT_BUCKETS + (30.0, 60.0, 300.0),
+)
+
+
+def _cache_hit_ratio(grouped):
+    series = grouped.get(CACHE_REQUESTS.name, {})
+    lookups = {}
+    for (_, (cache, result), _), value in series.items():
+        hits, total = lookups.get(cache, (0, 0))
+        lookups[cache] = (hits + (value if result == "hit" else 0), total + value)
+    return {(cache,): hits / total for cache, (hits, total) in lookups.items() if total}
+
+
+CACHE_HIT_RATIO = DerivedGauge(
+    "coderr_cache_hit_ratio", "Share of application cache lookups that were hits.", ["cache"],
+    _cache_hit_ratio,
+)
+
+
+def method_label(method):
+    """The request method as a label value; unknown tokens become "other"."""
+    return method if method in HTTP_METHODS else "other"
+
+
+def record_request(view, method, status, duration, queries, db_time):
+    """Record one finished request (called by MetricsMiddleware)."""
+    REQUESTS.inc(view=view, method=method_label(method), status=status)
+    REQUEST_DURATION.observe(duration, view=view)
+    DB_QUERIES.observe(queries, view=view)
+    DB_DURATION.observe(db_time, view=view)
+    if status == 429:
+        THROTTLED.inc(view=view)
@@ -0,0 +1,311 @@
+"""Per-request instrumentation.
+
+`MetricsMiddleware` feeds the Prometheus metrics in `core_app.metrics`
+(request counts, latency and query histograms, throttle rejections) for
+every request.
+
+`RequestTimingMiddleware` measures, for a sampled fraction of requests
+(`REQUEST_TIMING_SAMPLE_RATE`):
+
+- the number of SQL queries and the time spent executing them, through
+  `connection.execute_wrapper` (works with DEBUG off);
+- the time spent in DRF serializers, i.e. building `serializer.data`
+  and running `serializer.is_valid()`, for serializers created through
+  `SerializerTimingMixin.get_serializer()` or passed to
+  `timed_serializer()` by the view;
+- the total time spent below the middleware.
+
+The numbers are returned in a `Server-Timing` header (visible in the
+browser's network panel) and logged on the `core_app.timing` logger,
+keyed by the DRF view and action, e.g. `OfferViewSet.list`. Unsampled
+requests only pay for one random() call.
+
+Both middlewares are sync and async capable. Queries are counted by one
+permanent `execute_wrapper` per connection that reports to the counters
+in a context variable, so queries issued by async views (which run in a
+`sync_to_async` worker thread, on that thread's connection) are counted
+as well.
+"""
+
+import contextvars
+import logging
+import random
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from core_app import metrics
+
+logger = logging.getLogger("core_app.timing")
+
+_current = contextvars.ContextVar("request_timing", default=None)
+
+
+_query_counters = contextvars.ContextVar("query_counters", default=())
+
+
+class QueryCounter:
+    """Number of queries and the time spent in them for one request."""
+
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+def _count_queries(execute, sql, params, many, context):
+    counters = _query_counters.get()
+    if not counters:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - start
+        for counter in counters:
+            counter.db_time += elapsed
+            counter.queries += 1
+
+
+def install_query_counting(connection=None, **kwargs):
+    """Add the counting wrapper to `connection`, or this thread's connections.
+
+    Also connected to `connection_created`, which covers the fresh
+    connections opened by `sync_to_async` worker threads.
+    """
+    targets = [connection] if connection is not None else [connections[alias] for alias in connections]
+    for target in targets:
+        if _count_queries not in target.execute_wrappers:
+            # Insert first so execute_wrapper() blocks still pop their own entry
+            target.execute_wrappers.insert(0, _count_queries)
+
+
+connection_created.connect(install_query_counting, dispatch_uid="core_app.query_counting")
+
+
+@contextmanager
+def counting_queries(counter):
+    """Count the queries run in this context into `counter`."""
+    token = _query_counters.set(_query_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _query_counters.reset(token)
+
+
+class RequestTiming(QueryCounter):
+    """Counters for the request currently being measured."""
+
+    __slots__ = ("view", "serializer_time", "serializer_depth")
+
+    def __init__(self):
+        super().__init__()
+        self.view = None
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+
+def _timed_serializer(func):
+    """Add the wall time of `func` to the current request's serializer time.
+
+    Nested calls (a ListSerializer building its children, a nested
+    serializer validating) are only counted once, at the outermost level.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        timing = _current.get()
+        if timing is None:
+            return func(*args, **kwargs)
+        timing.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timing.serializer_depth -= 1
+            if timing.serializer_depth == 0:
+                timing.serializer_time += time.perf_counter() - start
+
+    wrapper._request_timing = True
+    return wrapper
+
+
+_timed_classes = {}
+
+
+def _timed_class(cls):
+    timed = _timed_classes.get(cls)
+    if timed is None:
+        timed = type(cls.__name__, (cls,), {
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+            "_request_timing": True,
+            "data": property(_timed_serializer(cls.data.fget)),
+            "is_valid": _timed_serializer(cls.is_valid),
+        })
+        _timed_classes[cls] = timed
+    return timed
+
+
+def timed_serializer(serializer):
+    """Count `serializer`'s `.data` and `.is_valid()` into the request's serializer time.
+
+    Only sampled requests are affected: the instance is switched to a
+    timing subclass of its own class, so other serializers, and code
+    outside sampled requests, run DRF unchanged.
+    """
+    if _current.get() is not None and not getattr(serializer, "_request_timing", False):
+        serializer.__class__ = _timed_class(type(serializer))
+    return serializer
+
+
+class SerializerTimingMixin:
+    """View mixin: time the serializers returned by `get_serializer()`."""
+
+    def get_serializer(self, *args, **kwargs):
+        return timed_serializer(super().get_serializer(*args, **kwargs))
+
+
+def view_name(view_func, request):
+    """Return "ViewClass.action" for DRF views, the function name otherwise."""
+    select = getattr(view_func, "select_view", None)
+    if select is not None:
+        view_func = select(request)
+    cls = getattr(view_func, "cls", None)
+    if cls is None:
+        return getattr(view_func, "__qualname__", repr(view_func))
+    method = metrics.method_label(request.method).lower()
+    actions = getattr(view_func, "actions", None)
+    if actions:
+        action = actions.get(method, method)
+    else:
+        action = method
+    return f"{cls.__name__}.{action}"
+
+
+class RequestTimingMiddleware:
+    """Emit Server-Timing headers and timing logs for sampled requests."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def _sampled():
+        rate = getattr(settings, "REQUEST_TIMING_SAMPLE_RATE", 0.0)
+        return rate > 0 and (rate >= 1 or random.random() < rate)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+
+        timing = RequestTiming()
+        token = _current.set(timing)
+        start = time.perf_counter()
+        try:
+            with counting_queries(timing):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timing, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+
+        timing = RequestTiming()
+        token = _current.set(timing)
+        start = time.perf_counter()
+        try:
+            with counting_queries(timing):
+                response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timing, time.perf_counter() - start)
+
+    def _finish(self, request, response, timing, total):
+        response["Server-Timing"] = (
+            f'db;dur={timing.db_time * 1000:.2f};desc="{timing.queries} queries", '
+            f"serialize;dur={timing.serializer_time * 1000:.2f}, "
+            f"total;dur={total * 1000:.2f}"
+        )
+        record = {
+            "view": timing.view or "unresolved",
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": timing.queries,
+            "db_ms": round(timing.db_time * 1000, 2),
+            "serializer_ms": round(timing.serializer_time * 1000, 2),
+            "total_ms": round(total * 1000, 2),
+        }
+        logger.info(
+            "%(view)s %(method)s %(status)s total=%(total_ms).2fms db=%(queries)d/%(db_ms).2fms "
+            "serialize=%(serializer_ms).2fms", record, extra={"timing": record},
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timing = _current.get()
+        if timing is not None:
+            timing.view = view_name(view_func, request)
+            install_query_counting()
+        return None
+
+
+class MetricsMiddleware:
+    """Record request count, latency, SQL queries and 429s per view."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with counting_queries(counter):
+            response = self.get_response(request)
+        self._record(request, response, counter, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with counting_queries(counter):
+            response = await self.get_response(request)
+        self._record(request, response, counter, time.perf_counter() - start)
+        return response
+
+    @staticmethod
+    def _record(request, response, counter, duration):
+        metrics.record_request(
+            getattr(request, "_metrics_view", "unresolved"), request.method, response.status_code,
+            duration, counter.queries, counter.db_time,
+        )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics_view = view_name(view_func, request)
+        # Under ASGI, sync process_view runs on the thread that the
+        # request's sync_to_async ORM calls use
+        install_query_counting()
+        return None
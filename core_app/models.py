@@ -1,3 +1,68 @@
+"""core_app.models
+
+Cross-app infrastructure models.
+"""
+
+import uuid
+
+from django.contrib.auth.models import User
 from django.db import models
+from django.utils import timezone
+
+
+class ChunkedUpload(models.Model):
+    """A resumable file upload (see core_app.uploads).
+
+    Chunks are appended to a part file until `offset` reaches `size`;
+    the upload is then checked against `sha256` and `completed_at` set.
+    A completed upload is attached to an offer or profile by its id and
+    deleted once the file has been moved into media storage.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="chunked_uploads")
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    sha256 = models.CharField(max_length=64)
+    offset = models.PositiveBigIntegerField(default=0)
+    completed_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+
+class Task(models.Model):
+    """A queued call of a task function (see core_app.tasks).
+
+    Rows are claimed by setting `status` to running and `locked_until`
+    to the end of the task's visibility timeout; a running row whose
+    lock has expired is claimed again. Succeeded tasks are deleted,
+    failed ones kept with their last error.
+    """
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('failed', 'Failed'),
+    ]
+
+    name = models.CharField(max_length=200)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # The worker's "next due task" lookup
+            models.Index(fields=["status", "run_after"], name="task_due_idx"),
+        ]
 
-# Create your models here.
+    def __str__(self):
+        return f"{self.name} ({self.status})"
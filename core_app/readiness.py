@@ -0,0 +1,129 @@
+"""Readiness checks behind `/api/ready/`.
+
+Unlike the liveness `HealthView`, readiness touches every dependency a
+worker needs to serve traffic:
+
+- database: a `SELECT 1` on a fresh connection;
+- cache: a set/get/delete round trip on the default cache;
+- media: creating and removing a file in `MEDIA_ROOT`;
+- migrations: no unapplied migrations for the default database.
+
+Each check runs in a small thread pool so it can be abandoned after
+`READINESS_CHECK_TIMEOUT` seconds instead of hanging the probe. The
+combined result is memoised per process for `READINESS_CACHE_SECONDS`,
+so frequent load balancer probes do not add load.
+"""
+
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.migrations.executor import MigrationExecutor
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="readiness")
+_lock = threading.Lock()
+_last = None  # (monotonic timestamp, result)
+
+
+def _with_fresh_connection(func):
+    def wrapper():
+        connection = connections["default"]
+        try:
+            return func(connection)
+        finally:
+            # Connections are per thread; do not keep one open in the pool
+            connection.close()
+    return wrapper
+
+
+@_with_fresh_connection
+def check_database(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+
+
+@_with_fresh_connection
+def check_migrations(connection):
+    executor = MigrationExecutor(connection)
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    if plan:
+        names = ", ".join(f"{migration.app_label}.{migration.name}" for migration, _ in plan[:5])
+        raise RuntimeError(f"{len(plan)} unapplied migration(s): {names}")
+
+
+def check_cache():
+    key = f"coderr:ready:{uuid.uuid4().hex}"
+    cache.set(key, "1", timeout=10)
+    try:
+        if cache.get(key) != "1":
+            raise RuntimeError("value written to the cache could not be read back")
+    finally:
+        cache.delete(key)
+
+
+def check_media():
+    with tempfile.NamedTemporaryFile(dir=os.fspath(settings.MEDIA_ROOT), prefix=".ready-") as f:
+        f.write(b"ok")
+        f.flush()
+
+
+CHECKS = {
+    "database": check_database,
+    "cache": check_cache,
+    "media": check_media,
+    "migrations": check_migrations,
+}
+
+
+def _timed(func):
+    start = time.perf_counter()
+    try:
+        func()
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+    else:
+        error = None
+    return time.perf_counter() - start, error
+
+
+def run_checks():
+    """Run all checks concurrently and return {"ready": bool, "checks": {...}}."""
+    timeout = getattr(settings, "READINESS_CHECK_TIMEOUT", 2.0)
+    deadline = time.perf_counter() + timeout
+    futures = {name: _executor.submit(_timed, func) for name, func in CHECKS.items()}
+
+    checks = {}
+    for name, future in futures.items():
+        try:
+            latency, error = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+        except TimeoutError:
+            latency, error = timeout, f"timed out after {timeout}s"
+        checks[name] = {"ok": error is None, "latency_ms": round(latency * 1000, 2)}
+        if error:
+            checks[name]["error"] = error
+    return {"ready": all(check["ok"] for check in checks.values()), "checks": checks}
+
+
+def get_readiness():
+    """Return the memoised readiness result and its age in seconds."""
+    global _last
+    ttl = getattr(settings, "READINESS_CACHE_SECONDS", 5)
+    with _lock:
+        now = time.monotonic()
+        if _last is None or now - _last[0] >= ttl:
+            _last = (now, run_checks())
+        return _last[1], now - _last[0]
+
+
+def reset():
+    """Forget the memoised result (tests, or after fixing a dependency)."""
+    global _last
+    with _lock:
+        _last = None
@@ -0,0 +1,55 @@
+"""Signal handlers for core_app.
+
+Drop cached token authentication entries (`core_app.authentication`)
+when the token is deleted. Entries are dropped right away and again on
+commit, so a request that read the old row before the transaction
+committed cannot keep it cached.
+
+Strip metadata from new offer images and profile pictures and render
+their variants (`core_app.images`) when they are saved, however the
+file was uploaded, and
+remove the part file of a deleted chunked upload (`core_app.uploads`).
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from auth_app.models import Profile
+from coderr_app.models import Offer
+from core_app import authentication, images, uploads
+from core_app.models import ChunkedUpload
+
+
+def _invalidate(func, *args):
+    func(*args)
+    transaction.on_commit(lambda: func(*args))
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    _invalidate(authentication.invalidate_token, instance.key)
+
+
+@receiver(pre_save, sender=Offer)
+@receiver(pre_save, sender=Profile)
+def strip_image_metadata(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    images.strip_original(instance, images.IMAGE_FIELDS[sender._meta.label])
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_save, sender=Profile)
+def schedule_image_variants(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    field_name = images.IMAGE_FIELDS[sender._meta.label]
+    if images.variants_outdated(instance, field_name):
+        images.schedule_variants(instance, field_name)
+
+
+@receiver(post_delete, sender=ChunkedUpload)
+def delete_upload_part(sender, instance, **kwargs):
+    uploads.part_path(instance).unlink(missing_ok=True)
@@ -0,0 +1,130 @@
+"""Deduplicating media storage.
+
+Businesses upload the same logo to many offers; `FileSystemStorage`
+wrote every copy separately. `ContentAddressedStorage` keeps each
+distinct content once, as a blob named by its SHA-256 under
+`MEDIA_ROOT/.blobs/`, and the names the models store (`offers/logo.png`,
+`profile/avatar.jpg`) are hard links to that blob. Names, URLs and
+`serve_media` are unchanged; identical uploads share one inode.
+
+The link count is the reference count: a blob with more than one link
+is still used by some name. `delete(name)` removes the name and, when it
+was the last one, the blob too. `manage.py gc_media` removes blobs that
+lost all their names some other way, plus files no model refers to.
+
+Where hard links are not supported the file is copied instead, which
+only gives up the deduplication.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+
+from core_app.uploads import file_sha256
+
+BLOB_DIR = ".blobs"
+
+
+class ContentAddressedStorage(FileSystemStorage):
+
+    def blob_path(self, digest):
+        return self.path(os.path.join(BLOB_DIR, digest[:2], digest))
+
+    def _makedirs(self, directory):
+        if self.directory_permissions_mode is not None:
+            old_umask = os.umask(0o777 & ~self.directory_permissions_mode)
+            try:
+                os.makedirs(directory, self.directory_permissions_mode, exist_ok=True)
+            finally:
+                os.umask(old_umask)
+        else:
+            os.makedirs(directory, exist_ok=True)
+
+    def _store_blob(self, content):
+        """Write `content` into its blob (unless it exists) and return the blob path."""
+        tmp_dir = self.path(os.path.join(BLOB_DIR, "tmp"))
+        self._makedirs(tmp_dir)
+        if hasattr(content, "temporary_file_path"):
+            source = content.temporary_file_path()
+            digest = file_sha256(source)
+        else:
+            fd, source = tempfile.mkstemp(dir=tmp_dir)
+            digest = hashlib.sha256()
+            with os.fdopen(fd, "wb") as fh:
+                for chunk in content.chunks():
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    digest.update(chunk)
+                    fh.write(chunk)
+            digest = digest.hexdigest()
+
+        blob = self.blob_path(digest)
+        if os.path.exists(blob):
+            # The new link updates the blob's ctime, which gc_media
+            # checks; the mtime (Last-Modified of every name) is kept
+            os.remove(source)
+        else:
+            self._makedirs(os.path.dirname(blob))
+            file_move_safe(source, blob, allow_overwrite=True)
+            if self.file_permissions_mode is not None:
+                os.chmod(blob, self.file_permissions_mode)
+        return blob
+
+    def _link(self, blob, path):
+        try:
+            os.link(blob, path)
+        except FileExistsError:
+            raise
+        except OSError:
+            # No hard links on this filesystem: keep a copy
+            with open(blob, "rb") as src, open(path, "xb") as dst:
+                shutil.copyfileobj(src, dst)
+
+    def _save(self, name, content):
+        blob = self._store_blob(content)
+        full_path = self.path(name)
+        self._makedirs(os.path.dirname(full_path))
+
+        # Like FileSystemStorage: pick another name if this one was taken
+        # between get_available_name() and now
+        while True:
+            try:
+                if self._allow_overwrite and os.path.exists(full_path):
+                    self.delete(name)
+                self._link(blob, full_path)
+            except FileExistsError:
+                name = self.get_available_name(name)
+                full_path = self.path(name)
+            else:
+                break
+
+        name = os.path.relpath(full_path, self.location)
+        self._ensure_location_group_id(full_path)
+        return str(name).replace("\\", "/")
+
+    def delete(self, name):
+        if not name:
+            raise ValueError("The name must be given to delete().")
+        path = self.path(name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return
+        if os.path.isdir(path) or stat.st_nlink != 2:
+            # Shared with other names (or not linked): only drop this name
+            return super().delete(name)
+
+        # Last name of its blob: find the blob by content and drop both
+        blob = self.blob_path(file_sha256(path))
+        super().delete(name)
+        try:
+            blob_stat = os.stat(blob)
+            # Unless a concurrent save has just linked it again
+            if os.path.samestat(blob_stat, stat) and blob_stat.st_nlink == 1:
+                os.remove(blob)
+        except FileNotFoundError:
+            pass
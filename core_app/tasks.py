@@ -0,0 +1,223 @@
+"""Background tasks backed by a database queue.
+
+Slow side effects (rendering image variants, deleting media files) are
+enqueued instead of run in the request:
+
+    @task(max_attempts=3)
+    def delete_media_file(name):
+        ...
+
+    delete_media_file.enqueue("profile/avatar.jpg")
+
+`enqueue()` inserts a `Task` row in the current transaction, so a task
+exists exactly when the surrounding writes commit. Arguments must be
+JSON-serializable; tasks run at least once and must be idempotent.
+
+Who runs the rows depends on `TASK_EXECUTOR`:
+
+- "worker": `manage.py run_worker` processes, polling the table
+  (production; run as many as needed).
+- "thread": a small in-process thread pool, started on commit, plus a
+  poller thread that runs retries and tasks of crashed processes once
+  they are due, like run_worker (development server without a worker).
+- "inline": on commit, in the committing thread, once (tests). Failed
+  tasks stay queued for a worker; nothing retries them in this mode.
+
+A claimed task is locked for its `timeout` (`TASK_VISIBILITY_TIMEOUT` by
+default); if the worker dies, the task is picked up again once the lock
+expires. Failures are retried after `TASK_RETRY_DELAY` seconds, doubled
+per attempt, until `max_attempts`, then kept with status "failed".
+Run counts, durations and queue wait times are exported as metrics.
+"""
+
+import logging
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core_app import metrics
+from core_app.models import Task
+
+logger = logging.getLogger("core_app.tasks")
+
+REGISTRY = {}
+
+
+class TaskFunction:
+    """A function that can be called directly or enqueued."""
+
+    def __init__(self, func, max_attempts, timeout):
+        self.func = func
+        self.name = f"{func.__module__}.{func.__qualname__}"
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.__doc__ = func.__doc__
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, *args, **kwargs):
+        queued = Task.objects.create(
+            name=self.name, args=list(args), kwargs=kwargs, max_attempts=self.max_attempts
+        )
+        transaction.on_commit(partial(dispatch, queued.pk))
+        return queued
+
+    def get_timeout(self):
+        return self.timeout or settings.TASK_VISIBILITY_TIMEOUT
+
+
+def task(max_attempts=3, timeout=None):
+    """Register a module-level function as a task."""
+    def decorator(func):
+        registered = TaskFunction(func, max_attempts, timeout)
+        REGISTRY[registered.name] = registered
+        return registered
+    return decorator
+
+
+def get_task(name):
+    # Tasks register on import; a worker may not have imported the module yet
+    if name not in REGISTRY:
+        import_string(name)
+    return REGISTRY[name]
+
+
+# --- execution -------------------------------------------------------------
+
+def _due(now):
+    return Q(status="queued", run_after__lte=now) | Q(status="running", locked_until__lt=now)
+
+
+def claim(pk=None):
+    """Lock and return the next due task (or task `pk` if due), else None.
+
+    The lock is a conditional UPDATE, so concurrent workers never claim
+    the same row.
+    """
+    now = timezone.now()
+    candidates = Task.objects.filter(_due(now))
+    if pk is not None:
+        candidates = candidates.filter(pk=pk)
+    for candidate_pk, name in candidates.order_by("run_after", "pk").values_list("pk", "name")[:10]:
+        try:
+            timeout = get_task(name).get_timeout()
+        except (ImportError, KeyError):
+            timeout = settings.TASK_VISIBILITY_TIMEOUT
+        claimed = Task.objects.filter(_due(now), pk=candidate_pk).update(
+            status="running", locked_until=now + timedelta(seconds=timeout), attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return Task.objects.get(pk=candidate_pk)
+    return None
+
+
+def execute(claimed):
+    """Run a claimed task and record the outcome; returns the result label."""
+    started = time.perf_counter()
+    wait = (timezone.now() - claimed.run_after).total_seconds()
+    try:
+        if claimed.attempts > claimed.max_attempts:
+            raise TimeoutError(f"No result after {claimed.max_attempts} attempts (visibility timeout)")
+        get_task(claimed.name).func(*claimed.args, **claimed.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        if claimed.attempts < claimed.max_attempts:
+            result = "retry"
+            delay = settings.TASK_RETRY_DELAY * 2 ** (claimed.attempts - 1)
+            Task.objects.filter(pk=claimed.pk).update(
+                status="queued", locked_until=None, last_error=error,
+                run_after=timezone.now() + timedelta(seconds=delay),
+            )
+            logger.warning("Task %s (%s) failed, retrying in %ss", claimed.pk, claimed.name, delay)
+        else:
+            result = "failed"
+            Task.objects.filter(pk=claimed.pk).update(status="failed", locked_until=None, last_error=error)
+            logger.error("Task %s (%s) failed for good:\n%s", claimed.pk, claimed.name, error)
+    else:
+        result = "success"
+        Task.objects.filter(pk=claimed.pk).delete()
+
+    metrics.TASKS.inc(task=claimed.name, result=result)
+    metrics.TASK_DURATION.observe(time.perf_counter() - started, task=claimed.name)
+    if claimed.attempts == 1:
+        metrics.TASK_WAIT.observe(max(wait, 0.0), task=claimed.name)
+    return result
+
+
+def run_next(pk=None):
+    """Claim and run one due task; returns False when there was none."""
+    claimed = claim(pk)
+    if claimed is None:
+        return False
+    execute(claimed)
+    return True
+
+
+def run_pending(limit=None):
+    """Run due tasks until none is left (or `limit` ran); returns how many ran."""
+    count = 0
+    while (limit is None or count < limit) and run_next():
+        count += 1
+    return count
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _run_in_thread(pk):
+    try:
+        run_next(pk)
+    except Exception:
+        logger.exception("Running task %s failed", pk)
+    finally:
+        connections.close_all()
+
+
+def _poll():
+    # Retries and expired locks become due later, without a dispatch
+    while True:
+        time.sleep(settings.TASK_POLL_INTERVAL)
+        try:
+            run_pending()
+        except Exception:
+            logger.exception("Polling the task queue failed")
+        finally:
+            connections.close_all()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tasks")
+            threading.Thread(target=_poll, name="tasks-poller", daemon=True).start()
+    return _executor
+
+
+def dispatch(pk):
+    """Start a committed task according to TASK_EXECUTOR."""
+    if settings.TASK_EXECUTOR == "inline":
+        run_next(pk)
+    elif settings.TASK_EXECUTOR == "thread":
+        _get_executor().submit(_run_in_thread, pk)
+    # "worker": run_worker picks it up
+
+
+# --- tasks -------------------------------------------------------------------
+
+@task()
+def delete_media_file(name):
+    """Delete a file that is no longer referenced from media storage."""
+    default_storage.delete(name)
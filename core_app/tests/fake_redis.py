@@ -0,0 +1,126 @@
+"""In-process stand-in for a Redis server, for the throttling tests.
+
+Speaks RESP over TCP on 127.0.0.1 and implements only what
+`core_app.throttling` sends: AUTH, SELECT, PING, GET, INCR, FLUSHALL and
+EVAL/EVALSHA of `SLIDING_WINDOW_SCRIPT`, which is run by a Python
+equivalent under a lock. Expiry is recorded but not enforced.
+"""
+
+import hashlib
+import socketserver
+import threading
+
+from core_app.throttling import SLIDING_WINDOW_SCRIPT
+
+
+class FakeRedisServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, password=None):
+        super().__init__(("127.0.0.1", 0), FakeRedisHandler)
+        self.password = password
+        self.data = {}
+        self.expiry = {}
+        self.scripts = {}
+        self.commands = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address
+        auth = f":{self.password}@" if self.password else ""
+        return f"redis://{auth}{host}:{port}/1"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def sliding_window(self, keys, args):
+        current_key, previous_key = keys
+        limit, weight, ttl = int(args[0]), float(args[1]), int(args[2])
+        current = int(self.data.get(current_key, 0))
+        previous = int(self.data.get(previous_key, 0))
+        if previous * weight + current + 1 > limit:
+            return [0, current, previous]
+        current += 1
+        self.data[current_key] = str(current).encode()
+        if current == 1:
+            self.expiry[current_key] = ttl
+        return [1, current, previous]
+
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        authenticated = self.server.password is None
+        while True:
+            command = self._read_command()
+            if command is None:
+                return
+            name, args = command[0].upper().decode(), command[1:]
+            self.server.commands.append(name)
+            if name == "AUTH":
+                authenticated = args[-1].decode() == self.server.password
+                self._write("+OK" if authenticated else "-WRONGPASS invalid password")
+            elif not authenticated:
+                self._write("-NOAUTH Authentication required.")
+            else:
+                with self.server.lock:
+                    self._write(self._execute(name, args))
+
+    def _execute(self, name, args):
+        server = self.server
+        if name in ("PING", "SELECT", "FLUSHALL"):
+            if name == "FLUSHALL":
+                server.data.clear()
+            return "+PONG" if name == "PING" else "+OK"
+        if name == "GET":
+            return server.data.get(args[0].decode())
+        if name == "INCR":
+            value = int(server.data.get(args[0].decode(), 0)) + 1
+            server.data[args[0].decode()] = str(value).encode()
+            return value
+        if name in ("EVAL", "EVALSHA"):
+            if name == "EVAL":
+                sha = hashlib.sha1(args[0]).hexdigest()
+                server.scripts[sha] = args[0].decode()
+            else:
+                sha = args[0].decode()
+            if sha not in server.scripts:
+                return "-NOSCRIPT No matching script. Please use EVAL."
+            if server.scripts[sha] != SLIDING_WINDOW_SCRIPT:
+                return "-ERR Unsupported script"
+            count = int(args[1])
+            keys = [key.decode() for key in args[2:2 + count]]
+            return server.sliding_window(keys, [arg.decode() for arg in args[2 + count:]])
+        return f"-ERR unknown command '{name}'"
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        parts = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            parts.append(self.rfile.read(length + 2)[:-2])
+        return parts
+
+    def _write(self, reply):
+        self.wfile.write(self._encode(reply))
+
+    def _encode(self, reply):
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, int):
+            return b":%d\r\n" % reply
+        if isinstance(reply, list):
+            return b"*%d\r\n" % len(reply) + b"".join(self._encode(item) for item in reply)
+        if isinstance(reply, str):
+            # Status and error replies
+            return reply.encode() + b"\r\n"
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
@@ -0,0 +1,43 @@
+"""Small generated images for upload tests (uploads must be real images)."""
+
+import io
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from PIL import Image
+
+CONTENT_TYPES = {"PNG": "image/png", "JPEG": "image/jpeg", "WEBP": "image/webp", "GIF": "image/gif"}
+
+
+def image_bytes(size=(64, 48), image_format="PNG", color=(200, 60, 20), **options):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def image_upload(name, size=(64, 48), **kwargs):
+    image_format = {"jpg": "JPEG", "jpeg": "JPEG"}.get(name.rsplit(".", 1)[-1].lower(),
+                                                       name.rsplit(".", 1)[-1].upper())
+    data = image_bytes(size, image_format, **kwargs)
+    return SimpleUploadedFile(name, data, content_type=CONTENT_TYPES[image_format])
+
+
+class TemporaryMediaMixin:
+    """Store uploads in temporary MEDIA_ROOT/CHUNKED_UPLOAD_DIR directories.
+
+    Applied for the whole class, so files saved in setUpTestData also
+    stay out of the project's media/ directory.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        directories = {}
+        for setting in ("MEDIA_ROOT", "CHUNKED_UPLOAD_DIR"):
+            directories[setting] = tempfile.mkdtemp()
+            cls.addClassCleanup(shutil.rmtree, directories[setting])
+        override = override_settings(**directories)
+        override.enable()
+        cls.addClassCleanup(override.disable)
+        super().setUpClass()
@@ -0,0 +1,119 @@
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory, APITestCase
+from auth_app.models import Profile
+from core_app import metrics
+from core_app.authentication import CachedTokenAuthentication, token_cache_key
+from core_app.checks import check_shared_auth_cache
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="customer_user", email="c@example.com", password="x")
+        cls.profile = Profile.objects.create(user=cls.user, type="customer")
+        cls.token = Token.objects.create(user=cls.user)
+
+    def setUp(self):
+        cache.clear()
+
+    def _authenticate(self, key=None):
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Token {key or self.token.key}")
+        return CachedTokenAuthentication().authenticate(request)
+
+    def test_one_query_with_and_without_cache(self):
+        with self.assertNumQueries(1):
+            user, token = self._authenticate()
+            self.assertEqual(user.profile.type, "customer")
+        with CaptureQueriesContext(connection) as queries:
+            user, token = self._authenticate()
+            self.assertEqual(user.profile.type, "customer")
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("authtoken_token", queries[0]["sql"])
+        self.assertEqual((user.pk, token.key), (self.user.pk, self.token.key))
+
+    def test_cache_holds_only_the_user_id(self):
+        self._authenticate()
+        self.assertEqual(cache.get(token_cache_key(self.token.key)), self.user.pk)
+        self.assertNotIn(self.token.key, "".join(cache._cache))
+
+    def test_user_without_profile(self):
+        staff = User.objects.create_user(username="staff", password="x", is_staff=True)
+        token = Token.objects.create(user=staff)
+        self._authenticate(token.key)
+        with self.assertNumQueries(1):
+            user, _ = self._authenticate(token.key)
+            self.assertFalse(hasattr(user, "profile"))
+
+    def test_invalid_token(self):
+        with self.assertRaises(AuthenticationFailed):
+            self._authenticate("0" * 40)
+
+    def test_deleted_token_is_rejected(self):
+        self._authenticate()
+        self.token.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self._authenticate()
+
+    def test_deleted_user_is_rejected(self):
+        self._authenticate()
+        User.objects.filter(pk=self.user.pk).delete()
+        with self.assertRaises(AuthenticationFailed):
+            self._authenticate()
+
+    def test_password_change_reloads_user(self):
+        self._authenticate()
+        self.user.set_password("new-password")
+        self.user.save()
+        with self.assertNumQueries(1):
+            user, _ = self._authenticate()
+        self.assertTrue(user.check_password("new-password"))
+
+    def test_deactivated_user_is_rejected(self):
+        self._authenticate()
+        # Without signals, e.g. from another process
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        with self.assertRaises(AuthenticationFailed):
+            self._authenticate()
+
+    def test_profile_type_change_is_seen(self):
+        self._authenticate()
+        Profile.objects.filter(pk=self.profile.pk).update(type="business")
+        user, _ = self._authenticate()
+        self.assertEqual(user.profile.type, "business")
+
+    def test_cache_metrics(self):
+        hits = metrics.get_sample_value("coderr_cache_requests_total", cache="auth_token", result="hit")
+        self._authenticate()
+        self._authenticate()
+        self.assertEqual(
+            metrics.get_sample_value("coderr_cache_requests_total", cache="auth_token", result="hit"), hits + 1
+        )
+
+    def test_repeated_api_requests_skip_token_lookup(self):
+        headers = {"Authorization": f"Token {self.token.key}"}
+        sql = []
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as queries:
+                resp = self.client.get(reverse("order-list"), headers=headers)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            sql.append(" ".join(q["sql"] for q in queries))
+        self.assertIn("authtoken_token", sql[0])
+        self.assertNotIn("authtoken_token", sql[1])
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+
+    def test_process_local_cache_is_an_error(self):
+        self.assertEqual([e.id for e in check_shared_auth_cache(None)], ["core_app.E001"])
+        shared = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://"}}
+        with self.settings(CACHES=shared):
+            self.assertEqual(check_shared_auth_cache(None), [])
@@ -0,0 +1,132 @@
+import io
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from unittest import mock, skipIf
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from auth_app.models import Profile
+from coderr_app.models import Offer, OfferDetail
+from coderr_app.seeding import MarketplaceSeeder, SeedConfig
+from core_app import fastjson
+from loadtest import json_bench
+
+PAYLOAD = {
+    "datetime": datetime(2025, 3, 1, 12, 30, 5, 123456, tzinfo=timezone.utc),
+    "naive": datetime(2025, 3, 1, 12, 30),
+    "date": date(2025, 3, 1),
+    "time": time(8, 15, 30, 500000),
+    "timedelta": timedelta(hours=1, seconds=3),
+    "decimal": Decimal("12.50"),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "lazy": gettext_lazy("Not found."),
+    "text": "Zoë \"quoted\" \\ / \x00 \x7f     😀",
+    "floats": [0.1, 4.5, 1.0, -0.0],
+    "nested": [{"a": None, "b": True}, (1, 2)],
+    "big": 2 ** 64,
+}
+
+
+@skipIf(fastjson.orjson is None, "orjson is not installed")
+class FastJSONRendererTests(APITestCase):
+    """FastJSONRenderer writes the same bytes as DRF's JSONRenderer."""
+
+    def assertSameAsDRF(self, data, accepted_media_type=None, renderer_context=None):
+        expected = JSONRenderer().render(data, accepted_media_type, renderer_context)
+        self.assertEqual(
+            fastjson.FastJSONRenderer().render(data, accepted_media_type, renderer_context), expected
+        )
+
+    def test_types_render_like_drf(self):
+        self.assertSameAsDRF(PAYLOAD)
+        for key, value in PAYLOAD.items():
+            self.assertSameAsDRF({key: value})
+
+    def test_indented_output_falls_back(self):
+        self.assertSameAsDRF(PAYLOAD, "application/json; indent=4")
+        self.assertSameAsDRF(PAYLOAD, renderer_context={"indent": 2})
+
+    def test_none_renders_empty(self):
+        self.assertEqual(fastjson.FastJSONRenderer().render(None), b"")
+
+    def test_without_orjson_uses_drf(self):
+        with mock.patch.object(fastjson, "orjson", None):
+            self.assertSameAsDRF(PAYLOAD)
+            data = fastjson.FastJSONParser().parse(io.BytesIO(b'{"a": [1, 2.5]}'))
+        self.assertEqual(data, {"a": [1, 2.5]})
+
+
+@skipIf(fastjson.orjson is None, "orjson is not installed")
+class FastJSONParserTests(APITestCase):
+
+    def _parse(self, body, parser_context=None):
+        return fastjson.FastJSONParser().parse(io.BytesIO(body), parser_context=parser_context)
+
+    def test_parses_like_drf(self):
+        body = '{"a": [1, 2.5, null, true], "b": "Zoë \\u2028", "c": 123456789012345678901234567890}'.encode()
+        self.assertEqual(self._parse(body), JSONParser().parse(io.BytesIO(body)))
+
+    def test_invalid_json_raises_parse_error(self):
+        with self.assertRaises(ParseError):
+            self._parse(b'{"a": ')
+        with self.assertRaises(ParseError):
+            self._parse(b'{"a": NaN}')
+
+    def test_other_encodings_use_drf(self):
+        body = '{"a": "é"}'.encode("latin-1")
+        self.assertEqual(self._parse(body, {"encoding": "latin-1"}), {"a": "é"})
+
+
+class FastJSONApiTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business_user = User.objects.create_user(
+            username="business_user", email="business_user@example.com", password="x"
+        )
+        Profile.objects.create(user=cls.business_user, type="business")
+        cls.offer = Offer.objects.create(
+            user=cls.business_user, title="Logo  ", description="D", image="offers/logo.png"
+        )
+        OfferDetail.objects.create(
+            offer=cls.offer, title="Basic", revisions=1, delivery_time_in_days=3,
+            price=100, features=["A"], offer_type="basic",
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_offer_list_renders_like_drf(self):
+        resp = self.client.get(reverse("offer-list"))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.content, JSONRenderer().render(resp.data))
+        self.assertIn(b'"image":"http://testserver/media/offers/logo.png"', resp.content)
+        self.assertIn(b'\\u2028', resp.content)
+
+    def test_json_body_is_parsed(self):
+        self.client.force_authenticate(self.business_user)
+        resp = self.client.patch(
+            reverse("offer-detail", args=[self.offer.pk]), b'{"title": "Renamed"}',
+            content_type="application/json",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["title"], "Renamed")
+
+        resp = self.client.patch(
+            reverse("offer-detail", args=[self.offer.pk]), b'{"title": ', content_type="application/json",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_benchmark_runs(self):
+        MarketplaceSeeder(SeedConfig(business=2, customers=2, offers_per_business=2, orders=4,
+                                     reviews_per_customer=1, prefix="json")).run()
+        report = json_bench.run(json_bench.fetch_payloads("json", host="testserver"), repeat=1)
+        self.assertEqual([row["payload"] for row in report["payloads"]],
+                         ["offers", "orders", "business profiles"])
@@ -0,0 +1,216 @@
+import io
+import shutil
+import tempfile
+from unittest import mock
+
+from django.urls import reverse
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase
+from auth_app.models import Profile
+from coderr_app.models import Offer
+from core_app import images, tasks
+from core_app.models import Task
+from core_app.tests.images import image_bytes, image_upload
+
+
+def exif_jpeg(size, orientation):
+    exif = Image.Exif()
+    exif[0x0112] = orientation
+    exif[0x010F] = "Test camera"
+    return image_bytes(size, "JPEG", exif=exif.tobytes())
+
+
+class ImagePipelineTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business_user = User.objects.create_user(username="business_user", password="x")
+        cls.profile = Profile.objects.create(user=cls.business_user, type="business")
+        cls.offer = Offer.objects.create(user=cls.business_user, title="Logo", description="D")
+        cls.other_offer = Offer.objects.create(user=cls.business_user, title="Logo 2", description="D")
+
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = self.settings(MEDIA_ROOT=media_root, TASK_EXECUTOR="inline")
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client.force_authenticate(user=self.business_user)
+
+    def _patch_offer(self, offer, upload):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.patch(
+                reverse("offer-detail", args=[offer.pk]), {"image": upload}, format="multipart"
+            )
+
+    def _open(self, url):
+        return Image.open(default_storage.open(url.split("/media/", 1)[1]))
+
+    def test_rejects_files_that_are_not_images(self):
+        upload = SimpleUploadedFile("logo.png", b"not an image", content_type="image/png")
+        resp = self._patch_offer(self.offer, upload)
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("image", resp.data)
+
+        resp = self.client.patch(
+            reverse("profile-detail", args=[self.profile.pk]),
+            {"file": SimpleUploadedFile("cv.pdf", b"%PDF-1.4", content_type="application/pdf")},
+            format="multipart",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("file", resp.data)
+
+    def test_rejects_too_many_pixels(self):
+        with self.settings(IMAGE_MAX_PIXELS=100 * 100):
+            resp = self._patch_offer(self.offer, image_upload("big.png", size=(101, 100)))
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_variants_are_resized_rotated_and_stripped(self):
+        upload = SimpleUploadedFile("photo.jpg", exif_jpeg((1000, 600), orientation=6), content_type="image/jpeg")
+        resp = self._patch_offer(self.offer, upload)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        resp = self.client.get(reverse("offer-detail", args=[self.offer.pk]))
+        variants = resp.data["image_variants"]
+        self.assertEqual(set(variants), {"thumb", "medium"})
+        self.assertEqual(set(variants["thumb"]), {"webp", "jpeg"})
+
+        expected = {"thumb": (192, 320), "medium": (576, 960)}
+        for name, formats in variants.items():
+            for extension, url in formats.items():
+                with self._open(url) as variant:
+                    self.assertEqual(variant.format, images.OUTPUT_FORMATS[extension][0])
+                    self.assertEqual(variant.size, expected[name])
+                    self.assertEqual(len(variant.getexif()), 0)
+                    self.assertNotIn("icc_profile", variant.info)
+
+        # The original is stored rotated and without EXIF
+        self.offer.refresh_from_db()
+        with self.offer.image.open("rb"):
+            original = Image.open(self.offer.image)
+            self.assertEqual(original.size, (600, 1000))
+            self.assertEqual(len(original.getexif()), 0)
+
+    def test_originals_are_stored_without_metadata(self):
+        exif = Image.Exif()
+        exif[0x010F] = "Test camera"
+        uploads = [
+            ("photo.jpg", dict(exif=exif.tobytes(), xmp=b"<gps>53.55,9.99</gps>", comment=b"secret")),
+            ("photo.png", dict(exif=exif.tobytes())),
+            ("photo.webp", dict(exif=exif.tobytes(), xmp=b"<gps>53.55,9.99</gps>")),
+            ("photo.gif", dict(comment=b"secret")),
+        ]
+        for name, options in uploads:
+            with self.subTest(name=name):
+                resp = self._patch_offer(self.offer, image_upload(name, size=(40, 30), **options))
+                self.assertEqual(resp.status_code, status.HTTP_200_OK)
+                self.offer.refresh_from_db()
+                with self.offer.image.open("rb"):
+                    data = self.offer.image.read()
+                for secret in (b"Test camera", b"53.55", b"secret"):
+                    self.assertNotIn(secret, data)
+                stored = Image.open(io.BytesIO(data))
+                self.assertEqual((stored.format, stored.size), (Image.open(image_upload(name)).format, (40, 30)))
+
+    def test_small_images_are_not_upscaled(self):
+        self._patch_offer(self.offer, image_upload("logo.png", size=(64, 48)))
+        self.offer.refresh_from_db()
+        paths = self.offer.image_variants["variants"]
+        # Same rendition for both sizes, stored once under its hash
+        self.assertEqual(paths["thumb"], paths["medium"])
+        with default_storage.open(paths["thumb"]["webp"]) as stored:
+            self.assertEqual(Image.open(stored).size, (64, 48))
+
+    def test_identical_images_share_variants(self):
+        self._patch_offer(self.offer, image_upload("a.png"))
+        self._patch_offer(self.other_offer, image_upload("b.png"))
+        self.offer.refresh_from_db()
+        self.other_offer.refresh_from_db()
+        self.assertNotEqual(self.offer.image.name, self.other_offer.image.name)
+        self.assertEqual(self.offer.image_variants["variants"], self.other_offer.image_variants["variants"])
+
+    def test_variants_change_etags_but_not_updated_at(self):
+        url = reverse("offer-detail", args=[self.offer.pk])
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.client.patch(url, {"image": image_upload("a.png")}, format="multipart")
+        self.offer.refresh_from_db()
+        uploaded = self.offer.updated_at
+        etag = self.client.get(url)["ETag"]
+        list_etag = self.client.get(reverse("offer-list"))["ETag"]
+        for callback in callbacks:
+            callback()
+
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.updated_at, uploaded)
+        self.assertIsNotNone(self.offer.variants_updated_at)
+        resp = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertIn("thumb", resp.data["image_variants"])
+        resp = self.client.get(reverse("offer-list"), headers={"If-None-Match": list_etag})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def test_replaced_image_hides_old_variants(self):
+        self._patch_offer(self.offer, image_upload("a.png"))
+        with self.captureOnCommitCallbacks(execute=False):
+            self.client.patch(
+                reverse("offer-detail", args=[self.offer.pk]),
+                {"image": image_upload("b.png", color=(0, 0, 255))},
+                format="multipart",
+            )
+        resp = self.client.get(reverse("offer-detail", args=[self.offer.pk]))
+        self.assertEqual(resp.data["image_variants"], {})
+
+    def test_stale_job_does_not_overwrite_newer_image(self):
+        render = images.render_variants
+
+        def replace_during_render(file):
+            Offer.objects.filter(pk=self.offer.pk).update(image="offers/newer.png")
+            return render(file)
+
+        with mock.patch.object(images, "render_variants", side_effect=replace_during_render):
+            self._patch_offer(self.offer, image_upload("a.png"))
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.image_variants, {})
+
+    def test_undecodable_file_is_recorded_without_variants(self):
+        self.offer.image = SimpleUploadedFile("broken.png", b"broken", content_type="image/png")
+        with self.assertLogs("core_app.images", "WARNING"):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.offer.save()
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.image_variants, {"source": self.offer.image.name, "variants": {}})
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.offer.save()
+        self.assertEqual(callbacks, [])
+
+    def test_profile_picture_variants(self):
+        url = reverse("profile-detail", args=[self.profile.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.patch(url, {"file": image_upload("avatar.jpg")}, format="multipart")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        resp = self.client.get(url)
+        self.assertTrue(resp.data["file_variants"]["thumb"]["webp"].startswith("http://testserver/media/images/"))
+        resp = self.client.get(reverse("profile-business-list"))
+        self.assertIn("thumb", resp.data[0]["file_variants"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(url, {"file": ""}, format="multipart")
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.file_variants, {})
+
+    def test_rendered_by_worker(self):
+        with self.settings(TASK_EXECUTOR="worker"):
+            self._patch_offer(self.offer, image_upload("a.png"))
+        queued = Task.objects.get()
+        self.assertEqual((queued.name, queued.args), ("core_app.images.generate_variants",
+                                                     ["coderr_app.Offer", self.offer.pk, "image"]))
+        self.assertEqual(tasks.run_pending(), 1)
+        self.offer.refresh_from_db()
+        self.assertIn("thumb", self.offer.image_variants["variants"])
@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+from urllib.parse import unquote
+
+from django.test import SimpleTestCase
+from django.utils.http import http_date
+
+IMAGE_NAME = "images/ab/" + "ab" * 32 + ".webp"
+
+
+class MediaServingTests(SimpleTestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = self.settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        for name, content in (("offers/logo.png", b"png bytes"), (IMAGE_NAME, b"webp bytes"),
+                              ("offers/.hidden", b"secret"), ("offers/Über logo.png", b"umlaut")):
+            path = os.path.join(self.media_root, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as fh:
+                fh.write(content)
+
+    def test_file_response(self):
+        resp = self.client.get("/media/offers/logo.png")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(b"".join(resp.streaming_content), b"png bytes")
+        self.assertEqual(resp["Content-Type"], "image/png")
+        self.assertEqual(resp["Content-Length"], "9")
+        self.assertEqual(resp["Cache-Control"], "public, max-age=3600")
+        self.assertIn("Last-Modified", resp)
+
+    def test_content_addressed_files_are_immutable(self):
+        resp = self.client.get("/media/" + IMAGE_NAME)
+        self.assertEqual(resp["Cache-Control"], "public, max-age=31536000, immutable")
+
+    def test_not_modified(self):
+        mtime = os.stat(os.path.join(self.media_root, "offers/logo.png")).st_mtime
+        resp = self.client.get("/media/offers/logo.png", headers={"If-Modified-Since": http_date(mtime)})
+        self.assertEqual(resp.status_code, 304)
+
+    def test_missing_hidden_and_outside_files(self):
+        for path in ("/media/offers/missing.png", "/media/offers/.hidden", "/media/offers",
+                     "/media/..%2Fmanage.py", "/media/offers/../../manage.py"):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path).status_code, 404)
+
+    def test_only_safe_methods(self):
+        self.assertEqual(self.client.post("/media/offers/logo.png").status_code, 405)
+        self.assertEqual(self.client.head("/media/offers/logo.png").status_code, 200)
+
+    def test_x_accel_redirect(self):
+        with self.settings(MEDIA_X_ACCEL_REDIRECT="/protected-media/"):
+            resp = self.client.get("/media/" + IMAGE_NAME)
+        self.assertEqual(resp["X-Accel-Redirect"], "/protected-media/" + IMAGE_NAME)
+        self.assertEqual(resp.content, b"")
+        self.assertNotIn("Content-Type", resp)
+        self.assertIn("immutable", resp["Cache-Control"])
+
+    def test_x_sendfile(self):
+        with self.settings(MEDIA_X_SENDFILE=True):
+            resp = self.client.get("/media/offers/logo.png")
+        self.assertEqual(resp["X-Sendfile"], os.path.join(os.path.realpath(self.media_root), "offers/logo.png"))
+        self.assertEqual(resp["Content-Type"], "image/png")
+        self.assertEqual(resp.content, b"")
+
+    def test_non_ascii_names_are_percent_encoded(self):
+        with self.settings(MEDIA_X_ACCEL_REDIRECT="/protected-media/"):
+            resp = self.client.get("/media/offers/%C3%9Cber%20logo.png")
+        self.assertEqual(resp["X-Accel-Redirect"], "/protected-media/offers/%C3%9Cber%20logo.png")
+
+        with self.settings(MEDIA_X_SENDFILE=True):
+            resp = self.client.get("/media/offers/%C3%9Cber%20logo.png")
+        self.assertEqual(
+            unquote(resp["X-Sendfile"]), os.path.join(os.path.realpath(self.media_root), "offers/Über logo.png")
+        )
+        self.assertTrue(resp["X-Sendfile"].isascii())
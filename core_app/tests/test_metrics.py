@@ -0,0 +1,194 @@
+import os
+import re
+import tempfile
+from unittest import mock
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from auth_app.models import Profile
+from coderr_app.models import Offer, OfferDetail, Order, Review
+from core_app import metrics
+from core_app.throttling import SlidingWindowAnonRateThrottle
+
+
+def sample(text, name, **labels):
+    """Return the value of one sample line in an exposition, or None."""
+    label_text = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    pattern = "^" + re.escape(name + (f"{{{label_text}}}" if labels else "")) + r" (\S+)$"
+    match = re.search(pattern, text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+class MetricsEndpointTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business_user = User.objects.create_user(
+            username="business_user", email="business_user@example.com", password="x"
+        )
+        Profile.objects.create(user=cls.business_user, type="business")
+        cls.customer_user = User.objects.create_user(
+            username="customer_user", email="customer_user@example.com", password="x"
+        )
+        Profile.objects.create(user=cls.customer_user, type="customer")
+        offer = Offer.objects.create(user=cls.business_user, title="Logo", description="D")
+        cls.detail = OfferDetail.objects.create(
+            offer=offer, title="Basic", revisions=1, delivery_time_in_days=3,
+            price=100, features=["A"], offer_type="basic",
+        )
+        cls.url = reverse("metrics")
+
+    def setUp(self):
+        cache.clear()
+
+    def _scrape(self):
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp["Content-Type"], metrics.CONTENT_TYPE)
+        return resp.content.decode()
+
+    def test_exposition_format(self):
+        text = self._scrape()
+        for metric in metrics.REGISTRY:
+            self.assertIn(f"# TYPE {metric.name} {metric.type}\n", text)
+        self.assertIsNotNone(sample(text, "coderr_orders_created_total"))
+
+    def test_restricted_to_allowed_networks(self):
+        with self.settings(METRICS_ALLOWED_NETWORKS=["10.0.0.0/8"]):
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+            resp = self.client.get(self.url, REMOTE_ADDR="10.1.2.3")
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    @override_settings(METRICS_ALLOWED_NETWORKS=[], METRICS_BEARER_TOKEN="scrape-secret")
+    def test_bearer_token(self):
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+        resp = self.client.get(self.url, HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+        resp = self.client.get(self.url, HTTP_AUTHORIZATION="Bearer sécret")
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+        resp = self.client.get(self.url, HTTP_AUTHORIZATION="Bearer scrape-secret")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def test_requests_and_latency_per_view(self):
+        labels = {"view": "OfferViewSet.list", "method": "GET", "status": "200"}
+        before = metrics.get_sample_value("coderr_http_requests_total", **labels)
+        for _ in range(3):
+            self.client.get(reverse("offer-list"))
+        text = self._scrape()
+
+        self.assertEqual(sample(text, "coderr_http_requests_total", **labels), before + 3)
+        count = sample(text, "coderr_http_request_duration_seconds_count", view="OfferViewSet.list")
+        self.assertEqual(
+            sample(text, "coderr_http_request_duration_seconds_bucket", view="OfferViewSet.list", le="+Inf"),
+            count,
+        )
+        self.assertGreaterEqual(
+            sample(text, "coderr_db_queries_per_request_sum", view="OfferViewSet.list"), 3
+        )
+        buckets = [
+            float(value) for value in re.findall(
+                r'^coderr_db_queries_per_request_bucket\{view="OfferViewSet\.list",le="[^"]+"\} (\S+)$',
+                text, re.MULTILINE,
+            )
+        ]
+        self.assertEqual(buckets, sorted(buckets))
+
+    def test_unknown_methods_share_one_label(self):
+        resp = self.client.generic("FOO", reverse("offer-list"))
+        labels = {"view": "OfferViewSet.other", "method": "other", "status": str(resp.status_code)}
+        before = metrics.get_sample_value("coderr_http_requests_total", **labels)
+        self.client.generic("BAR", reverse("offer-list"))
+        text = self._scrape()
+        self.assertEqual(sample(text, "coderr_http_requests_total", **labels), before + 1)
+        self.assertNotIn('method="BAR"', text)
+        self.assertNotIn("OfferViewSet.bar", text)
+
+    def test_throttle_rejections(self):
+        before = metrics.get_sample_value("coderr_throttle_rejections_total", view="BaseInfoAPIView.get")
+        with mock.patch.object(SlidingWindowAnonRateThrottle, "allow_request", return_value=False), \
+                mock.patch.object(SlidingWindowAnonRateThrottle, "wait", return_value=60):
+            resp = self.client.get(reverse("base-info"))
+        self.assertEqual(resp.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(
+            metrics.get_sample_value("coderr_throttle_rejections_total", view="BaseInfoAPIView.get"),
+            before + 1,
+        )
+
+    def test_metrics_endpoint_is_not_throttled(self):
+        with mock.patch.object(SlidingWindowAnonRateThrottle, "allow_request", return_value=False):
+            self._scrape()
+
+    def test_cache_hit_ratio(self):
+        hits = metrics.get_sample_value("coderr_cache_requests_total", cache="base_info", result="hit")
+        misses = metrics.get_sample_value("coderr_cache_requests_total", cache="base_info", result="miss")
+        self.client.get(reverse("base-info"))
+        self.client.get(reverse("base-info"))
+        text = self._scrape()
+        self.assertEqual(sample(text, "coderr_cache_requests_total", cache="base_info", result="miss"), misses + 1)
+        self.assertEqual(sample(text, "coderr_cache_requests_total", cache="base_info", result="hit"), hits + 1)
+        self.assertAlmostEqual(
+            sample(text, "coderr_cache_hit_ratio", cache="base_info"), (hits + 1) / (hits + misses + 2)
+        )
+
+    def test_order_and_review_creation(self):
+        orders = metrics.get_sample_value("coderr_orders_created_total")
+        reviews = metrics.get_sample_value("coderr_reviews_created_total")
+        with self.captureOnCommitCallbacks(execute=True):
+            Order.objects.create(
+                customer_user=self.customer_user, business_user=self.business_user,
+                offer_detail=self.detail,
+            )
+            Review.objects.create(
+                business_user=self.business_user, reviewer=self.customer_user, rating=5, description="Ok"
+            )
+        self.assertEqual(metrics.get_sample_value("coderr_orders_created_total"), orders + 1)
+        self.assertEqual(metrics.get_sample_value("coderr_reviews_created_total"), reviews + 1)
+
+
+class MultiProcessMetricsTests(SimpleTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_values_file_round_trip_and_growth(self):
+        path = os.path.join(self.directory.name, "1.db")
+        values = metrics.MmapedValues(path)
+        keys = [f"key-{number}-" + "x" * 100 for number in range(1000)]
+        for key in keys:
+            values.inc(key, 1.5)
+        values.inc(keys[0], 1)
+        values.close()
+
+        stored = dict(metrics.read_values_file(path))
+        self.assertEqual(len(stored), 1000)
+        self.assertEqual(stored[keys[0]], 2.5)
+        self.assertGreater(os.path.getsize(path), metrics.MmapedValues.INITIAL_SIZE)
+
+        reopened = metrics.MmapedValues(path)
+        reopened.inc(keys[1], 1)
+        reopened.close()
+        self.assertEqual(dict(metrics.read_values_file(path))[keys[1]], 2.5)
+
+    def test_scrape_sums_all_worker_files(self):
+        with override_settings(METRICS_DIR=self.directory.name):
+            metrics.ORDERS_CREATED.inc(2)
+            metrics.REQUEST_DURATION.observe(0.02, view="OfferViewSet.list")
+
+            # Another worker process writing its own file
+            other = metrics.MmapedValues(os.path.join(self.directory.name, "999999.db"))
+            other.inc(metrics.ORDERS_CREATED._key("", {}), 3)
+            other.inc(metrics.REQUEST_DURATION._key("_count", {"view": "OfferViewSet.list"}), 1)
+            other.close()
+
+            text = metrics.render()
+        self.assertEqual(sample(text, "coderr_orders_created_total"), 5)
+        self.assertEqual(
+            sample(text, "coderr_http_request_duration_seconds_count", view="OfferViewSet.list"), 2
+        )
+        self.assertEqual(
+            sample(text, "coderr_http_request_duration_seconds_bucket", view="OfferViewSet.list", le="0.025"), 1
+        )
@@ -0,0 +1,97 @@
+import re
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from django.test import override_settings
+from rest_framework import serializers, status
+from rest_framework.test import APITestCase
+from auth_app.models import Profile
+from coderr_app.models import Offer, OfferDetail
+
+SERVER_TIMING = re.compile(
+    r'^db;dur=(?P<db>[\d.]+);desc="(?P<queries>\d+) queries", '
+    r"serialize;dur=(?P<serialize>[\d.]+), total;dur=(?P<total>[\d.]+)$"
+)
+
+
+@override_settings(REQUEST_TIMING_SAMPLE_RATE=1.0)
+class RequestTimingMiddlewareTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business_user = User.objects.create_user(
+            username="business_user", email="business_user@example.com", password="x"
+        )
+        Profile.objects.create(user=cls.business_user, type="business")
+        for number in range(3):
+            offer = Offer.objects.create(user=cls.business_user, title=f"Offer {number}", description="D")
+            OfferDetail.objects.create(
+                offer=offer, title="Basic", revisions=1, delivery_time_in_days=3,
+                price=100, features=["A"], offer_type="basic",
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def _timing(self, resp):
+        match = SERVER_TIMING.match(resp["Server-Timing"])
+        self.assertIsNotNone(match, resp["Server-Timing"])
+        return match
+
+    def test_server_timing_header(self):
+        with self.assertLogs("core_app.timing", level="INFO") as logs:
+            resp = self.client.get(reverse("offer-list"))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        timing = self._timing(resp)
+        self.assertGreater(int(timing["queries"]), 0)
+        self.assertGreater(float(timing["serialize"]), 0)
+        self.assertGreaterEqual(float(timing["total"]), float(timing["db"]) + float(timing["serialize"]))
+
+        record = logs.records[0].timing
+        self.assertEqual(record["view"], "OfferViewSet.list")
+        self.assertEqual(record["status"], 200)
+        self.assertEqual(record["queries"], int(timing["queries"]))
+        self.assertTrue(logs.output[0].startswith("INFO:core_app.timing:OfferViewSet.list GET 200"))
+
+    def test_view_names(self):
+        self.client.force_authenticate(self.business_user)
+        offer = Offer.objects.first()
+        cases = [
+            ("get", reverse("offer-detail", args=[offer.id]), None, "OfferViewSet.retrieve"),
+            ("post", reverse("offer-bulk"), [], "OfferViewSet.bulk"),
+            ("get", reverse("base-info"), None, "BaseInfoAPIView.get"),
+            ("get", "/api/does-not-exist/", None, "unresolved"),
+        ]
+        for method, url, data, expected in cases:
+            with self.subTest(url=url), self.assertLogs("core_app.timing", level="INFO") as logs:
+                getattr(self.client, method)(url, data, format="json")
+            self.assertEqual(logs.records[0].timing["view"], expected)
+
+    def test_write_requests_count_validation_time(self):
+        self.client.force_authenticate(self.business_user)
+        offer = Offer.objects.first()
+        resp = self.client.patch(reverse("offer-detail", args=[offer.id]), {"title": "New"}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertGreater(float(self._timing(resp)["serialize"]), 0)
+
+    def test_drf_is_not_patched(self):
+        self.client.get(reverse("offer-list"))
+        base = serializers.BaseSerializer
+        self.assertNotIn("_request_timing", vars(base.is_valid))
+        self.assertNotIn("_request_timing", vars(base.data.fget))
+        self.assertFalse(getattr(serializers.Serializer(data={}), "_request_timing", False))
+
+    def test_serializers_built_by_the_view_are_timed(self):
+        resp = self.client.post(reverse("registration"), {
+            "username": "new_user", "email": "new_user@example.com", "password": "secret123",
+            "repeated_password": "secret123", "type": "customer",
+        }, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertGreater(float(self._timing(resp)["serialize"]), 0)
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_untouched(self):
+        with self.assertNoLogs("core_app.timing"):
+            resp = self.client.get(reverse("offer-list"))
+        self.assertNotIn("Server-Timing", resp)
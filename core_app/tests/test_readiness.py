@@ -0,0 +1,76 @@
+import tempfile
+import time
+from types import SimpleNamespace
+from unittest import mock
+from django.urls import reverse
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.migrations.executor import MigrationExecutor
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from core_app import readiness
+
+
+class ReadyViewTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        readiness.reset()
+        self.addCleanup(readiness.reset)
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.media_root = media.name
+        self.url = reverse("ready")
+
+    def _get(self, expected_status=status.HTTP_200_OK):
+        with override_settings(MEDIA_ROOT=self.media_root):
+            resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, expected_status, resp.data)
+        return resp.data
+
+    def test_get_200_all_checks_pass(self):
+        data = self._get()
+        self.assertEqual(data["status"], "ready")
+        self.assertEqual(list(data["checks"]), ["database", "cache", "media", "migrations"])
+        for check in data["checks"].values():
+            self.assertTrue(check["ok"])
+            self.assertGreaterEqual(check["latency_ms"], 0)
+
+    def test_result_is_reused_within_ttl(self):
+        calls = []
+        checks = {"database": lambda: calls.append(1)}
+        with mock.patch.dict(readiness.CHECKS, checks, clear=True):
+            self._get()
+            data = self._get()
+            self.assertEqual(len(calls), 1)
+            self.assertGreaterEqual(data["checked_seconds_ago"], 0)
+
+            with override_settings(READINESS_CACHE_SECONDS=0):
+                self._get()
+        self.assertEqual(len(calls), 2)
+
+    def test_get_503_media_not_writable(self):
+        self.media_root = f"{self.media_root}/missing"
+        data = self._get(status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(data["status"], "unavailable")
+        self.assertFalse(data["checks"]["media"]["ok"])
+        self.assertIn("FileNotFoundError", data["checks"]["media"]["error"])
+        self.assertTrue(data["checks"]["database"]["ok"])
+
+    def test_get_503_check_timeout(self):
+        with mock.patch.dict(readiness.CHECKS, {"database": lambda: time.sleep(0.5)}, clear=True), \
+                override_settings(READINESS_CHECK_TIMEOUT=0.05):
+            data = self._get(status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(data["checks"]["database"]["error"], "timed out after 0.05s")
+
+    def test_get_503_unapplied_migrations(self):
+        pending = [(SimpleNamespace(app_label="coderr_app", name="0002_offer_summary"), False)]
+        with mock.patch.object(MigrationExecutor, "migration_plan", return_value=pending):
+            data = self._get(status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn("coderr_app.0002_offer_summary", data["checks"]["migrations"]["error"])
+
+    def test_get_503_cache_unreachable(self):
+        with mock.patch.object(LocMemCache, "get", return_value=None):
+            data = self._get(status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(data["checks"]["cache"]["ok"])
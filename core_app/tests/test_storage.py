@@ -0,0 +1,186 @@
+import os
+import shutil
+import tempfile
+import time
+from io import StringIO
+from unittest import mock
+
+from django.urls import reverse
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+from auth_app.models import Profile
+from coderr_app.models import Offer
+from core_app.management.commands import gc_media
+from core_app.storage import BLOB_DIR, ContentAddressedStorage
+from core_app.tests.images import image_upload
+
+
+class TempMediaRootMixin:
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = self.settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def blobs(self):
+        root = os.path.join(self.media_root, BLOB_DIR)
+        return sorted(
+            os.path.join(directory, name)
+            for directory, _, names in os.walk(root) if os.path.basename(directory) != "tmp"
+            for name in names
+        )
+
+    def age(self, name, hours=2):
+        # The ctime cannot be set; gc_media sees this inode (and so every
+        # name of its blob) as last changed `hours` ago
+        if not hasattr(self, "aged"):
+            self.aged = {}
+            real = gc_media.last_changed
+            patcher = mock.patch.object(
+                gc_media, "last_changed", lambda stat: self.aged.get(stat.st_ino) or real(stat)
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.aged[os.stat(os.path.join(self.media_root, name)).st_ino] = time.time() - hours * 3600
+
+
+class ContentAddressedStorageTests(TempMediaRootMixin, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.storage = ContentAddressedStorage()
+
+    def test_identical_files_share_one_blob(self):
+        first = self.storage.save("offers/logo.png", ContentFile(b"logo"))
+        second = self.storage.save("offers/logo.png", ContentFile(b"logo"))
+        other = self.storage.save("profile/logo.png", ContentFile(b"other"))
+        self.assertNotEqual(first, second)
+        self.assertTrue(os.path.samefile(self.storage.path(first), self.storage.path(second)))
+        self.assertEqual(len(self.blobs()), 2)
+        self.assertEqual(os.stat(self.storage.path(first)).st_nlink, 3)
+        with self.storage.open(other) as fh:
+            self.assertEqual(fh.read(), b"other")
+
+    def test_reuse_keeps_the_mtime_of_existing_names(self):
+        first = self.storage.save("offers/logo.png", ContentFile(b"logo"))
+        past = time.time() - 3600
+        os.utime(self.storage.path(first), (past, past))
+        second = self.storage.save("offers/logo.png", ContentFile(b"logo"))
+        self.assertAlmostEqual(os.stat(self.storage.path(first)).st_mtime, past, places=3)
+        # Linking changed the inode, so gc_media sees the new name as recent
+        self.assertGreater(gc_media.last_changed(os.stat(self.storage.path(second))), past)
+
+    def test_blob_is_removed_with_its_last_name(self):
+        first = self.storage.save("offers/logo.png", ContentFile(b"logo"))
+        second = self.storage.save("offers/logo.png", ContentFile(b"logo"))
+        self.storage.delete(first)
+        self.assertFalse(self.storage.exists(first))
+        with self.storage.open(second) as fh:
+            self.assertEqual(fh.read(), b"logo")
+        self.assertEqual(len(self.blobs()), 1)
+
+        self.storage.delete(second)
+        self.assertEqual(self.blobs(), [])
+        self.storage.delete(second)
+
+    def test_temporary_files_are_moved(self):
+        path = os.path.join(self.media_root, "upload.part")
+        with open(path, "wb") as fh:
+            fh.write(b"chunked")
+        content = ContentFile(b"", name="logo.png")
+        content.temporary_file_path = lambda: path
+        name = self.storage.save("offers/logo.png", content)
+        self.assertFalse(os.path.exists(path))
+        with self.storage.open(name) as fh:
+            self.assertEqual(fh.read(), b"chunked")
+
+    def test_copies_without_hard_links(self):
+        with mock.patch("core_app.storage.os.link", side_effect=PermissionError):
+            name = self.storage.save("offers/logo.png", ContentFile(b"logo"))
+        self.assertEqual(os.stat(self.storage.path(name)).st_nlink, 1)
+        with self.storage.open(name) as fh:
+            self.assertEqual(fh.read(), b"logo")
+        # Deleting the copy leaves the blob to gc_media
+        self.storage.delete(name)
+        self.assertEqual(len(self.blobs()), 1)
+
+
+class MediaDeduplicationTests(TempMediaRootMixin, APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business_user = User.objects.create_user(username="business_user", password="x")
+        Profile.objects.create(user=cls.business_user, type="business")
+        cls.offers = [
+            Offer.objects.create(user=cls.business_user, title=f"Offer {number}", description="D")
+            for number in range(2)
+        ]
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.client.force_authenticate(user=self.business_user)
+
+    def _gc(self, *args):
+        out = StringIO()
+        call_command("gc_media", *args, stdout=out)
+        return out.getvalue()
+
+    def test_same_logo_on_many_offers_is_stored_once(self):
+        for offer in self.offers:
+            resp = self.client.patch(
+                reverse("offer-detail", args=[offer.pk]), {"image": image_upload("logo.png")}, format="multipart"
+            )
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        first, second = (Offer.objects.get(pk=offer.pk).image for offer in self.offers)
+        self.assertNotEqual(first.name, second.name)
+        self.assertTrue(os.path.samefile(first.path, second.path))
+        self.assertEqual(len(self.blobs()), 1)
+
+    def test_profile_file_removal_keeps_shared_blob(self):
+        self.offers[0].image = image_upload("logo.png")
+        self.offers[0].save()
+        url = reverse("profile-detail", args=[self.business_user.pk])
+        self.client.patch(url, {"file": image_upload("logo.png")}, format="multipart")
+
+        resp = self.client.patch(url, {"file": ""}, format="multipart")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.offers[0].refresh_from_db()
+        with self.offers[0].image.open("rb") as fh:
+            self.assertTrue(fh.read().startswith(b"\x89PNG"))
+        self.assertEqual(len(self.blobs()), 1)
+
+    def test_gc_media(self):
+        offer = self.offers[0]
+        offer.image = image_upload("current.png")
+        offer.image_variants = {"source": "offers/current.png",
+                                "variants": {"thumb": {"webp": "images/ab/variant.webp"}}}
+        offer.save()
+        default_storage.save("images/ab/variant.webp", ContentFile(b"variant"))
+        replaced = default_storage.save("offers/replaced.png", ContentFile(b"replaced"))
+        recent = default_storage.save("offers/recent.png", ContentFile(b"recent"))
+        for name in (offer.image.name, "images/ab/variant.webp", replaced):
+            self.age(name)
+        # A blob that lost its name outside the storage
+        lost = default_storage.save("offers/lost.png", ContentFile(b"lost"))
+        self.age(lost)
+        os.remove(default_storage.path(lost))
+
+        self.assertIn("Would delete 1 unreferenced file(s) and 1 blob(s)", self._gc("--dry-run"))
+        self.assertTrue(default_storage.exists(replaced))
+
+        self.assertIn("Deleted 1 unreferenced file(s) and 1 blob(s)", self._gc())
+        self.assertFalse(default_storage.exists(replaced))
+        for name in (offer.image.name, "images/ab/variant.webp", recent):
+            self.assertTrue(default_storage.exists(name), name)
+        # current, variant and recent; the replaced file's blob went with it
+        self.assertEqual(len(self.blobs()), 3)
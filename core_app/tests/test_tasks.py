@@ -0,0 +1,211 @@
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.urls import reverse
+from django.core.cache import cache
+from django.core.management import call_command
+from django.contrib.auth.models import User
+from django.db import DatabaseError, connection, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from auth_app.models import Profile
+from core_app import metrics, tasks
+from core_app.models import Task
+
+calls = []
+
+
+@tasks.task(max_attempts=2)
+def record(value):
+    calls.append(value)
+
+
+@tasks.task(max_attempts=2)
+def fail():
+    raise RuntimeError("broken")
+
+
+@override_settings(TASK_EXECUTOR="worker", TASK_RETRY_DELAY=10)
+class TaskQueueTests(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueued_with_the_transaction(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                record.enqueue("kept")
+                with self.assertRaises(ValueError):
+                    with transaction.atomic():
+                        record.enqueue("rolled back")
+                        raise ValueError
+        self.assertEqual(list(Task.objects.values_list("args", flat=True)), [["kept"]])
+        self.assertEqual(calls, [])
+
+    @override_settings(TASK_EXECUTOR="inline")
+    def test_inline_executor_runs_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            record.enqueue("now")
+        self.assertEqual(calls, ["now"])
+        self.assertFalse(Task.objects.exists())
+
+    def test_success_removes_the_task(self):
+        record.enqueue(1)
+        record.enqueue(2)
+        before = metrics.get_sample_value("coderr_tasks_total", task=record.name, result="success")
+        self.assertEqual(tasks.run_pending(), 2)
+        self.assertEqual(calls, [1, 2])
+        self.assertFalse(Task.objects.exists())
+        self.assertEqual(
+            metrics.get_sample_value("coderr_tasks_total", task=record.name, result="success"), before + 2
+        )
+
+    def test_failures_are_retried_with_backoff(self):
+        queued = fail.enqueue()
+        self.assertEqual(tasks.run_pending(), 1)
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ("queued", 1))
+        self.assertIn("RuntimeError: broken", queued.last_error)
+        self.assertGreater(queued.run_after, timezone.now() + timedelta(seconds=9))
+        # Not due before the delay
+        self.assertEqual(tasks.run_pending(), 0)
+
+        Task.objects.filter(pk=queued.pk).update(run_after=timezone.now())
+        before = metrics.get_sample_value("coderr_tasks_total", task=fail.name, result="failed")
+        self.assertEqual(tasks.run_pending(), 1)
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ("failed", 2))
+        self.assertEqual(tasks.run_pending(), 0)
+        self.assertEqual(metrics.get_sample_value("coderr_tasks_total", task=fail.name, result="failed"), before + 1)
+
+    def test_expired_lock_is_claimed_again(self):
+        queued = record.enqueue("lost")
+        self.assertIsNotNone(tasks.claim())
+        # The worker died: the task stays locked until its timeout
+        self.assertIsNone(tasks.claim())
+
+        Task.objects.filter(pk=queued.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertTrue(tasks.run_next())
+        self.assertEqual(calls, ["lost"])
+
+    def test_gives_up_after_repeated_timeouts(self):
+        queued = record.enqueue("hangs")
+        Task.objects.filter(pk=queued.pk).update(
+            status="running", attempts=2, locked_until=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertTrue(tasks.run_next())
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, "failed")
+        self.assertIn("TimeoutError", queued.last_error)
+        self.assertEqual(calls, [])
+
+    def test_run_worker_once(self):
+        record.enqueue("a")
+        record.enqueue("b")
+        out = StringIO()
+        call_command("run_worker", "--once", stdout=out)
+        self.assertIn("Ran 2 task(s).", out.getvalue())
+        self.assertEqual(calls, ["a", "b"])
+
+        record.enqueue("c")
+        record.enqueue("d")
+        call_command("run_worker", "--max-tasks", "1", stdout=StringIO())
+        self.assertEqual(calls, ["a", "b", "c"])
+
+
+@override_settings(TASK_EXECUTOR="thread")
+class ThreadExecutorTests(SimpleTestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(tasks, "_executor", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_pool_and_poller_start_once(self):
+        with mock.patch.object(tasks, "ThreadPoolExecutor") as pool, \
+                mock.patch.object(tasks.threading, "Thread") as thread:
+            tasks.dispatch(1)
+            tasks.dispatch(2)
+        pool.assert_called_once()
+        self.assertEqual(pool.return_value.submit.call_count, 2)
+        thread.assert_called_once_with(target=tasks._poll, name="tasks-poller", daemon=True)
+        thread.return_value.start.assert_called_once()
+
+    def test_poller_runs_due_tasks(self):
+        class Stop(Exception):
+            pass
+
+        with mock.patch.object(tasks.time, "sleep", side_effect=[None, None, Stop]), \
+                mock.patch.object(tasks, "run_pending", side_effect=[1, RuntimeError("db gone")]) as run_pending, \
+                self.assertLogs("core_app.tasks", level="ERROR"), self.assertRaises(Stop):
+            tasks._poll()
+        self.assertEqual(run_pending.call_count, 2)
+
+
+@override_settings(TASK_EXECUTOR="worker")
+class ConcurrentClaimTests(TransactionTestCase):
+
+    def test_each_task_is_claimed_once(self):
+        queued = record.enqueue("once")
+        barrier = threading.Barrier(4)
+        claimed = []
+
+        def worker():
+            barrier.wait()
+            try:
+                claimed.append(tasks.claim(queued.pk))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(claimed), 4)
+        self.assertEqual(len([c for c in claimed if c is not None]), 1)
+
+
+@override_settings(TASK_EXECUTOR="worker")
+class ProfileFileRemovalTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="business_user", password="x")
+        Profile.objects.create(user=cls.user, type="business", file="profile/old.png")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(user=self.user)
+
+    def test_old_file_is_deleted_by_a_task(self):
+        with mock.patch("core_app.tasks.default_storage.delete") as delete:
+            resp = self.client.patch(
+                reverse("profile-detail", args=[self.user.pk]), {"file": ""}, format="multipart"
+            )
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            delete.assert_not_called()
+            queued = Task.objects.get(name=tasks.delete_media_file.name)
+            self.assertEqual(queued.args, ["profile/old.png"])
+            self.assertTrue(tasks.run_next(queued.pk))
+        delete.assert_called_once_with("profile/old.png")
+
+    def test_enqueued_after_the_profile_is_saved(self):
+        url = reverse("profile-detail", args=[self.user.pk])
+        with mock.patch.object(Profile, "save", side_effect=DatabaseError("disk full")):
+            with self.assertRaises(DatabaseError):
+                self.client.patch(url, {"file": ""}, format="multipart")
+        self.assertFalse(Task.objects.filter(name=tasks.delete_media_file.name).exists())
+
+        stored = []
+        with mock.patch.object(
+            tasks.delete_media_file, "enqueue",
+            side_effect=lambda name: stored.append(Profile.objects.get(user=self.user).file.name),
+        ):
+            resp = self.client.patch(url, {"file": ""}, format="multipart")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertIn(stored, ([""], [None]))
@@ -0,0 +1,124 @@
+from unittest import mock
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from core_app import throttling
+from core_app.tests.fake_redis import FakeRedisServer
+
+# Window start far from the epoch, like real timestamps
+T0 = 1_700_000_040.0
+
+
+class SlidingWindowStoreMixin:
+    """Decisions every store has to make for 3 requests per 60 seconds."""
+
+    def make_store(self):
+        raise NotImplementedError
+
+    def test_sliding_window(self):
+        store = self.make_store()
+        hits = [store.hit("throttle_test_a", 3, 60, T0 + offset) for offset in (0, 10, 20, 30)]
+        self.assertEqual([allowed for allowed, _ in hits], [True, True, True, False])
+        # The current window is full: it has to end and then decay
+        self.assertAlmostEqual(hits[-1][1], 30 + 20)
+
+        # Halfway through the next window the previous three count as 1.5
+        self.assertEqual(store.hit("throttle_test_a", 3, 60, T0 + 90), (True, None))
+        allowed, wait = store.hit("throttle_test_a", 3, 60, T0 + 91)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 60 * (1 - 1 / 3) - 31)
+
+        # Two windows later nothing is left
+        self.assertEqual(store.hit("throttle_test_a", 3, 60, T0 + 180), (True, None))
+
+    def test_keys_are_independent(self):
+        store = self.make_store()
+        self.assertTrue(store.hit("throttle_test_b", 1, 60, T0)[0])
+        self.assertFalse(store.hit("throttle_test_b", 1, 60, T0 + 1)[0])
+        self.assertTrue(store.hit("throttle_test_c", 1, 60, T0 + 1)[0])
+
+
+class CacheThrottleStoreTests(SlidingWindowStoreMixin, SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def make_store(self):
+        return throttling.CacheThrottleStore()
+
+    def test_rejected_requests_are_not_counted(self):
+        store = self.make_store()
+        for offset in range(5):
+            store.hit("throttle_test_d", 2, 60, T0 + offset)
+        self.assertEqual(cache.get(f"throttle_test_d:{int(T0 // 60)}"), 2)
+
+
+class RedisThrottleStoreTests(SlidingWindowStoreMixin, SimpleTestCase):
+
+    def setUp(self):
+        self.server = FakeRedisServer(password="s3cret").start()
+        self.addCleanup(self.server.stop)
+
+    def make_store(self):
+        store = throttling.RedisThrottleStore(self.server.url)
+        self.addCleanup(store.client.close)
+        return store
+
+    def test_one_round_trip_per_check(self):
+        store = self.make_store()
+        store.hit("throttle_test_e", 5, 60, T0)
+        # Connect, unknown script, load it with EVAL
+        self.assertEqual(self.server.commands, ["AUTH", "SELECT", "EVALSHA", "EVAL"])
+        store.hit("throttle_test_e", 5, 60, T0 + 1)
+        self.assertEqual(self.server.commands[4:], ["EVALSHA"])
+
+    def test_limit_is_shared_between_workers(self):
+        workers = [self.make_store() for _ in range(3)]
+        allowed = [worker.hit("throttle_test_f", 4, 60, T0 + offset)[0]
+                   for offset in range(3) for worker in workers]
+        self.assertEqual(allowed.count(True), 4)
+
+    def test_unreachable_server_allows_requests(self):
+        store = self.make_store()
+        self.server.stop()
+        with self.assertLogs("core_app.throttling", "WARNING"):
+            self.assertEqual(store.hit("throttle_test_g", 1, 60, T0), (True, None))
+
+    def test_wrong_password_allows_requests(self):
+        store = throttling.RedisThrottleStore(self.server.url.replace("s3cret", "wrong"))
+        with self.assertLogs("core_app.throttling", "WARNING") as logs:
+            self.assertEqual(store.hit("throttle_test_h", 1, 60, T0), (True, None))
+        self.assertIn("WRONGPASS", logs.output[0])
+
+
+@mock.patch.object(throttling.SlidingWindowScopedRateThrottle, "THROTTLE_RATES", {"auth_login": "2/hour"})
+class LoginThrottleTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user(username="user", email="user@example.com", password="x")
+
+    def setUp(self):
+        cache.clear()
+
+    def _login(self):
+        return self.client.post(reverse("login"), {"username": "user", "password": "x"}, format="json")
+
+    def test_third_login_is_throttled(self):
+        self.assertEqual(self._login().status_code, status.HTTP_200_OK)
+        self.assertEqual(self._login().status_code, status.HTTP_200_OK)
+        resp = self._login()
+        self.assertEqual(resp.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreater(int(resp["Retry-After"]), 0)
+
+    def test_redis_storage(self):
+        server = FakeRedisServer().start()
+        self.addCleanup(server.stop)
+        with override_settings(THROTTLE_REDIS_URL=server.url):
+            statuses = [self._login().status_code for _ in range(3)]
+        self.assertEqual(statuses, [status.HTTP_200_OK] * 2 + [status.HTTP_429_TOO_MANY_REQUESTS])
+        self.assertTrue(any(key.startswith("throttle_auth_login_") for key in server.data))
+        self.assertIsInstance(throttling.get_store(), throttling.CacheThrottleStore)
@@ -0,0 +1,255 @@
+import hashlib
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.urls import reverse
+from django.core.cache import cache
+from django.core.management import call_command
+from django.contrib.auth.models import User
+from django.utils import timezone
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase, APITransactionTestCase
+from auth_app.models import Profile
+from coderr_app.models import Offer
+from core_app import uploads
+from core_app.models import ChunkedUpload
+from core_app.tests.images import image_bytes
+
+
+class ChunkedUploadClientMixin:
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        for setting in ("MEDIA_ROOT", "CHUNKED_UPLOAD_DIR"):
+            directory = tempfile.mkdtemp()
+            self.addCleanup(shutil.rmtree, directory)
+            override = self.settings(**{setting: directory})
+            override.enable()
+            self.addCleanup(override.disable)
+        override = self.settings(TASK_EXECUTOR="inline")
+        override.enable()
+        self.addCleanup(override.disable)
+        self.client.force_authenticate(user=self.business_user)
+        self.data = image_bytes((400, 300), "PNG")
+
+    def _create(self, data=None, filename="logo.png"):
+        data = self.data if data is None else data
+        resp = self.client.post(reverse("upload-list"), {
+            "filename": filename, "size": len(data), "sha256": hashlib.sha256(data).hexdigest(),
+        }, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.data)
+        return resp.data["id"]
+
+    def _send(self, upload_id, chunk, offset):
+        return self.client.patch(
+            reverse("upload-detail", args=[upload_id]), chunk,
+            content_type="application/offset+octet-stream", headers={"Upload-Offset": str(offset)},
+        )
+
+    def _upload(self, data=None, chunk_size=1000):
+        data = self.data if data is None else data
+        upload_id = self._create(data)
+        for offset in range(0, len(data), chunk_size):
+            resp = self._send(upload_id, data[offset:offset + chunk_size], offset)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        self.assertTrue(resp.data["complete"])
+        return upload_id
+
+
+class ChunkedUploadTests(ChunkedUploadClientMixin, APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business_user = User.objects.create_user(username="business_user", password="x")
+        cls.profile = Profile.objects.create(user=cls.business_user, type="business")
+        cls.other_user = User.objects.create_user(username="other_user", password="x")
+        Profile.objects.create(user=cls.other_user, type="customer")
+        cls.offer = Offer.objects.create(user=cls.business_user, title="Logo", description="D")
+
+    def test_chunks_are_appended_and_resumed(self):
+        upload_id = self._create()
+        resp = self._send(upload_id, self.data[:1000], 0)
+        self.assertEqual(resp["Upload-Offset"], "1000")
+        self.assertFalse(resp.data["complete"])
+
+        # Repeating a chunk that already arrived is a conflict
+        self.assertEqual(self._send(upload_id, self.data[:1000], 0).status_code, status.HTTP_409_CONFLICT)
+
+        resp = self.client.get(reverse("upload-detail", args=[upload_id]))
+        self.assertEqual(resp.data["offset"], 1000)
+        resp = self._send(upload_id, self.data[1000:], 1000)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertTrue(resp.data["complete"])
+        upload = ChunkedUpload.objects.get(pk=upload_id)
+        self.assertEqual(uploads.part_path(upload).read_bytes(), self.data)
+
+    def test_body_is_streamed_in_blocks(self):
+        upload_id = self._create()
+        reads = []
+
+        class Stream:
+            def __init__(self, data):
+                self.data = data
+
+            def read(self, size):
+                reads.append(size)
+                block, self.data = self.data[:size], self.data[size:]
+                return block
+
+        upload = ChunkedUpload.objects.get(pk=upload_id)
+        uploads.append_chunk(upload, Stream(self.data), 0, len(self.data))
+        self.assertTrue(all(size <= uploads.CHUNK_BLOCK_SIZE for size in reads))
+        self.assertIsNotNone(upload.completed_at)
+
+    def test_interrupted_chunk_keeps_received_bytes(self):
+        upload = ChunkedUpload.objects.get(pk=self._create())
+
+        class Disconnected:
+            def __init__(self, data):
+                self.data = data
+
+            def read(self, size):
+                block, self.data = self.data[:size], self.data[size:]
+                return block
+
+        uploads.append_chunk(upload, Disconnected(self.data[:700]), 0, 1000)
+        upload.refresh_from_db()
+        self.assertEqual(upload.offset, 700)
+
+    def test_checksum_mismatch_resets_upload(self):
+        upload_id = self._create()
+        resp = self._send(upload_id, b"x" * len(self.data), 0)
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("sha256", resp.data)
+        upload = ChunkedUpload.objects.get(pk=upload_id)
+        self.assertEqual((upload.offset, upload.completed_at), (0, None))
+        self.assertFalse(uploads.part_path(upload).exists())
+
+    def test_rejects_oversized_chunks_and_uploads(self):
+        upload_id = self._create()
+        self.assertEqual(self._send(upload_id, self.data + b"x", 0).status_code, status.HTTP_400_BAD_REQUEST)
+        with self.settings(CHUNKED_UPLOAD_MAX_SIZE=10):
+            resp = self.client.post(reverse("upload-list"), {
+                "filename": "big.png", "size": 11, "sha256": "0" * 64,
+            }, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_chunks_need_octet_stream(self):
+        upload_id = self._create()
+        resp = self.client.patch(reverse("upload-detail", args=[upload_id]), {"offset": 0}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+    def test_uploads_are_private(self):
+        upload_id = self._upload()
+        self.client.force_authenticate(user=self.other_user)
+        self.assertEqual(
+            self.client.get(reverse("upload-detail", args=[upload_id])).status_code, status.HTTP_404_NOT_FOUND
+        )
+        resp = self.client.patch(
+            reverse("profile-detail", args=[self.other_user.pk]), {"file_upload": upload_id}, format="json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("file_upload", resp.data)
+
+    def test_attach_to_offer_moves_file(self):
+        upload_id = self._upload()
+        upload = ChunkedUpload.objects.get(pk=upload_id)
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.patch(
+                reverse("offer-detail", args=[self.offer.pk]), {"image_upload": upload_id}, format="json"
+            )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        self.assertIn("/media/offers/logo", resp.data["image"])
+
+        self.offer.refresh_from_db()
+        with self.offer.image.open("rb"):
+            self.assertEqual(self.offer.image.read(), self.data)
+        self.assertFalse(uploads.part_path(upload).exists())
+        self.assertFalse(ChunkedUpload.objects.filter(pk=upload_id).exists())
+
+    def test_bulk_offers_get_stripped_images_and_variants(self):
+        exif = Image.Exif()
+        exif[0x010F] = "SecretCam"
+        upload_id = self._upload(image_bytes((400, 300), "JPEG", exif=exif.tobytes()))
+        detail = {"title": "Basic", "revisions": 1, "delivery_time_in_days": 3, "price": 50, "features": ["A"]}
+        payload = [{
+            "title": "Bulk logo", "description": "D", "image_upload": upload_id,
+            "details": [dict(detail, offer_type=offer_type) for offer_type in ("basic", "standard", "premium")],
+        }]
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post(reverse("offer-bulk"), payload, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.data)
+
+        offer = Offer.objects.get(title="Bulk logo")
+        with offer.image.open("rb"):
+            self.assertNotIn(b"SecretCam", offer.image.read())
+        self.assertEqual(offer.image_variants["source"], offer.image.name)
+        self.assertFalse(ChunkedUpload.objects.filter(pk=upload_id).exists())
+
+    def test_attach_to_profile(self):
+        upload_id = self._upload()
+        resp = self.client.patch(
+            reverse("profile-detail", args=[self.profile.pk]), {"file_upload": upload_id}, format="json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        self.profile.refresh_from_db()
+        self.assertTrue(self.profile.file.name.startswith("profile/logo"))
+        self.assertIsNotNone(self.profile.uploaded_at)
+
+    def test_attach_rejects_incomplete_and_non_images(self):
+        upload_id = self._create()
+        resp = self.client.patch(
+            reverse("offer-detail", args=[self.offer.pk]), {"image_upload": upload_id}, format="json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+        upload_id = self._upload(b"not an image")
+        resp = self.client.patch(
+            reverse("offer-detail", args=[self.offer.pk]), {"image_upload": upload_id}, format="json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("image_upload", resp.data)
+
+    def test_delete_and_clear_stale_uploads(self):
+        cancelled = ChunkedUpload.objects.get(pk=self._upload())
+        resp = self.client.delete(reverse("upload-detail", args=[cancelled.pk]))
+        self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(uploads.part_path(cancelled).exists())
+
+        stale = ChunkedUpload.objects.get(pk=self._upload())
+        fresh = ChunkedUpload.objects.get(pk=self._upload())
+        ChunkedUpload.objects.filter(pk=stale.pk).update(created_at=timezone.now() - timedelta(days=2))
+        call_command("clear_stale_uploads", stdout=StringIO())
+        self.assertEqual(list(ChunkedUpload.objects.values_list("pk", flat=True)), [fresh.pk])
+        self.assertFalse(uploads.part_path(stale).exists())
+
+
+class ChunkedUploadAttachTransactionTests(ChunkedUploadClientMixin, APITransactionTestCase):
+    """Attaching outside a test transaction, i.e. in autocommit like production."""
+
+    def setUp(self):
+        self.business_user = User.objects.create_user(username="business_user", password="x")
+        self.profile = Profile.objects.create(user=self.business_user, type="business")
+        self.offer = Offer.objects.create(user=self.business_user, title="Logo", description="D")
+        super().setUp()
+
+    def test_attach_to_offer_and_profile(self):
+        cases = [
+            (reverse("offer-detail", args=[self.offer.pk]), "image_upload", self.offer, "image"),
+            (reverse("profile-detail", args=[self.profile.pk]), "file_upload", self.profile, "file"),
+        ]
+        for url, field, instance, file_field in cases:
+            with self.subTest(field=field):
+                upload = ChunkedUpload.objects.get(pk=self._upload())
+                resp = self.client.patch(url, {field: str(upload.pk)}, format="json")
+                self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+
+                instance.refresh_from_db()
+                with getattr(instance, file_field).open("rb") as stored:
+                    self.assertEqual(stored.read(), self.data)
+                self.assertFalse(uploads.part_path(upload).exists())
+                self.assertFalse(ChunkedUpload.objects.filter(pk=upload.pk).exists())
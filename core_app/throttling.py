@@ -0,0 +1,268 @@
+"""Sliding-window API throttles with shared storage.
+
+DRF's `SimpleRateThrottle` keeps a list of request timestamps per client
+in the default cache and rewrites the whole list on every request. With
+the default per-process `LocMemCache` every worker also has its own
+lists, so N workers allow N times the configured rate.
+
+The throttles here keep two integers per client instead: the requests
+in the current and in the previous fixed window (one window is the
+rate's duration, e.g. a minute for `50/minute`). A request is allowed if
+
+    previous * (share of the previous window still in the sliding window)
+    + current + 1 <= limit
+
+which approximates a sliding window of the rate's duration at constant
+cost per check, whatever the rate.
+
+The counters live in Redis when `THROTTLE_REDIS_URL` is set: one
+`EVALSHA` of a Lua script per check reads both counters and increments
+the current one atomically, so the limit holds across all workers and
+hosts. The client speaks the Redis protocol (RESP) itself, no Redis
+package is needed. Without a URL the counters are kept in Django's
+default cache with `add`/`incr` (shared if that cache is, e.g.
+memcached). If Redis cannot be reached, requests are allowed and a
+warning is logged on the `core_app.throttling` logger.
+"""
+
+import hashlib
+import logging
+import socket
+import threading
+from urllib.parse import unquote, urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import throttling
+
+logger = logging.getLogger("core_app.throttling")
+
+# KEYS: current window, previous window. ARGV: limit, weight of the
+# previous window, TTL of the current window.
+# Returns {allowed, current count, previous count}.
+SLIDING_WINDOW_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+if previous * tonumber(ARGV[2]) + current + 1 > tonumber(ARGV[1]) then
+    return {0, current, previous}
+end
+current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+return {1, current, previous}
+"""
+
+
+class RedisError(Exception):
+    """An error reply from the server, or a broken connection."""
+
+
+class RedisReplyError(RedisError):
+    """An error reply; the connection stays usable."""
+
+
+def sliding_window(now, duration):
+    """Return (window index, seconds into it, weight of the previous window)."""
+    index = int(now // duration)
+    elapsed = now - index * duration
+    return index, elapsed, 1 - elapsed / duration
+
+
+def retry_after(previous, current, limit, duration, elapsed):
+    """Seconds until one more request fits, given the counts of a rejected check."""
+    room = limit - 1 - current
+    if room >= 0 and previous:
+        # The previous window's share has to decay to `room`
+        return max(0.0, duration * (1 - room / previous) - elapsed)
+    # The current window is full on its own: wait for it to end, then for
+    # its share (as the previous window) to decay
+    return duration - elapsed + duration * (1 - (limit - 1) / max(current, 1))
+
+
+class RedisClient:
+    """Minimal Redis client: one connection per thread, RESP2 commands."""
+
+    def __init__(self, url, timeout=0.5):
+        parts = urlsplit(url)
+        if parts.scheme != "redis":
+            raise ValueError(f"Unsupported THROTTLE_REDIS_URL scheme: {parts.scheme!r}")
+        self.address = (parts.hostname or "localhost", parts.port or 6379)
+        self.username = unquote(parts.username) if parts.username else None
+        self.password = unquote(parts.password) if parts.password else None
+        self.db = int(parts.path.strip("/") or 0)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def execute(self, *args):
+        """Send one command and return its reply; error replies raise RedisError."""
+        try:
+            sock, reader = self._connection()
+            sock.sendall(self._encode(args))
+            return self._read(reader)
+        except RedisReplyError:
+            raise
+        except (OSError, ValueError, RedisError) as exc:
+            self.close()
+            raise RedisError(str(exc) or type(exc).__name__) from exc
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            sock, reader = conn
+            reader.close()
+            sock.close()
+
+    def _connection(self):
+        """Return this thread's (socket, reader), connecting on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            sock = socket.create_connection(self.address, timeout=self.timeout)
+            conn = self._local.conn = (sock, sock.makefile("rb"))
+            try:
+                if self.password is not None:
+                    credentials = (self.username, self.password) if self.username else (self.password,)
+                    self.execute("AUTH", *credentials)
+                if self.db:
+                    self.execute("SELECT", self.db)
+            except RedisError:
+                self.close()
+                raise
+        return conn
+
+    @staticmethod
+    def _encode(args):
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            out.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(out)
+
+    def _read(self, reader):
+        line = reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise RedisError("Connection closed")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RedisReplyError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            return reader.read(length + 2)[:-2]
+        if kind == b"*":
+            length = int(rest)
+            return None if length < 0 else [self._read(reader) for _ in range(length)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+
+class RedisThrottleStore:
+    """Sliding-window counters in Redis, checked atomically by a Lua script."""
+
+    def __init__(self, url):
+        self.client = RedisClient(url)
+        self.sha = hashlib.sha1(SLIDING_WINDOW_SCRIPT.encode()).hexdigest()
+
+    def hit(self, key, limit, duration, now):
+        """Count a request for `key`; return (allowed, seconds to wait or None)."""
+        index, elapsed, weight = sliding_window(now, duration)
+        args = (2, f"{key}:{index}", f"{key}:{index - 1}", limit, repr(weight), 2 * int(duration) + 1)
+        try:
+            try:
+                allowed, current, previous = self.client.execute("EVALSHA", self.sha, *args)
+            except RedisReplyError as exc:
+                if not str(exc).startswith("NOSCRIPT"):
+                    raise
+                allowed, current, previous = self.client.execute("EVAL", SLIDING_WINDOW_SCRIPT, *args)
+        except RedisError as exc:
+            logger.warning("Throttle storage unavailable, allowing request: %s", exc)
+            return True, None
+        if allowed:
+            return True, None
+        return False, retry_after(previous, current, limit, duration, elapsed)
+
+
+class CacheThrottleStore:
+    """Sliding-window counters in Django's default cache.
+
+    The request is counted first with `incr`, so concurrent requests get
+    distinct counts; a rejected request takes its count back.
+    """
+
+    def hit(self, key, limit, duration, now):
+        index, elapsed, weight = sliding_window(now, duration)
+        current_key = f"{key}:{index}"
+        timeout = 2 * int(duration) + 1
+        cache.add(current_key, 0, timeout)
+        try:
+            current = cache.incr(current_key)
+        except ValueError:
+            # Evicted between add() and incr()
+            cache.set(current_key, 1, timeout)
+            current = 1
+        previous = cache.get(f"{key}:{index - 1}", 0)
+        if previous * weight + current <= limit:
+            return True, None
+        try:
+            cache.decr(current_key)
+        except ValueError:
+            pass
+        return False, retry_after(previous, current - 1, limit, duration, elapsed)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store():
+    """Return the store for the current `THROTTLE_REDIS_URL`."""
+    url = settings.THROTTLE_REDIS_URL
+    store = _stores.get(url)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(url)
+            if store is None:
+                store = _stores[url] = RedisThrottleStore(url) if url else CacheThrottleStore()
+    return store
+
+
+class SlidingWindowRateMixin:
+    """Replace SimpleRateThrottle's timestamp history with sliding-window counters."""
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        allowed, self.retry_after = get_store().hit(self.key, self.num_requests, self.duration, self.timer())
+        return allowed
+
+    def wait(self):
+        return self.retry_after
+
+
+class SlidingWindowAnonRateThrottle(SlidingWindowRateMixin, throttling.AnonRateThrottle):
+    pass
+
+
+class SlidingWindowUserRateThrottle(SlidingWindowRateMixin, throttling.UserRateThrottle):
+    pass
+
+
+class SlidingWindowScopedRateThrottle(SlidingWindowRateMixin, throttling.ScopedRateThrottle):
+
+    def allow_request(self, request, view):
+        # As ScopedRateThrottle: the rate depends on the view's throttle_scope
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
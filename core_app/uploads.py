@@ -0,0 +1,159 @@
+"""Resumable chunked uploads for offer images and profile files.
+
+Multipart uploads are parsed in full before the view runs and a dropped
+connection loses the whole file. Here the client creates an upload
+(`POST /api/uploads/` with filename, size and SHA-256), then sends the
+bytes in any number of `PATCH /api/uploads/<id>/` requests:
+
+    Upload-Offset: <bytes already received>
+    Content-Type: application/offset+octet-stream
+
+Each request body is streamed straight into a part file in
+`CHUNKED_UPLOAD_DIR`, `CHUNK_BLOCK_SIZE` bytes at a time, and the offset
+advances by what actually arrived, so an interrupted chunk is resumed
+from `GET /api/uploads/<id>/`. When the last byte is in, the file is
+hashed and compared with the announced checksum.
+
+A completed upload is attached with a small JSON request, e.g.
+`PATCH /api/offers/<id>/ {"image_upload": "<upload id>"}` or
+`PATCH /api/profile/<id>/ {"file_upload": "<upload id>"}`. The part file
+is then stored like a multipart upload (images are re-encoded without
+metadata, see core_app.images), and the upload is deleted once the
+offer or profile is saved (`AttachUploadsMixin`).
+
+Deleting an upload removes its part file (`core_app.signals`);
+`manage.py clear_stale_uploads` deletes uploads older than
+`CHUNKED_UPLOAD_EXPIRY_HOURS`.
+"""
+
+import hashlib
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+from rest_framework import exceptions, serializers
+
+from core_app.models import ChunkedUpload
+
+CHUNK_BLOCK_SIZE = 64 * 1024
+
+
+class UploadOffsetConflict(exceptions.APIException):
+    status_code = 409
+    default_detail = "Upload-Offset does not match the received bytes."
+    default_code = "upload_offset_conflict"
+
+
+def part_path(upload):
+    return Path(settings.CHUNKED_UPLOAD_DIR) / f"{upload.pk}.part"
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(CHUNK_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def append_chunk(upload, stream, offset, length):
+    """Write `length` bytes from `stream` at `offset` and advance the upload.
+
+    Returns the upload with its new offset; a mismatched offset raises
+    UploadOffsetConflict, a wrong checksum restarts the upload at 0.
+    """
+    if upload.completed_at is not None or offset != upload.offset:
+        raise UploadOffsetConflict()
+    if offset + length > upload.size:
+        raise serializers.ValidationError({"detail": "Chunk exceeds the announced upload size."})
+
+    path = part_path(upload)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    received = 0
+    with open(path, "r+b" if path.exists() else "wb") as fh:
+        fh.seek(offset)
+        while received < length:
+            block = stream.read(min(CHUNK_BLOCK_SIZE, length - received))
+            if not block:
+                # Client went away; keep what arrived so it can resume
+                break
+            fh.write(block)
+            received += len(block)
+        fh.truncate()
+
+    # Concurrent chunks for the same offset: only one may advance it
+    new_offset = offset + received
+    if not ChunkedUpload.objects.filter(pk=upload.pk, offset=offset).update(offset=new_offset):
+        raise UploadOffsetConflict()
+    upload.offset = new_offset
+
+    if new_offset == upload.size:
+        if file_sha256(path) != upload.sha256:
+            path.unlink()
+            ChunkedUpload.objects.filter(pk=upload.pk).update(offset=0)
+            upload.offset = 0
+            raise serializers.ValidationError({"sha256": "Checksum mismatch; the upload was reset."})
+        upload.completed_at = timezone.now()
+        ChunkedUpload.objects.filter(pk=upload.pk).update(completed_at=upload.completed_at)
+    return upload
+
+
+class CompletedUploadFile(File):
+    """A finished part file, moved into storage instead of copied.
+
+    FileSystemStorage moves anything with `temporary_file_path()`.
+    """
+
+    def __init__(self, upload):
+        super().__init__(open(part_path(upload), "rb"), name=upload.filename)
+        self.upload = upload
+
+    def temporary_file_path(self):
+        return str(part_path(self.upload))
+
+
+def release_uploads(validated_data):
+    """Delete the uploads attached through `validated_data` once it is saved.
+
+    Their files are in media storage by then; deleting the row also
+    removes a part file that was not moved (core_app.signals).
+    """
+    for value in validated_data.values():
+        if isinstance(value, CompletedUploadFile):
+            value.close()
+            ChunkedUpload.objects.filter(pk=value.upload.pk).delete()
+
+
+class AttachUploadsMixin:
+    """Serializer mixin: release attached chunked uploads after save()."""
+
+    def save(self, **kwargs):
+        instance = super().save(**kwargs)
+        release_uploads(self.validated_data)
+        return instance
+
+
+class ChunkedUploadField(serializers.Field):
+    """Write-only: id of a completed upload of the requesting user."""
+
+    default_error_messages = {
+        "invalid": "Unknown or incomplete upload.",
+    }
+
+    def __init__(self, **kwargs):
+        kwargs["write_only"] = True
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        try:
+            upload_id = uuid.UUID(str(data))
+        except ValueError:
+            self.fail("invalid")
+        upload = ChunkedUpload.objects.filter(
+            pk=upload_id, user=self.context["request"].user, completed_at__isnull=False
+        ).first()
+        if upload is None or not part_path(upload).exists():
+            self.fail("invalid")
+        return CompletedUploadFile(upload)
@@ -1,3 +1,77 @@
-from django.shortcuts import render
+"""Serving of uploaded media files.
 
-# Create your views here.
+`django.conf.urls.static` streamed every image through a Python worker
+(and only with DEBUG on). `serve_media` resolves the path inside
+`MEDIA_ROOT`, answers conditional requests, and then lets the front web
+server send the bytes:
+
+- `MEDIA_X_ACCEL_REDIRECT` (nginx): an internal location prefix; the
+  response carries `X-Accel-Redirect: <prefix><path>` and no body.
+- `MEDIA_X_SENDFILE` (Apache mod_xsendfile): the response carries
+  `X-Sendfile: <absolute path>` and no body.
+- Otherwise a `FileResponse` of the open file. WSGI servers with
+  `wsgi.file_wrapper` (gunicorn, uWSGI) send it with `os.sendfile`, so
+  the bytes are not copied through Python either.
+
+Both header values are percent-encoded, so names with non-ASCII
+characters (`Über.png`) reach the server intact; nginx and
+mod_xsendfile (`XSendFileUnescape`, on by default) decode them.
+
+Variants in `images/` are named by their content hash
+(`core_app.images`) and never change, so they are cached for a year as
+immutable; other files get `MEDIA_MAX_AGE`.
+"""
+
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from django.views.static import was_modified_since
+
+# images/ab/<sha256>.<ext>, as written by core_app.images.store()
+CONTENT_ADDRESSED = re.compile(r'^images/[0-9a-f]{2}/[0-9a-f]{64}\.[a-z0-9]+$')
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def cache_control(path):
+    if CONTENT_ADDRESSED.match(path):
+        return f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    return f"public, max-age={settings.MEDIA_MAX_AGE}"
+
+
+@require_safe
+def serve_media(request, path):
+    # Dotfiles (.htaccess, editor leftovers) are never served
+    if any(part.startswith(".") for part in path.split("/")):
+        raise Http404
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        stat = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+
+    if not was_modified_since(request.META.get("HTTP_IF_MODIFIED_SINCE"), stat.st_mtime):
+        response = HttpResponseNotModified()
+    elif settings.MEDIA_X_ACCEL_REDIRECT:
+        response = HttpResponse()
+        response["X-Accel-Redirect"] = quote(settings.MEDIA_X_ACCEL_REDIRECT.rstrip("/") + "/" + path)
+        # nginx sets the type of the internal file
+        del response["Content-Type"]
+    elif settings.MEDIA_X_SENDFILE:
+        response = HttpResponse(content_type=mimetypes.guess_type(full_path)[0] or "application/octet-stream")
+        response["X-Sendfile"] = quote(full_path)
+    else:
+        response = FileResponse(open(full_path, "rb"))
+
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    response["Cache-Control"] = cache_control(path)
+    return response
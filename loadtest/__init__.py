@@ -0,0 +1,13 @@
+"""Reproducible load profile for the Coderr API.
+
+`scenarios` scripts weighted user journeys (anonymous browsing, customer
+ordering and reviewing, business order handling) in the style of Locust
+task sets, `runner` drives them with a pool of virtual users against a
+running server and `stats` reports latency percentiles and throughput
+per endpoint. Only the standard library is used, so the runner can be
+started from any Python 3 environment:
+
+    python manage.py seed_marketplace
+    DJANGO_SETTINGS_MODULE=loadtest.settings python manage.py runserver --noreload
+    python -m loadtest --host http://127.0.0.1:8000 --users 20 --duration 60
+"""
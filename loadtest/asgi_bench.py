@@ -0,0 +1,263 @@
+"""Compare sync (WSGI) and async (ASGI) serving of the read endpoints.
+
+The handlers are driven in-process, without a server, so the numbers
+isolate how the application copes with many concurrent slow clients:
+
+- sync: Django's WSGI handler with `--threads` worker threads, like a
+  threaded WSGI worker. Each response holds its thread for
+  `--client-delay` seconds while it is "sent" to the slow client;
+- async: Django's ASGI handler with `ASYNC_READ_VIEWS` enabled, all
+  requests in one event loop. Sending awaits the same delay without
+  holding a thread.
+
+`--clients` closed-loop clients each repeat a weighted mix of offer
+list, offer detail, offer detail item, review list and base-info GETs
+for `--duration` seconds. Run against a database filled with
+`seed_marketplace`:
+
+    python manage.py seed_marketplace
+    python -m loadtest.asgi_bench --clients 200 --threads 8 --client-delay 0.05
+
+Each mode runs in its own interpreter (the URLconf is fixed at import).
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from loadtest.stats import Stats
+
+MODES = ("sync", "async")
+
+# (label, weight)
+MIX = (
+    ("GET /api/offers/", 4),
+    ("GET /api/offers/{id}/", 2),
+    ("GET /api/offerdetails/{id}/", 2),
+    ("GET /api/reviews/", 1),
+    ("GET /api/base-info/", 1),
+)
+
+
+class Targets:
+    """IDs and a token from the seeded data, picked once per run."""
+
+    def __init__(self, prefix, sample=200):
+        from django.contrib.auth.models import User
+        from rest_framework.authtoken.models import Token
+        from coderr_app.models import Offer, OfferDetail
+
+        customer = User.objects.filter(username=f"{prefix}_customer_0").first()
+        if customer is None:
+            raise SystemExit(f"No '{prefix}_customer_0' user; run `python manage.py seed_marketplace` first.")
+        self.token = Token.objects.get_or_create(user=customer)[0].key
+        self.offers = list(Offer.objects.values_list("pk", flat=True)[:sample])
+        self.details = list(OfferDetail.objects.values_list("pk", flat=True)[:sample])
+        self.businesses = list(
+            User.objects.filter(profile__type="business").values_list("pk", flat=True)[:sample]
+        )
+        if not self.offers:
+            raise SystemExit("No offers to request; run `python manage.py seed_marketplace` first.")
+        self.pages = max(1, len(self.offers) // 6)
+
+    def request(self, rng):
+        """Return (label, path, query string) for one random request."""
+        label = rng.choices([name for name, _ in MIX], [weight for _, weight in MIX])[0]
+        if label == "GET /api/offers/":
+            return label, "/api/offers/", f"page={rng.randint(1, self.pages)}"
+        if label == "GET /api/offers/{id}/":
+            return label, f"/api/offers/{rng.choice(self.offers)}/", ""
+        if label == "GET /api/offerdetails/{id}/":
+            return label, f"/api/offerdetails/{rng.choice(self.details)}/", ""
+        if label == "GET /api/reviews/":
+            return label, "/api/reviews/", f"business_user_id={rng.choice(self.businesses)}"
+        return label, "/api/base-info/", ""
+
+
+def wsgi_caller(threads, client_delay, token):
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import close_old_connections
+
+    handler = WSGIHandler()
+    pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="wsgi")
+
+    def call(path, query):
+        environ = {
+            "REQUEST_METHOD": "GET", "PATH_INFO": path, "QUERY_STRING": query,
+            "SERVER_NAME": "localhost", "SERVER_PORT": "80", "SERVER_PROTOCOL": "HTTP/1.1",
+            "HTTP_HOST": "localhost", "HTTP_AUTHORIZATION": f"Token {token}",
+            "wsgi.input": io.BytesIO(), "wsgi.errors": sys.stderr, "wsgi.url_scheme": "http",
+            "wsgi.multithread": True, "wsgi.multiprocess": False, "wsgi.run_once": False,
+        }
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started["status"] = int(status.split(" ", 1)[0])
+
+        result = handler(environ, start_response)
+        try:
+            b"".join(result)
+        finally:
+            result.close()
+        # The slow client keeps the worker thread busy while it reads
+        time.sleep(client_delay)
+        return started["status"]
+
+    async def caller(path, query):
+        return await asyncio.get_running_loop().run_in_executor(pool, call, path, query)
+
+    def close():
+        pool.submit(close_old_connections)
+        pool.shutdown()
+
+    return caller, close
+
+
+def asgi_caller(client_delay, token):
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+
+    async def caller(path, query):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+            "query_string": query.encode(), "root_path": "",
+            "headers": [(b"host", b"localhost"), (b"authorization", f"Token {token}".encode())],
+            "client": ("127.0.0.1", 0), "server": ("localhost", 80),
+        }
+        requested = False
+        done = asyncio.Event()
+        started = {}
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                started["status"] = message["status"]
+            elif not message.get("more_body", False):
+                await asyncio.sleep(client_delay)
+                done.set()
+
+        await application(scope, receive, send)
+        return started["status"]
+
+    return caller, lambda: None
+
+
+async def drive(caller, targets, clients, duration, seed):
+    stats = Stats()
+    deadline = time.perf_counter() + duration
+
+    async def client(index):
+        rng = random.Random(seed + index)
+        while time.perf_counter() < deadline:
+            label, path, query = targets.request(rng)
+            start = time.perf_counter()
+            try:
+                status = await caller(path, query)
+            except Exception:
+                status = None
+            stats.record(label, time.perf_counter() - start, status, status is not None and status < 400)
+
+    stats.start()
+    await asyncio.gather(*(client(index) for index in range(clients)))
+    stats.stop()
+    return stats
+
+
+def run_mode(mode, options):
+    """Run one mode in this interpreter and return its `Stats`."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "loadtest.settings")
+    os.environ["ASYNC_READ_VIEWS"] = "1" if mode == "async" else "0"
+    import django
+
+    django.setup()
+    from django.conf import settings
+
+    if settings.ASYNC_READ_VIEWS != (mode == "async"):
+        raise SystemExit("The async mode needs DJANGO_SETTINGS_MODULE=loadtest.settings.")
+    targets = Targets(options.prefix)
+    if mode == "async":
+        caller, close = asgi_caller(options.client_delay, targets.token)
+    else:
+        caller, close = wsgi_caller(options.threads, options.client_delay, targets.token)
+
+    try:
+        return asyncio.run(drive(caller, targets, options.clients, options.duration, options.seed))
+    finally:
+        close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m loadtest.asgi_bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=MODES + ("compare",), default="compare",
+                        help="Run one mode, or both in separate processes (default).")
+    parser.add_argument("--clients", type=int, default=100, help="Concurrent slow clients.")
+    parser.add_argument("--threads", type=int, default=8, help="Worker threads of the sync mode.")
+    parser.add_argument("--client-delay", type=float, default=0.05,
+                        help="Seconds each client takes to read a response.")
+    parser.add_argument("--duration", type=float, default=15.0, help="Run time per mode in seconds.")
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed for the request mix.")
+    parser.add_argument("--prefix", default="seed", help="Username prefix used by seed_marketplace.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    return parser
+
+
+def compare(options):
+    """Run each mode in a child interpreter and report them side by side."""
+    arguments = [
+        "--clients", str(options.clients), "--threads", str(options.threads),
+        "--client-delay", str(options.client_delay), "--duration", str(options.duration),
+        "--seed", str(options.seed), "--prefix", options.prefix, "--json",
+    ]
+    reports = {}
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, "-m", "loadtest.asgi_bench", "--mode", mode, *arguments],
+            check=True, stdout=subprocess.PIPE, text=True,
+        ).stdout
+        reports[mode] = json.loads(output)
+
+    if options.json:
+        print(json.dumps(reports, indent=2))
+        return 0
+    print(f"{options.clients} clients, {options.client_delay * 1000:.0f} ms client delay, "
+          f"{options.threads} sync worker threads, {options.duration:.0f}s per mode\n")
+    header = f"{'mode':<6}  {'reqs':>6}  {'fails':>5}  {'req/s':>8}  {'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}"
+    print(header)
+    print("-" * len(header))
+    for mode, report in reports.items():
+        total = report["endpoints"][-1]
+        print(f"{mode:<6}  {total['requests']:>6}  {total['failures']:>5}  {total['rps']:>8.2f}  "
+              f"{total['p50_ms']:>8.1f}  {total['p95_ms']:>8.1f}  {total['p99_ms']:>8.1f}")
+    sync_rps = reports["sync"]["endpoints"][-1]["rps"]
+    if sync_rps:
+        print(f"\nasync/sync throughput: {reports['async']['endpoints'][-1]['rps'] / sync_rps:.2f}x")
+    return 0
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    if options.mode == "compare":
+        return compare(options)
+    stats = run_mode(options.mode, options)
+    print(stats.to_json() if options.json else stats.format_table())
+    return 1 if stats.summary()[-1]["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Minimal keep-alive HTTP client used by one virtual user."""
+
+import http.client
+import json
+import time
+from urllib.parse import urlencode, urlsplit
+
+
+class Response:
+
+    def __init__(self, status, body):
+        self.status = status
+        self.body = body
+
+    def json(self):
+        try:
+            return json.loads(self.body)
+        except ValueError:
+            return None
+
+
+class Session:
+    """One persistent connection plus the auth token of a virtual user.
+
+    Every request is recorded in `stats` under `name` (the endpoint label)
+    with its latency and whether the status was one of `expect`.
+    """
+
+    def __init__(self, base_url, stats, timeout=30):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or "http"
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip("/")
+        self.stats = stats
+        self.timeout = timeout
+        self.token = None
+        self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            self._connection = cls(self.netloc, timeout=self.timeout)
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _send(self, method, url, body, headers):
+        connection = self._connect()
+        connection.request(method, url, body=body, headers=headers)
+        response = connection.getresponse()
+        payload = response.read()
+        if response.will_close:
+            self.close()
+        return response.status, payload
+
+    def request(self, method, path, name=None, params=None, data=None, expect=(200,)):
+        url = self.prefix + path
+        if params:
+            url += "?" + urlencode(params)
+        headers = {"Accept": "application/json"}
+        body = None
+        if data is not None:
+            body = json.dumps(data).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        if self.token:
+            headers["Authorization"] = f"Token {self.token}"
+
+        label = f"{method} {name or path}"
+        reused = self._connection is not None
+        start = time.perf_counter()
+        try:
+            try:
+                status, payload = self._send(method, url, body, headers)
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                # The server closed an idle keep-alive connection; retry once.
+                self.close()
+                if not reused:
+                    raise
+                start = time.perf_counter()
+                status, payload = self._send(method, url, body, headers)
+        except (OSError, http.client.HTTPException):
+            self.close()
+            self.stats.record(label, time.perf_counter() - start, None, False)
+            return Response(None, b"")
+
+        self.stats.record(label, time.perf_counter() - start, status, status in expect)
+        return Response(status, payload)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, data, **kwargs):
+        kwargs.setdefault("expect", (200, 201))
+        return self.request("POST", path, data=data, **kwargs)
+
+    def patch(self, path, data, **kwargs):
+        return self.request("PATCH", path, data=data, **kwargs)
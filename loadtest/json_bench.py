@@ -0,0 +1,124 @@
+"""Benchmark of DRF's JSON renderer/parser against core_app.fastjson.
+
+Fetches the data of three list responses from seeded data (offers with
+`page_size=100`, the orders of a customer and the business profiles),
+then renders each payload `--repeat` times with DRF's `JSONRenderer` and
+with `FastJSONRenderer`, and parses the rendered bytes with `JSONParser`
+and `FastJSONParser`. Both renderers must produce identical bytes and
+both parsers identical data:
+
+    python manage.py seed_marketplace
+    python -m loadtest.json_bench --repeat 200
+
+Without orjson installed both sides run DRF's code and the speedup is ~1.
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+PAYLOADS = (
+    ("offers", "/api/offers/", {"page_size": 100}),
+    ("orders", "/api/orders/", {}),
+    ("business profiles", "/api/profiles/business/", {}),
+)
+
+
+def fetch_payloads(prefix, host="localhost"):
+    """Return `{name: response.data}` for PAYLOADS, as seen by a seeded customer."""
+    from django.contrib.auth.models import User
+    from django.urls import resolve
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    customer = User.objects.filter(username=f"{prefix}_customer_0").first()
+    if customer is None:
+        raise SystemExit(f"No '{prefix}_customer_0' user; run `python manage.py seed_marketplace` first.")
+    factory = APIRequestFactory()
+    payloads = {}
+    for name, path, query in PAYLOADS:
+        request = factory.get(path, query, HTTP_HOST=host)
+        force_authenticate(request, user=customer)
+        match = resolve(path)
+        response = match.func(request, *match.args, **match.kwargs)
+        if response.status_code != 200:
+            raise SystemExit(f"GET {path} returned {response.status_code}.")
+        payloads[name] = response.data
+    return payloads
+
+
+def measure(func, repeat):
+    """Return (seconds per call, last result) over `repeat` calls."""
+    result = func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def run(payloads, repeat):
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from core_app import fastjson
+
+    rows = []
+    for name, data in payloads.items():
+        render_seconds, rendered = measure(lambda: JSONRenderer().render(data), repeat)
+        fast_render_seconds, fast_rendered = measure(lambda: fastjson.FastJSONRenderer().render(data), repeat)
+        if fast_rendered != rendered:
+            raise SystemExit(f"FastJSONRenderer rendered different JSON for {name}.")
+
+        parse_seconds, parsed = measure(lambda: JSONParser().parse(io.BytesIO(rendered)), repeat)
+        fast_parse_seconds, fast_parsed = measure(
+            lambda: fastjson.FastJSONParser().parse(io.BytesIO(rendered)), repeat
+        )
+        if fast_parsed != parsed:
+            raise SystemExit(f"FastJSONParser parsed different data for {name}.")
+
+        rows.append({
+            "payload": name,
+            "bytes": len(rendered),
+            "render_ms": round(render_seconds * 1000, 3),
+            "fast_render_ms": round(fast_render_seconds * 1000, 3),
+            "render_speedup": round(render_seconds / fast_render_seconds, 2),
+            "parse_ms": round(parse_seconds * 1000, 3),
+            "fast_parse_ms": round(fast_parse_seconds * 1000, 3),
+            "parse_speedup": round(parse_seconds / fast_parse_seconds, 2),
+        })
+    return {"orjson": fastjson.orjson is not None, "repeat": repeat, "payloads": rows}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m loadtest.json_bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200, help="Timed calls per payload and implementation.")
+    parser.add_argument("--prefix", default="seed", help="Username prefix used by seed_marketplace.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    return parser
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "loadtest.settings")
+    import django
+
+    django.setup()
+    report = run(fetch_payloads(options.prefix), options.repeat)
+    if options.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    print(f"orjson {'installed' if report['orjson'] else 'not installed'}, {report['repeat']} runs per payload\n")
+    header = (f"{'payload':<18}  {'bytes':>8}  {'render ms':>9}  {'fast ms':>8}  {'speedup':>7}  "
+              f"{'parse ms':>8}  {'fast ms':>8}  {'speedup':>7}")
+    print(header)
+    print("-" * len(header))
+    for row in report["payloads"]:
+        print(f"{row['payload']:<18}  {row['bytes']:>8}  {row['render_ms']:>9.3f}  {row['fast_render_ms']:>8.3f}  "
+              f"{row['render_speedup']:>6.2f}x  {row['parse_ms']:>8.3f}  {row['fast_parse_ms']:>8.3f}  "
+              f"{row['parse_speedup']:>6.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
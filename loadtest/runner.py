@@ -0,0 +1,106 @@
+"""Drive the journeys with a pool of concurrent virtual users.
+
+Every virtual user is a thread with its own connection and its own
+`random.Random(seed + n)`, so the sequence of journeys and parameters is
+reproducible for a given seed. Users are started over `--ramp-up`
+seconds and run journeys until `--duration` has passed or each has run
+`--iterations` journeys.
+"""
+
+import argparse
+import random
+import threading
+import time
+
+from loadtest.client import Session
+from loadtest.scenarios import JOURNEYS, Accounts
+from loadtest.stats import Stats
+
+
+def run(host, users=10, duration=30.0, iterations=None, ramp_up=0.0, seed=1234,
+        accounts=None, journeys=JOURNEYS, think_time=0.0):
+    """Run the load profile and return the collected `Stats`."""
+    accounts = accounts or Accounts()
+    stats = Stats()
+    weights = [journey.weight for journey in journeys]
+    stop = threading.Event()
+    stats.start()
+    deadline = time.perf_counter() + duration
+
+    def virtual_user(index):
+        rng = random.Random(seed + index)
+        session = Session(host, stats)
+        own_accounts = accounts.share(index, users)
+        done = 0
+        try:
+            while not stop.is_set() and time.perf_counter() < deadline:
+                if iterations is not None and done >= iterations:
+                    break
+                journey = rng.choices(journeys, weights)[0]
+                journey(session, rng, own_accounts).run()
+                done += 1
+                if think_time:
+                    stop.wait(rng.uniform(0, think_time))
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=virtual_user, args=(n,), daemon=True) for n in range(users)]
+    try:
+        for n, thread in enumerate(threads):
+            thread.start()
+            if ramp_up and n < users - 1:
+                stop.wait(ramp_up / users)
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    stats.stop()
+    return stats
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="http://127.0.0.1:8000", help="Base URL of the server.")
+    parser.add_argument("--users", type=int, default=10, help="Number of concurrent virtual users.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Run time in seconds.")
+    parser.add_argument("--iterations", type=int, default=None,
+                        help="Stop each virtual user after this many journeys.")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds over which users are started.")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="Maximum random pause between journeys, in seconds.")
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed for journey selection.")
+    parser.add_argument("--journeys", default=None,
+                        help="Comma-separated journey class names to run (default: all).")
+    parser.add_argument("--prefix", default="seed", help="Username prefix used by seed_marketplace.")
+    parser.add_argument("--password", default="password", help="Password of the seeded users.")
+    parser.add_argument("--business", type=int, default=100, help="Number of seeded business users.")
+    parser.add_argument("--customers", type=int, default=400, help="Number of seeded customer users.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    return parser
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    journeys = JOURNEYS
+    if options.journeys:
+        by_name = {journey.__name__: journey for journey in JOURNEYS}
+        try:
+            journeys = [by_name[name.strip()] for name in options.journeys.split(",")]
+        except KeyError as exc:
+            raise SystemExit(f"Unknown journey {exc}; choose from {', '.join(by_name)}.")
+
+    stats = run(
+        options.host,
+        users=options.users,
+        duration=options.duration,
+        iterations=options.iterations,
+        ramp_up=options.ramp_up,
+        seed=options.seed,
+        accounts=Accounts(options.prefix, options.password, options.business, options.customers),
+        journeys=journeys,
+        think_time=options.think_time,
+    )
+    print(stats.to_json() if options.json else stats.format_table())
+    return 1 if stats.summary()[-1]["failures"] else 0
@@ -0,0 +1,171 @@
+"""Weighted user journeys, modelled on Locust task sets.
+
+Each journey is one realistic visit: it logs in if it needs to, performs
+a handful of requests and returns. Requests are labelled with the route
+template (e.g. "/api/offers/{id}/") so latencies group per endpoint.
+
+The logged-in journeys use the accounts created by
+`manage.py seed_marketplace` (`<prefix>_business_<n>` and
+`<prefix>_customer_<n>`, all sharing one password).
+"""
+
+from dataclasses import dataclass, replace
+
+SEARCH_TERMS = ["logo", "website", "design", "seo audit", "app", "branding", "video"]
+
+
+@dataclass
+class Accounts:
+    """Seeded credentials, optionally restricted to one virtual user's share.
+
+    `slot`/`slots` give every virtual user a disjoint set of accounts, so
+    two threads never act as the same person (which would e.g. turn a
+    review into a duplicate).
+    """
+
+    prefix: str = "seed"
+    password: str = "password"
+    business: int = 100
+    customers: int = 400
+    slot: int = 0
+    slots: int = 1
+
+    def share(self, slot, slots):
+        return replace(self, slot=slot, slots=slots)
+
+    def _pick(self, rng, total):
+        slot, slots = (self.slot, self.slots) if self.slots <= total else (0, 1)
+        return slot + slots * rng.randrange((total - slot + slots - 1) // slots)
+
+    def business_username(self, rng):
+        return f"{self.prefix}_business_{self._pick(rng, self.business)}"
+
+    def customer_username(self, rng):
+        return f"{self.prefix}_customer_{self._pick(rng, self.customers)}"
+
+
+class Journey:
+    """Base class: `weight` sets how often the runner picks the journey."""
+
+    weight = 1
+
+    def __init__(self, session, rng, accounts):
+        self.session = session
+        self.rng = rng
+        self.accounts = accounts
+
+    def run(self):
+        raise NotImplementedError
+
+    def login(self, username):
+        """Authenticate through LoginView and keep the token on the session."""
+        self.session.token = None
+        resp = self.session.post(
+            "/api/login/", {"username": username, "password": self.accounts.password},
+            expect=(200,),
+        )
+        data = resp.json() if resp.status == 200 else None
+        if not data:
+            return None
+        self.session.token = data["token"]
+        return data["user_id"]
+
+    def browse_offers(self):
+        """One filtered offer-list page, like the frontend's offer overview."""
+        rng = self.rng
+        params = {"page_size": 6}
+        if rng.random() < 0.5:
+            params["min_price"] = rng.choice([50, 100, 250, 500])
+        if rng.random() < 0.4:
+            params["max_delivery_time"] = rng.choice([1, 3, 7])
+        if rng.random() < 0.3:
+            params["search"] = rng.choice(SEARCH_TERMS)
+        if rng.random() < 0.3:
+            params["ordering"] = rng.choice(["min_price", "-updated_at"])
+        if rng.random() < 0.2:
+            params["page"] = rng.randint(2, 5)
+
+        resp = self.session.get("/api/offers/", params=params, expect=(200, 404))
+        data = resp.json() if resp.status == 200 else None
+        return data["results"] if data else []
+
+
+class AnonymousBrowsing(Journey):
+    """Visitor on the landing page: platform stats and a few offer pages."""
+
+    weight = 6
+
+    def run(self):
+        self.session.token = None
+        self.session.get("/api/base-info/")
+        for _ in range(self.rng.randint(1, 3)):
+            self.browse_offers()
+
+
+class CustomerOrdering(Journey):
+    """Customer logs in, picks an offer tier and places an order."""
+
+    weight = 3
+
+    def run(self):
+        if self.login(self.accounts.customer_username(self.rng)) is None:
+            return
+        offers = self.browse_offers()
+        if not offers:
+            return
+        offer = self.rng.choice(offers)
+        resp = self.session.get(f"/api/offers/{offer['id']}/", name="/api/offers/{id}/")
+        data = resp.json() if resp.status == 200 else None
+        if not data or not data["details"]:
+            return
+        detail = self.rng.choice(data["details"])
+        self.session.get(f"/api/offerdetails/{detail['id']}/", name="/api/offerdetails/{id}/")
+        self.session.post("/api/orders/", {"offer_detail_id": detail["id"]}, expect=(201,))
+        self.session.get("/api/orders/")
+
+
+class BusinessOrderHandling(Journey):
+    """Business user checks open orders and moves one forward."""
+
+    weight = 2
+
+    def run(self):
+        user_id = self.login(self.accounts.business_username(self.rng))
+        if user_id is None:
+            return
+        self.session.get(f"/api/order-count/{user_id}/", name="/api/order-count/{id}/")
+        resp = self.session.get("/api/orders/")
+        orders = resp.json() if resp.status == 200 else None
+        open_orders = [order for order in orders or [] if order["status"] == "in_progress"]
+        if not open_orders:
+            return
+        order = self.rng.choice(open_orders)
+        status = self.rng.choices(["completed", "cancelled"], [9, 1])[0]
+        self.session.patch(f"/api/orders/{order['id']}/", {"status": status}, name="/api/orders/{id}/")
+        self.session.get(f"/api/completed-order-count/{user_id}/", name="/api/completed-order-count/{id}/")
+
+
+class CustomerReviewing(Journey):
+    """Customer reads a business's reviews and leaves one of their own."""
+
+    weight = 1
+
+    def run(self):
+        user_id = self.login(self.accounts.customer_username(self.rng))
+        if user_id is None:
+            return
+        resp = self.session.get("/api/reviews/", params={"reviewer_id": user_id})
+        reviewed = {review["business_user"] for review in (resp.json() if resp.status == 200 else None) or []}
+        candidates = [offer["user"] for offer in self.browse_offers() if offer["user"] not in reviewed]
+        if not candidates:
+            return
+        business_user = self.rng.choice(candidates)
+        self.session.get("/api/reviews/", params={"business_user_id": business_user})
+        self.session.post("/api/reviews/", {
+            "business_user": business_user,
+            "rating": self.rng.choices([1, 2, 3, 4, 5], [1, 1, 2, 4, 6])[0],
+            "description": "Great communication and fast delivery.",
+        }, expect=(201,))
+
+
+JOURNEYS = [AnonymousBrowsing, CustomerOrdering, BusinessOrderHandling, CustomerReviewing]
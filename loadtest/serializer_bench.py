@@ -0,0 +1,118 @@
+"""Microbenchmark of the offer list serializer.
+
+Serializes one page of offers (`--offers`, default the maximum page size
+of 100, three details each) `--repeat` times with the generic DRF path
+(`ListSerializer` over `OfferListSerializer`) and with the fast path
+`OfferListSerializer(many=True)` uses (`OfferListItemsSerializer`),
+checks that both render the same JSON bytes and reports the time per
+page:
+
+    python -m loadtest.serializer_bench --offers 100 --repeat 200
+
+The offers are unsaved instances with their user and details attached,
+so no database is needed and only serialization and rendering are
+measured.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import timedelta
+
+
+def build_offers(count):
+    from django.contrib.auth.models import User
+    from django.utils import timezone
+    from coderr_app.api.serializer import attach_details
+    from coderr_app.models import Offer, OfferDetail
+
+    now = timezone.now()
+    users = [
+        User(pk=number + 1, username=f"business_{number}", first_name="Bench", last_name=f"User {number}")
+        for number in range(10)
+    ]
+    offers = []
+    for number in range(count):
+        offer = Offer(
+            pk=number + 1, user=users[number % len(users)], title=f"Offer {number}",
+            description="Logo and brand design " * 5, min_price=50 + number, min_delivery_time=3,
+            created_at=now - timedelta(days=number), updated_at=now - timedelta(hours=number),
+        )
+        attach_details(offer, [
+            OfferDetail(pk=number * 3 + index + 1, offer=offer, offer_type=offer_type)
+            for index, offer_type in enumerate(("basic", "standard", "premium"))
+        ])
+        offers.append(offer)
+    return offers
+
+
+def measure(render, repeat):
+    """Return (seconds per call, last output) over `repeat` calls."""
+    output = render()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        output = render()
+    return (time.perf_counter() - start) / repeat, output
+
+
+def run(offers_count, repeat, host="localhost"):
+    from rest_framework import serializers
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from coderr_app.api.serializer import OfferListSerializer
+
+    offers = build_offers(offers_count)
+    renderer = JSONRenderer()
+    context = {"request": Request(APIRequestFactory().get("/api/offers/", HTTP_HOST=host))}
+
+    def generic():
+        serializer = serializers.ListSerializer(offers, child=OfferListSerializer(), context=context)
+        return renderer.render(serializer.data)
+
+    def fast():
+        return renderer.render(OfferListSerializer(offers, many=True, context=context).data)
+
+    generic_seconds, generic_output = measure(generic, repeat)
+    fast_seconds, fast_output = measure(fast, repeat)
+    if fast_output != generic_output:
+        raise SystemExit("The fast path rendered different JSON than the generic path.")
+    return {
+        "offers": offers_count,
+        "repeat": repeat,
+        "bytes": len(fast_output),
+        "generic_ms": round(generic_seconds * 1000, 3),
+        "fast_ms": round(fast_seconds * 1000, 3),
+        "speedup": round(generic_seconds / fast_seconds, 2),
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m loadtest.serializer_bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--offers", type=int, default=100, help="Offers per page.")
+    parser.add_argument("--repeat", type=int, default=200, help="Timed serializations per path.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    return parser
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    import django
+
+    django.setup()
+    report = run(options.offers, options.repeat)
+    if options.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    print(f"{report['offers']} offers per page, {report['bytes']} bytes, {report['repeat']} runs")
+    print(f"generic  {report['generic_ms']:>8.3f} ms/page")
+    print(f"fast     {report['fast_ms']:>8.3f} ms/page")
+    print(f"speedup  {report['speedup']:>8.2f}x (identical output)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+"""Settings for a server under load test.
+
+Identical to `core.settings` except that the throttle rates are raised
+far above anything a load run produces; the production rates (e.g.
+120 requests per user and day) would otherwise turn most of the run
+into 429 responses.
+
+`ASYNC_READ_VIEWS=1` in the environment enables the async read views,
+e.g. for an ASGI server or `python -m loadtest.asgi_bench`.
+"""
+
+import os
+
+from core.settings import *  # noqa: F401,F403
+from core.settings import REST_FRAMEWORK
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_THROTTLE_RATES': {
+        scope: '1000000/second' for scope in REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']
+    },
+}
+
+ASYNC_READ_VIEWS = os.environ.get("ASYNC_READ_VIEWS") == "1"
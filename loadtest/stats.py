@@ -0,0 +1,108 @@
+"""Thread-safe collection of request samples and the end-of-run report."""
+
+import json
+import math
+import threading
+import time
+from collections import Counter
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class EndpointStats:
+    """Samples for one endpoint label (e.g. "GET /api/offers/ [filtered]")."""
+
+    def __init__(self, name):
+        self.name = name
+        self.latencies = []
+        self.failures = 0
+        self.statuses = Counter()
+
+    def add(self, elapsed, status, ok):
+        self.latencies.append(elapsed)
+        self.statuses[status or "error"] += 1
+        if not ok:
+            self.failures += 1
+
+    def summary(self, duration):
+        ordered = sorted(self.latencies)
+        row = {
+            "name": self.name,
+            "requests": len(ordered),
+            "failures": self.failures,
+            "rps": round(len(ordered) / duration, 2) if duration else 0.0,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items(), key=str)},
+        }
+        for pct in PERCENTILES:
+            row[f"p{pct}_ms"] = round(percentile(ordered, pct) * 1000, 1)
+        row["max_ms"] = round(ordered[-1] * 1000, 1) if ordered else 0.0
+        return row
+
+
+class Stats:
+    """Aggregates samples from all virtual users."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self.started = None
+        self.finished = None
+
+    def start(self):
+        self.started = time.perf_counter()
+
+    def stop(self):
+        self.finished = time.perf_counter()
+
+    @property
+    def duration(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    def record(self, name, elapsed, status, ok):
+        with self._lock:
+            endpoint = self._endpoints.get(name)
+            if endpoint is None:
+                endpoint = self._endpoints[name] = EndpointStats(name)
+            endpoint.add(elapsed, status, ok)
+
+    def summary(self):
+        """Return per-endpoint rows plus a "total" row aggregating them all."""
+        duration = self.duration
+        with self._lock:
+            endpoints = sorted(self._endpoints.values(), key=lambda e: e.name)
+            total = EndpointStats("total")
+            for endpoint in endpoints:
+                total.latencies.extend(endpoint.latencies)
+                total.failures += endpoint.failures
+                total.statuses.update(endpoint.statuses)
+            rows = [endpoint.summary(duration) for endpoint in endpoints]
+        rows.append(total.summary(duration))
+        return rows
+
+    def to_json(self):
+        return json.dumps({"duration_s": round(self.duration, 2), "endpoints": self.summary()}, indent=2)
+
+    def format_table(self):
+        rows = self.summary()
+        width = max(len(row["name"]) for row in rows)
+        header = f"{'endpoint':<{width}}  {'reqs':>6}  {'fails':>5}  {'req/s':>7}  " \
+                 f"{'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}  {'max ms':>8}"
+        lines = [header, "-" * len(header)]
+        for row in rows:
+            if row["name"] == "total":
+                lines.append("-" * len(header))
+            lines.append(
+                f"{row['name']:<{width}}  {row['requests']:>6}  {row['failures']:>5}  {row['rps']:>7.2f}  "
+                f"{row['p50_ms']:>8.1f}  {row['p95_ms']:>8.1f}  {row['p99_ms']:>8.1f}  {row['max_ms']:>8.1f}"
+            )
+        return "\n".join(lines)